@@ -0,0 +1,2 @@
+from .server import HttpServer, HttpError, Request, Response, Router
+from .shop import ShopApi
@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+
+from termcolor import colored
+
+from api import HttpServer, ShopApi
+from database import (AsyncDatabase, Database, QueryStats, add_config_arguments, add_instrumentation_arguments,
+                      create_backend, create_instruments, load_config)
+from metrics import MetricsServer, add_metrics_arguments, register_database, write_metrics
+
+
+def parse_args() -> argparse.Namespace:
+    parser = add_metrics_arguments(add_instrumentation_arguments(add_config_arguments(argparse.ArgumentParser(
+        description='Serve the clothing shop as a JSON API.'))))
+    parser.add_argument('--bind', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--pool-size', type=int, default=10, help='database connections shared by all requests')
+    return parser.parse_args()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    database = AsyncDatabase(Database(backend=create_backend(load_config(vars(args))), max_pool_size=args.pool_size,
+                                      instruments=create_instruments(args)))
+    if args.metrics_port is not None or args.metrics_file is not None:
+        register_database(database.database)
+    if args.metrics_port is not None:
+        MetricsServer(host=args.metrics_bind, port=args.metrics_port).start()
+    server = HttpServer(ShopApi(database).router, host=args.bind, port=args.port)
+
+    await server.start()
+    print(colored(f'Serving on http://{server.host}:{server.port}', 'green'))
+    try:
+        await server.serve_forever()
+    finally:
+        database.close()
+        for instrument in database.instruments:
+            if isinstance(instrument, QueryStats):
+                print(instrument.report())
+        if args.metrics_file is not None:
+            write_metrics(args.metrics_file)
+
+
+def main() -> None:
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import re
+from dataclasses import dataclass, field, asdict, is_dataclass
+from datetime import datetime, date
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Callable, Awaitable, Dict, List, Tuple, Any, Optional
+from urllib.parse import urlsplit, parse_qsl, unquote
+
+logger = logging.getLogger(__name__)
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes
+    params: Dict[str, str] = field(default_factory=dict)
+
+    def json(self) -> dict:
+        if not self.body:
+            return {}
+        try:
+            body = json.loads(self.body)
+        except ValueError:
+            raise HttpError(400, 'Request body is not valid JSON')
+
+        if not isinstance(body, dict):
+            raise HttpError(400, 'Request body must be a JSON object')
+        return body
+
+    def int_param(self, name: str) -> int:
+        return int(self.params[name])
+
+    def int_query(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        value = self.query.get(name)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise HttpError(400, f'Query parameter {name} must be an integer')
+
+
+@dataclass
+class Response:
+    body: Any = None
+    status: int = 200
+
+
+Handler = Callable[[Request], Awaitable[Any]]
+
+
+def encode_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    # money is exact Decimal cents, which a JSON number would turn back into a binary float
+    if isinstance(value, Decimal):
+        return str(value)
+    if is_dataclass(value):
+        return asdict(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+class Router:
+    def __init__(self) -> None:
+        self._routes: List[Tuple[str, re.Pattern, Handler]] = []
+
+    def add(self, method: str, pattern: str, handler: Handler) -> None:
+        # "/orders/{id}" matches one path segment per placeholder
+        regex = re.sub(r'{(\w+)}', r'(?P<\1>[^/]+)', pattern)
+        self._routes.append((method, re.compile(f'^{regex}$'), handler))
+
+    def resolve(self, method: str, path: str) -> Tuple[Handler, Dict[str, str]]:
+        path_found = False
+        for route_method, regex, handler in self._routes:
+            match = regex.match(path)
+            if match is None:
+                continue
+            if route_method == method:
+                return handler, {key: unquote(value) for key, value in match.groupdict().items()}
+            path_found = True
+
+        if path_found:
+            raise HttpError(405, f'Method {method} is not allowed for {path}')
+        raise HttpError(404, f'Nothing found at {path}')
+
+
+class HttpServer:
+    def __init__(self, router: Router, host: str = '127.0.0.1', port: int = 8080,
+                 max_body_size: int = 1024 * 1024, keep_alive_timeout: float = 15.0) -> None:
+        self.router = router
+        self.host = host
+        self.port = port
+        self.max_body_size = max_body_size
+        self.keep_alive_timeout = keep_alive_timeout
+        self._server = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # port 0 asks the OS for a free port
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request, keep_alive = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except HttpError as error:
+                    await self._write_response(writer, Response({'error': error.message}, error.status), False)
+                    break
+                if request is None:
+                    break
+
+                response = await self._dispatch(request)
+                await self._write_response(writer, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[Optional[Request], bool]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None, False
+
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HttpError(400, 'Malformed request line')
+
+        headers = {}
+        while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            content_length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HttpError(400, 'Content-Length must be an integer')
+        if content_length < 0:
+            raise HttpError(400, 'Content-Length must not be negative')
+        if content_length > self.max_body_size:
+            raise HttpError(413, f'Request body is larger than {self.max_body_size} bytes')
+        body = await reader.readexactly(content_length) if content_length else b''
+
+        url = urlsplit(target)
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+        return Request(method.upper(), url.path, dict(parse_qsl(url.query)), headers, body), keep_alive
+
+    async def _dispatch(self, request: Request) -> Response:
+        try:
+            handler, request.params = self.router.resolve(request.method, request.path)
+            result = await handler(request)
+        except HttpError as error:
+            return Response({'error': error.message}, error.status)
+        except Exception:
+            # the details, e.g. SQL errors, go to the log and not to the client
+            logger.exception('Unhandled error in %s %s', request.method, request.path)
+            return Response({'error': 'Internal server error'}, 500)
+
+        return result if isinstance(result, Response) else Response(result)
+
+    @staticmethod
+    async def _write_response(writer: asyncio.StreamWriter, response: Response, keep_alive: bool) -> None:
+        body = b'' if response.body is None else json.dumps(response.body, default=encode_json).encode('utf-8')
+        head = f'HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}\r\n' \
+               f'Content-Type: application/json\r\n' \
+               f'Content-Length: {len(body)}\r\n' \
+               f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'
+
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
@@ -0,0 +1,345 @@
+from dataclasses import asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple, Optional
+
+from api.server import Router, Request, Response, HttpError
+from database import AsyncDatabase, ClothesNotFoundError, OutOfStockError
+from menu.role_specific import GuestMenus, CustomerMenus, WorkerMenus, AdminMenus
+from models import User, Role, Clothes, Order, Basket, ClothesType, Status
+from user_input_validation import validate_fields as validate_menu_fields
+from utils.hash import hash_password
+
+ANY_ROLE = '*'
+
+
+def validate_fields(settings: dict, body: dict, names: Dict[str, str], partial: bool = False) -> dict:
+    # request fields go through the same validators the terminal menus use
+    try:
+        return validate_menu_fields(settings, body, names=names, partial=partial)
+    except ValueError as error:
+        raise HttpError(400, str(error))
+
+
+def public_user(user: dict) -> dict:
+    return {key: value for key, value in user.items() if key != 'password_hash'}
+
+
+class ShopApi:
+    sign_up_fields = {
+        'first_name': 'name',
+        'last_name': 'last name',
+        'phone_number': 'phone number',
+        'email': 'email',
+        'password': 'password'
+    }
+    clothes_fields = ['clothes_type_id', 'title', 'description', 'size', 'material', 'color',
+                      'price', 'discount', 'in_stock']
+    user_fields = ['first_name', 'last_name', 'phone_number', 'email', 'role_id']
+
+    # table, value column, model and the menu whose validators guard new values
+    references = {
+        'clothes-types': ('clothes_type', 'type', ClothesType, WorkerMenus.add_clothes_type_menu, 'clothes_type'),
+        'statuses': ('status', 'status', Status, WorkerMenus.add_status_menu, 'status'),
+        'roles': ('role', 'role', Role, AdminMenus.add_role_menu, 'role')
+    }
+    reference_roles = {'clothes-types': 'worker', 'statuses': 'worker', 'roles': 'admin'}
+
+    def __init__(self, database: AsyncDatabase, max_page_size: int = 100) -> None:
+        self.database = database
+        self.max_page_size = max_page_size
+
+        # baskets live on the server per user, like the basket of a terminal session
+        self.baskets: Dict[int, Basket] = {}
+
+        self.router = Router()
+        for method, pattern, handler, role in self.routes():
+            self.router.add(method, pattern, self._authorized(handler, role))
+
+    def routes(self) -> List[Tuple[str, str, Callable, Optional[str]]]:
+        routes = [
+            ('POST', '/users', self.sign_up, None),
+            ('POST', '/sessions', self.sign_in, None),
+            ('DELETE', '/sessions', self.sign_off, ANY_ROLE),
+            ('GET', '/clothes', self.list_clothes, None),
+            ('GET', '/clothes/{id}', self.get_clothes, None),
+
+            ('GET', '/basket', self.get_basket, 'customer'),
+            ('DELETE', '/basket', self.clear_basket, 'customer'),
+            ('POST', '/basket/items', self.add_to_basket, 'customer'),
+            ('DELETE', '/basket/items/{id}', self.remove_from_basket, 'customer'),
+            ('POST', '/checkout', self.checkout, 'customer'),
+            ('GET', '/orders', self.list_orders, 'customer'),
+            ('GET', '/orders/{id}', self.get_order, 'customer'),
+
+            ('GET', '/manage/orders', self.list_all_orders, 'worker'),
+            ('PATCH', '/manage/orders/{id}', self.change_order_status, 'worker'),
+            ('GET', '/manage/clothes', self.list_clothes, 'worker'),
+            ('POST', '/manage/clothes', self.add_clothes, 'worker'),
+            ('PATCH', '/manage/clothes/{id}', self.change_clothes_info, 'worker'),
+            ('DELETE', '/manage/clothes/{id}', self.remove_clothes, 'worker'),
+
+            ('GET', '/manage/users', self.list_users, 'admin'),
+            ('PATCH', '/manage/users/{id}', self.change_user_info, 'admin'),
+            ('DELETE', '/manage/users/{id}', self.delete_user, 'admin')
+        ]
+
+        for name, role in self.reference_roles.items():
+            routes += [
+                ('GET', f'/manage/{name}', self.list_references, role),
+                ('POST', f'/manage/{name}', self.add_reference, role),
+                ('PATCH', f'/manage/{name}/{{id}}', self.change_reference, role),
+                ('DELETE', f'/manage/{name}/{{id}}', self.remove_reference, role)
+            ]
+        return routes
+
+    def _authorized(self, handler: Callable, role: Optional[str]) -> Callable:
+        async def inner(request: Request):
+            if role is None:
+                return await handler(request)
+
+            token = request.headers.get('authorization', '').removeprefix('Bearer ').strip()
+            user = self.database.sessions.get(token) if token else None
+            if user is None:
+                raise HttpError(401, 'Sign in first')
+
+            roles_mapping = await self.database.select_reference('role')
+            if role != ANY_ROLE and roles_mapping.get(user.role_id) != role:
+                raise HttpError(403, f'This action requires the {role} role')
+            return await handler(request, user)
+
+        return inner
+
+    async def sign_up(self, request: Request) -> Response:
+        inputs = validate_fields(GuestMenus.sign_up_menu().settings, request.json(), names=self.sign_up_fields)
+        user = User(inputs['first_name'], inputs['last_name'], inputs['phone_number'], inputs['email'],
+                    hash_password(inputs['password']))
+
+        try:
+            user.id = await self.database.insert_user(user, return_id=True)
+        except self.database.backend.integrity_error:
+            raise HttpError(409, 'User with given email/phone number already exists')
+
+        token = self.database.sessions.create(user)
+        return Response({'token': token, 'user': public_user(asdict(user))}, status=201)
+
+    async def sign_in(self, request: Request) -> Response:
+        body = request.json()
+        user = await self.database.authenticate(email=str(body.get('email', '')),
+                                                password_hash=hash_password(str(body.get('password', ''))))
+        if user is None:
+            raise HttpError(401, 'Wrong email and/or password')
+
+        token = self.database.sessions.create(user)
+        return Response({'token': token, 'user': public_user(asdict(user))}, status=201)
+
+    async def sign_off(self, request: Request, user: User) -> Response:
+        self.database.sessions.revoke(request.headers['authorization'].removeprefix('Bearer ').strip())
+        return Response(status=204)
+
+    async def list_clothes(self, request: Request, user: Optional[User] = None) -> dict:
+        return asdict(await self._page(request, table='clothes'))
+
+    async def get_clothes(self, request: Request) -> dict:
+        return await self._get_clothes(self._id(request))
+
+    async def get_basket(self, request: Request, user: User) -> dict:
+        basket = self.baskets.get(user.id, Basket())
+        return {'contents': basket.contents, 'total': basket.calculate_basket_total()}
+
+    async def clear_basket(self, request: Request, user: User) -> dict:
+        self.baskets.pop(user.id, None)
+        return await self.get_basket(request, user)
+
+    async def add_to_basket(self, request: Request, user: User) -> Response:
+        body = request.json()
+        try:
+            clothes_id = int(body.get('clothes_id'))
+        except (TypeError, ValueError):
+            raise HttpError(400, 'clothes_id must be an integer')
+        clothes = await self._get_clothes(clothes_id)
+
+        basket = self.baskets.setdefault(user.id, Basket())
+        in_basket_quantity = basket.get_in_basket_quantity_by_clothes_id(clothes_id)
+        settings = CustomerMenus.specify_item_quantity_menu(
+            in_stock=clothes['in_stock'], in_basket_quantity=in_basket_quantity).settings
+        quantity = validate_fields(settings, {'quantity': body.get('quantity', 1)}, names={'quantity': 'quantity'})
+
+        basket_clothes = Clothes.to_basket_clothes(clothes=clothes, basket_quantity=quantity['quantity'])
+        if clothes_id in basket:
+            basket.add_existing(basket_clothes)
+        else:
+            basket.add_new(basket_clothes)
+
+        return Response(await self.get_basket(request, user), status=201)
+
+    async def remove_from_basket(self, request: Request, user: User) -> dict:
+        clothes_id = self._id(request)
+        basket = self.baskets.get(user.id, Basket())
+        if clothes_id not in basket:
+            raise HttpError(404, f'Item #{clothes_id} is not in your basket')
+
+        clothes = basket.get_line(clothes_id)
+        amount = validate_fields(
+            CustomerMenus.specify_removal_amount_menu(clothes=clothes).settings,
+            {'removal_amount': request.query.get('quantity', clothes.quantity)},
+            names={'removal_amount': 'removal_amount'})['removal_amount']
+
+        basket.remove_single(clothes_id, amount)
+        return await self.get_basket(request, user)
+
+    async def checkout(self, request: Request, user: User) -> Response:
+        basket = self.baskets.get(user.id)
+        if basket is None or len(basket) == 0:
+            raise HttpError(400, 'Your basket is empty')
+
+        # take the lines out first so items added while the order is written stay in the basket
+        contents, basket.contents = basket.contents, ()
+        try:
+            order_id = await self.database.checkout(Order(user.id, datetime.now()), contents)
+        except (OutOfStockError, ClothesNotFoundError) as error:
+            basket.contents = contents + basket.contents
+            return Response({'error': str(error), 'clothes_ids': error.clothes_ids}, status=409)
+        except BaseException:
+            basket.contents = contents + basket.contents
+            raise
+
+        return Response({'order_id': order_id}, status=201)
+
+    async def list_orders(self, request: Request, user: User) -> List[dict]:
+        return await self.database.select_user_orders(user_id=user.id)
+
+    async def get_order(self, request: Request, user: User) -> List[dict]:
+        order_id = self._id(request)
+        orders = await self.database.select_user_orders(user_id=user.id)
+        if order_id not in {order['id'] for order in orders}:
+            raise HttpError(404, f'You have no order #{order_id}')
+        return await self.database.select_single_user_order(order_id)
+
+    async def list_all_orders(self, request: Request, user: User) -> dict:
+        return asdict(await self._page(request, table='order'))
+
+    async def change_order_status(self, request: Request, user: User) -> dict:
+        order_id = await self._existing_id(request, table='order')
+        settings = WorkerMenus.specify_new_order_status_menu(
+            existing_status_ids=await self.database.select_ids(table='status')).settings
+        status_id = validate_fields(settings, request.json(), names={'status_id': 'choice'})['status_id']
+
+        await self.database.update_value_by_id(table='`order`', column='status_id', new_value=status_id,
+                                               id_=order_id)
+        return {'id': order_id, 'status_id': status_id}
+
+    async def add_clothes(self, request: Request, user: User) -> Response:
+        values = validate_fields(await self._clothes_settings(), request.json(),
+                                 names={field: field for field in self.clothes_fields})
+        clothes = Clothes(**values)
+        clothes.id = await self.database.insert_clothes(clothes, return_id=True)
+        return Response(asdict(clothes), status=201)
+
+    async def change_clothes_info(self, request: Request, user: User) -> dict:
+        clothes_id = await self._existing_id(request, table='clothes')
+        values = validate_fields(await self._clothes_settings(), request.json(),
+                                 names={field: field for field in self.clothes_fields}, partial=True)
+
+        for field, value in values.items():
+            await self.database.update_value_by_id(table='clothes', column=field, new_value=value, id_=clothes_id)
+        return await self._get_clothes(clothes_id)
+
+    async def remove_clothes(self, request: Request, user: User) -> Response:
+        clothes_id = await self._existing_id(request, table='clothes')
+        await self.database.delete_from_table_by_id(table='clothes', id_=clothes_id)
+        return Response(status=204)
+
+    async def list_users(self, request: Request, user: User) -> dict:
+        page = await self._page(request, table='user')
+        page.rows = [public_user(row) for row in page.rows]
+        return asdict(page)
+
+    async def change_user_info(self, request: Request, user: User) -> dict:
+        user_id = await self._existing_id(request, table='user')
+        existing_role_ids = await self.database.select_ids(table='role')
+        body = request.json()
+
+        values = {}
+        for key, field in enumerate(self.user_fields, start=1):
+            if field in body:
+                settings = AdminMenus.specify_new_user_info_menu(
+                    settings_key=key, existing_role_ids=existing_role_ids).settings
+                values.update(validate_fields(settings, {field: body.pop(field)},
+                                              names={field: list(settings.keys())[0]}))
+        if body:
+            raise HttpError(400, f'Unknown fields: {sorted(body)}')
+
+        for field, value in values.items():
+            await self.database.update_value_by_id(table='user', column=field, new_value=value, id_=user_id)
+        return {'id': user_id, **values}
+
+    async def delete_user(self, request: Request, user: User) -> Response:
+        user_id = await self._existing_id(request, table='user')
+        await self.database.delete_from_table_by_id(table='user', id_=user_id)
+        self.baskets.pop(user_id, None)
+        return Response(status=204)
+
+    async def list_references(self, request: Request, user: User) -> List[dict]:
+        table = self._reference(request)[0]
+        return await self.database.select_all_columns_from_table(table=table)
+
+    async def add_reference(self, request: Request, user: User) -> Response:
+        table, column, model, _, _ = self._reference(request)
+        value = await self._validate_reference(request)
+
+        await getattr(self.database, f'insert_{table}')(model(value))
+        return Response({column: value}, status=201)
+
+    async def change_reference(self, request: Request, user: User) -> dict:
+        table, column, _, _, _ = self._reference(request)
+        id_ = await self._existing_id(request, table=table)
+        value = await self._validate_reference(request)
+
+        await self.database.update_value_by_id(table=table, column=column, new_value=value, id_=id_)
+        return {'id': id_, column: value}
+
+    async def remove_reference(self, request: Request, user: User) -> Response:
+        table = self._reference(request)[0]
+        id_ = await self._existing_id(request, table=table)
+        await self.database.delete_from_table_by_id(table=table, id_=id_)
+        return Response(status=204)
+
+    async def _page(self, request: Request, table: str):
+        page_size = request.int_query('page_size', default=self.database.page_size)
+        return await self.database.select_page(
+            table,
+            after_id=request.int_query('after_id'),
+            before_id=request.int_query('before_id'),
+            page_size=max(1, min(page_size, self.max_page_size)))
+
+    async def _get_clothes(self, clothes_id: int) -> dict:
+        clothes = await self.database.select_clothes_by_id(clothes_id=clothes_id)
+        if len(clothes) == 0:
+            raise HttpError(404, f'There are no clothes with id {clothes_id}')
+        return clothes[0]
+
+    async def _clothes_settings(self) -> dict:
+        menu = WorkerMenus.add_clothes_menu(await self.database.select_ids(table='clothes_type'))
+        return {**menu.choice_menu.settings, **menu.no_choice_menu.settings}
+
+    async def _existing_id(self, request: Request, table: str) -> int:
+        id_ = self._id(request)
+        if not await self.database.exists_by_id(table, id_):
+            raise HttpError(404, f'There is no {table} with id {id_}')
+        return id_
+
+    def _reference(self, request: Request) -> tuple:
+        return self.references[request.path.split('/')[2]]
+
+    async def _validate_reference(self, request: Request) -> str:
+        # a missed reference cache queries the database, so it is read on the executor like every other call
+        table, column, _, menu, setting_name = self._reference(request)
+        settings = menu(list((await self.database.select_reference(table)).values())).settings
+        return validate_fields(settings, request.json(), names={column: setting_name})[column]
+
+    @staticmethod
+    def _id(request: Request) -> int:
+        try:
+            return request.int_param('id')
+        except ValueError:
+            raise HttpError(404, f'{request.params["id"]} is not a valid id')
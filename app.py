@@ -1,17 +1,17 @@
+import argparse
+
 from termcolor import colored
 
-from database import Database
+from database import (Database, QueryStats, add_config_arguments, add_instrumentation_arguments, create_backend,
+                      create_instruments, load_config)
 from interface.role_specific import *
+from metrics import ACTIVE_SESSIONS, add_metrics_arguments, register_database, write_metrics
 from models import Role
+from utils.console import write_output
+from utils.profiling import enable_profiling, get_profiler, profile_report_path
 
 
-def main():
-    database = Database(
-        host='localhost',
-        user='root',
-        password='qwerty',
-        database='clothing_shop_db'
-    )
+def run_session(database: Database) -> None:
     interfaces_mapping = {
         'customer': CustomerInterface,
         'worker': WorkerInterface,
@@ -19,17 +19,97 @@ def main():
     }
 
     guest_interface = GuestInterface(database=database)
-    guest_interface.run()
+    ACTIVE_SESSIONS.inc(role='guest')
+    try:
+        guest_interface.run()
+    finally:
+        ACTIVE_SESSIONS.dec(role='guest')
     current_user = guest_interface.current_user
 
     while True:
-        role = Role.map_id_to_role(current_user.role_id)
+        role = Role.map_id_to_role(current_user.role_id, roles_mapping=database.select_reference('role'))
         interface = interfaces_mapping[role](database=database, current_user=current_user)
-        current_user = interface.run()
+        ACTIVE_SESSIONS.inc(role=role)
+        try:
+            current_user = interface.run()
+        finally:
+            ACTIVE_SESSIONS.dec(role=role)
 
         if current_user is None:
             break
-    print(colored('See you soon!', 'magenta'))
+    write_output(colored('See you soon!', 'magenta'))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = add_metrics_arguments(add_instrumentation_arguments(add_config_arguments(argparse.ArgumentParser(
+        description='Clothing shop terminal.'))))
+    parser.add_argument('--serve', action='store_true', help='serve many terminal sessions over TCP (telnet)')
+    parser.add_argument('--bind', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2323)
+    parser.add_argument('--max-sessions', type=int, default=1000)
+    parser.add_argument('--pool-size', type=int, default=10, help='database connections shared by all sessions')
+    parser.add_argument('--profile', default=None, metavar='REPORT',
+                        help='profile every menu action and write a report here on exit'
+                             ' (or set CLOTHING_SHOP_PROFILE)')
+    return parser.parse_args()
+
+
+def print_query_stats(database: Database) -> None:
+    for instrument in database.instruments:
+        if isinstance(instrument, QueryStats):
+            print(instrument.report())
+
+
+def start_metrics(database: Database, args: argparse.Namespace) -> None:
+    if args.metrics_port is None and args.metrics_file is None:
+        return
+
+    register_database(database)
+    if args.metrics_port is not None:
+        from metrics.server import MetricsServer
+
+        MetricsServer(host=args.metrics_bind, port=args.metrics_port).start()
+
+
+def write_reports(database: Database, args: argparse.Namespace) -> None:
+    print_query_stats(database)
+    if args.metrics_file is not None:
+        write_metrics(args.metrics_file)
+
+    profiler = get_profiler()
+    if profiler is not None:
+        profiler.write_report(profile_report_path(args.profile))
+
+
+def main():
+    args = parse_args()
+    config = load_config(vars(args))
+    instruments = create_instruments(args)
+    if profile_report_path(args.profile) is not None:
+        enable_profiling()
+
+    if not args.serve:
+        database = Database(backend=create_backend(config), instruments=instruments, lazy_connect=True)
+        database.start_warm_up()
+        start_metrics(database, args)
+        try:
+            run_session(database)
+        finally:
+            write_reports(database, args)
+        return
+
+    from terminal_server import TerminalServer
+
+    database = Database(backend=create_backend(config), max_pool_size=args.pool_size, instruments=instruments)
+    start_metrics(database, args)
+    with TerminalServer(database, host=args.bind, port=args.port, max_sessions=args.max_sessions) as server:
+        print(colored(f'Serving terminal sessions on {args.bind}:{args.port}', 'green'))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    database.pool.close()
+    write_reports(database, args)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,56 @@
+import argparse
+import re
+import time
+from typing import Callable
+
+from menu import CommonMenus, CustomerMenus, WorkerMenus, AdminMenus, clear_menu_caches, menu_cache_info
+from menu.common import EMAIL_PATTERN
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Time building menus per interaction against reusing built menus.')
+    parser.add_argument('--iterations', type=int, default=100000)
+    return parser.parse_args()
+
+
+def time_calls(function: Callable, iterations: int, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function(*args)
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    args = parse_args()
+    clear_menu_caches()
+
+    menus = [
+        ('start', CommonMenus.start_menu, ()),
+        ('sign in', CommonMenus.sign_in_menu, ()),
+        ('sign up', CommonMenus.sign_up_menu, ()),
+        ('customer main', CustomerMenus.main_menu, ('Anna',)),
+        ('checkout', CustomerMenus.checkout_menu, ()),
+        ('worker main', WorkerMenus.main_menu, ('Anna',)),
+        ('clothes field to change', WorkerMenus.specify_clothes_field_to_change_menu, ()),
+        ('admin main', AdminMenus.main_menu, ('Anna',)),
+        ('user field to change', AdminMenus.specify_user_field_to_change_menu, ())
+    ]
+    print(f'{"menu":<26}{"built":>12}{"reused":>12}')
+    for name, build, build_args in menus:
+        built = time_calls(build.__wrapped__, args.iterations, *build_args)
+        reused = time_calls(build, args.iterations, *build_args)
+        print(f'{name:<26}{built * 1e6:>10.2f}us{reused * 1e6:>10.2f}us')
+
+    # the email validator used to search with the pattern string, looked up in re's cache on every call
+    email, pattern = 'anna_k@shop.com', r'^\w+_?\w+@\w+[.]\w{2,3}$'
+    searched = time_calls(lambda value: re.search(pattern, value), args.iterations, email)
+    compiled = time_calls(EMAIL_PATTERN.search, args.iterations, email)
+    print(f'{"email validation":<26}{searched * 1e6:>10.2f}us{compiled * 1e6:>10.2f}us')
+
+    print()
+    for name, info in menu_cache_info().items():
+        print(f'{name:<58}hits: {info.hits:<10}misses: {info.misses:<6}size: {info.currsize}')
+
+
+if __name__ == '__main__':
+    main()
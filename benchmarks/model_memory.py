@@ -0,0 +1,57 @@
+import argparse
+import gc
+import tracemalloc
+import uuid
+from typing import Callable, List, Any
+
+from database import Database, add_config_arguments, create_backend, load_config
+from models import Clothes, ClothesType
+
+
+def parse_args() -> argparse.Namespace:
+    parser = add_config_arguments(argparse.ArgumentParser(
+        description='Compare the memory held by catalog rows fetched as dicts and as slotted models.'))
+    parser.add_argument('--seed', type=int, default=0, help='insert this many clothes before measuring')
+    return parser.parse_args()
+
+
+def seed_clothes(database: Database, rows: int) -> None:
+    if not database.select_ids('clothes_type'):
+        database.insert_clothes_type(ClothesType('benchmark'))
+    clothes_type_id = min(database.select_ids('clothes_type'))
+    suffix = uuid.uuid4().hex[:8]
+
+    query = 'insert into clothes (clothes_type_id, title, description, size, material, color, price, discount, in_stock)' \
+            ' values (%s, %s, %s, %s, %s, %s, %s, %s, %s)'
+    with database._transaction() as cursor:
+        cursor.executemany(query, [(clothes_type_id, f'item {suffix} {i}', 'benchmark', 'M', 'cotton', 'black',
+                                    10.0, 0.0, 100) for i in range(rows)])
+    database.catalog.invalidate()
+
+
+def measure(name: str, fetch: Callable[[], List[Any]]) -> None:
+    gc.collect()
+    tracemalloc.start()
+    rows = fetch()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{name:<16} rows: {len(rows):>8}  retained: {retained / 2 ** 20:8.1f}MiB'
+          f' ({retained / max(len(rows), 1):6.0f}B/row)  peak: {peak / 2 ** 20:8.1f}MiB')
+    del rows
+
+
+def main() -> None:
+    args = parse_args()
+    config = load_config(vars(args))
+    database = Database(backend=create_backend(config))
+    if args.seed:
+        seed_clothes(database, args.seed)
+
+    print(f'backend: {config["backend"]}')
+    measure('dicts', lambda: database._execute_and_fetchall('select * from clothes order by id', params=None))
+    measure('slotted models', lambda: database.select_models(Clothes))
+
+
+if __name__ == '__main__':
+    main()
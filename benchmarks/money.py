@@ -0,0 +1,43 @@
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from utils.money import line_totals, line_totals_cents, to_cents, to_basis_points, from_cents
+from utils.other import calculate_single_item_total
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Time exact order totals for whole arrays of lines.')
+    parser.add_argument('--lines', type=int, default=1000000)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    quantities = [random.randint(1, 10) for _ in range(args.lines)]
+    prices = [Decimal(random.randint(100, 100000)).scaleb(-2) for _ in range(args.lines)]
+    discounts = [Decimal(random.randint(0, 9999)).scaleb(-2) for _ in range(args.lines)]
+
+    start = time.perf_counter()
+    float_total = sum(quantity * float(price) * (1 - float(discount) / 100)
+                      for quantity, price, discount in zip(quantities, prices, discounts))
+    print(f'float per line:       {time.perf_counter() - start:.2f}s  total: {float_total:.6f}')
+
+    start = time.perf_counter()
+    decimal_total = sum(map(calculate_single_item_total, quantities, prices, discounts))
+    print(f'exact per line:       {time.perf_counter() - start:.2f}s  total: {decimal_total}')
+
+    start = time.perf_counter()
+    batch_total = sum(line_totals(quantities, prices, discounts))
+    print(f'exact batch:          {time.perf_counter() - start:.2f}s  total: {batch_total}')
+
+    # repricing keeps prices and discounts in cents and basis points, so only the batch itself is timed
+    prices_cents, discounts_basis_points = list(map(to_cents, prices)), list(map(to_basis_points, discounts))
+    start = time.perf_counter()
+    cents_total = sum(line_totals_cents(quantities, prices_cents, discounts_basis_points))
+    print(f'exact batch in cents: {time.perf_counter() - start:.2f}s  total: {from_cents(cents_total)}')
+
+
+if __name__ == '__main__':
+    main()
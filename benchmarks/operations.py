@@ -0,0 +1,59 @@
+import argparse
+import time
+import uuid
+from datetime import datetime
+from statistics import quantiles
+from typing import Callable, List
+
+from database import Database, add_config_arguments, create_backend, load_config
+from models import User, Clothes, ClothesType, Order, BasketClothes
+
+
+def parse_args() -> argparse.Namespace:
+    parser = add_config_arguments(argparse.ArgumentParser(
+        description='Time login, listing and checkout against the configured backend.'))
+    parser.add_argument('--iterations', type=int, default=1000)
+    return parser.parse_args()
+
+
+def measure(name: str, operation: Callable[[int], None], iterations: int) -> None:
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        operation(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    percentiles = quantiles(latencies, n=100)
+    print(f'{name:<10} p50: {percentiles[49]:.3f}ms  p99: {percentiles[98]:.3f}ms'
+          f'  total: {sum(latencies) / 1000:.2f}s')
+
+
+def main() -> None:
+    args = parse_args()
+    config = load_config(vars(args))
+    database = Database(backend=create_backend(config))
+    print(f'backend: {config["backend"]}, iterations: {args.iterations}')
+
+    suffix = uuid.uuid4().hex[:8]
+    emails = []
+    for i in range(args.iterations):
+        email = f'bench_{suffix}_{i}@bench.com'
+        database.insert_user(User('Bench', 'Mark', str(uuid.uuid4().int)[:10], email, 'x'))
+        emails.append(email)
+    user_id = database.select_user_by_email(emails[0])[0]['id']
+
+    if not database.select_ids('clothes_type'):
+        database.insert_clothes_type(ClothesType('benchmark'))
+    clothes_id = database.insert_clothes(
+        Clothes(min(database.select_ids('clothes_type')), f'item {suffix}', 'benchmark', 'M', 'cotton', 'black',
+                10.0, 0.0, args.iterations * 3),
+        return_id=True)
+    basket: List[BasketClothes] = [BasketClothes(clothes_id, 'item', 'M', 'cotton', 'black', 1, 10.0, 0.0, 10.0)]
+
+    measure('login', lambda i: database.select_user_by_email(emails[i]), args.iterations)
+    measure('checkout', lambda i: database.checkout(Order(user_id, datetime.now()), basket), args.iterations)
+    measure('listing', lambda i: database.select_page('order', after_id=i), args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import random
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from statistics import quantiles
+from typing import List, Tuple, Dict
+
+from app import run_session
+from database import (Database, QueryStats, add_config_arguments, add_instrumentation_arguments, create_backend,
+                      create_instruments, load_config)
+from models import Clothes, ClothesType
+from utils.console import ScriptedConsole, use_console
+from utils.profiling import enable_profiling, profile_report_path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = add_instrumentation_arguments(add_config_arguments(argparse.ArgumentParser(
+        description='Replay scripted terminal sessions concurrently and report per-action latency.')))
+    parser.add_argument('scripts', nargs='+', help='session scripts, assigned to sessions round robin')
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed-stock', type=int, default=0,
+                        help='insert an item with this many pieces in stock and expose it as {clothes_id}')
+    parser.add_argument('--profile', default=None, metavar='REPORT',
+                        help='profile every menu action and write a report here (or set CLOTHING_SHOP_PROFILE)')
+    return parser.parse_args()
+
+
+def parse_script(path: str) -> List[Tuple[str, List[str]]]:
+    # one input per line, "@ name" starts a named action, "#" starts a comment
+    actions = []
+    with open(path) as file:
+        for line in file:
+            line = line.rstrip('\n')
+            if line.startswith('@'):
+                actions.append((line[1:].strip(), []))
+            elif line.strip() and not line.startswith('#'):
+                if not actions:
+                    actions.append(('start', []))
+                actions[-1][1].append(line)
+
+    return actions
+
+
+def render_script(actions: List[Tuple[str, List[str]]], **values) -> List[Tuple[str, List[str]]]:
+    return [(name, [user_input.format(**values) for user_input in inputs]) for name, inputs in actions]
+
+
+def seed_clothes(database: Database, in_stock: int, suffix: str) -> int:
+    if not database.select_ids('clothes_type'):
+        database.insert_clothes_type(ClothesType('benchmark'))
+
+    return database.insert_clothes(
+        Clothes(min(database.select_ids('clothes_type')), f'item {suffix}', 'benchmark', 'M', 'cotton', 'black',
+                10.0, 0.0, in_stock),
+        return_id=True)
+
+
+def run_scripted_session(database: Database, actions: List[Tuple[str, List[str]]]) -> List[Tuple[str, float]]:
+    console = ScriptedConsole(actions)
+    with use_console(console):
+        run_session(database)
+    console.finish()
+
+    return console.timings
+
+
+def report(timings: Dict[str, List[float]]) -> None:
+    print(f'{"action":<24}{"count":>8}{"p50":>10}{"p90":>10}{"p99":>10}{"max":>10}')
+    for name, latencies in timings.items():
+        latencies = [latency * 1000 for latency in latencies]
+        percentiles = quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+        print(f'{name:<24}{len(latencies):>8}{percentiles[49]:>8.2f}ms{percentiles[89]:>8.2f}ms'
+              f'{percentiles[98]:>8.2f}ms{max(latencies):>8.2f}ms')
+
+
+def main() -> None:
+    args = parse_args()
+    config = load_config(vars(args))
+    database = Database(backend=create_backend(config), max_pool_size=args.concurrency,
+                        instruments=create_instruments(args))
+    scripts = [parse_script(path) for path in args.scripts]
+    profiler = enable_profiling() if profile_report_path(args.profile) is not None else None
+
+    suffix = uuid.uuid4().hex[:8]
+    clothes_id = seed_clothes(database, args.seed_stock, suffix) if args.seed_stock else None
+    # phone numbers are unique per user, so every run starts from its own random offset
+    phone_offset = random.randrange(10 ** 9, 9 * 10 ** 9 - args.sessions)
+
+    def session_actions(session: int) -> List[Tuple[str, List[str]]]:
+        return render_script(scripts[session % len(scripts)], session=session, email_suffix=suffix,
+                             phone=phone_offset + session, clothes_id=clothes_id)
+
+    timings = defaultdict(list)
+    failed = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [executor.submit(run_scripted_session, database, session_actions(session))
+                   for session in range(args.sessions)]
+        for future in futures:
+            try:
+                for name, elapsed in future.result():
+                    timings[name].append(elapsed)
+            except Exception as error:
+                failed += 1
+                print(f'session failed: {error!r}')
+    elapsed = time.perf_counter() - start
+
+    actions = sum(len(latencies) for latencies in timings.values())
+    print(f'backend: {config["backend"]}, sessions: {args.sessions - failed} ok / {failed} failed,'
+          f' concurrency: {args.concurrency}')
+    print(f'elapsed: {elapsed:.2f}s, {args.sessions / elapsed:.1f} sessions/s, {actions / elapsed:.1f} actions/s')
+    report(timings)
+
+    for instrument in database.instruments:
+        if isinstance(instrument, QueryStats):
+            print(instrument.report())
+
+    if profiler is not None:
+        profiler.write_report(profile_report_path(args.profile))
+        print(f'profile report written to {profile_report_path(args.profile)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from statistics import median
+from typing import Dict, List, Tuple
+
+from database import add_config_arguments
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = add_config_arguments(argparse.ArgumentParser(
+        description='Measure how long the terminal app takes to import and to show its first screen.'))
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--module', default='app', help='module whose import time is measured')
+    parser.add_argument('--top', type=int, default=15, help='show this many modules with the most own import time')
+    parser.add_argument('--history', default=None,
+                        help='append the result as a json line to this file, to compare across releases')
+    return parser.parse_args()
+
+
+def measure_imports(module: str) -> Tuple[int, Dict[str, int]]:
+    # -X importtime writes "import time: self [us] | cumulative | imported package" lines to stderr
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    total, own_times = 0, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line.removeprefix('import time:').split('|')
+        own_times[name.strip()] = int(own)
+        if name.strip() == module:
+            total = int(cumulative)
+    return total, own_times
+
+
+def measure_first_screen(config_args: List[str]) -> float:
+    # from spawning the process to the start menu asking for a choice, with the database connecting meanwhile
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-u', 'app.py', *config_args], cwd=ROOT, stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        output = ''
+        while 'Enter your choice' not in output:
+            character = process.stdout.read(1)
+            if not character:
+                raise RuntimeError('The app exited before showing the start menu')
+            output += character
+        return time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+
+
+def git_revision() -> str:
+    result = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=ROOT, capture_output=True, text=True)
+    return result.stdout.strip() or 'unknown'
+
+
+def main() -> None:
+    args = parse_args()
+    config_args = [f'--{key}={value}' for key, value in vars(args).items()
+                   if key in ('backend', 'host', 'user', 'password', 'database', 'path') and value is not None]
+
+    import_times, own_times = [], {}
+    for _ in range(args.runs):
+        total, own = measure_imports(args.module)
+        import_times.append(total)
+        for name, value in own.items():
+            own_times.setdefault(name, []).append(value)
+    first_screen_times = [measure_first_screen(config_args) for _ in range(args.runs)]
+
+    result = {
+        'revision': git_revision(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'import_ms': round(median(import_times) / 1000, 2),
+        'first_screen_ms': round(median(first_screen_times) * 1000, 2)
+    }
+    print(f'import {args.module}: {result["import_ms"]:.1f}ms,'
+          f' first screen: {result["first_screen_ms"]:.1f}ms (median of {args.runs} runs)')
+
+    print(f'{"module":<48}{"own":>10}')
+    slowest = sorted(own_times.items(), key=lambda item: median(item[1]), reverse=True)[:args.top]
+    for name, values in slowest:
+        print(f'{name:<48}{median(values) / 1000:>8.2f}ms')
+
+    if args.history is not None:
+        with open(args.history, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(result) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from database import Database, OutOfStockError, add_config_arguments, create_backend, load_config
+from models import User, Clothes, ClothesType, Order, BasketClothes
+
+
+def parse_args() -> argparse.Namespace:
+    parser = add_config_arguments(argparse.ArgumentParser(
+        description='Many threads checking out the same hot clothes item.'))
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--checkouts', type=int, default=2000)
+    parser.add_argument('--in-stock', type=int, default=1000)
+    parser.add_argument('--quantity', type=int, default=1)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    database = Database(
+        backend=create_backend(load_config(vars(args))),
+        min_pool_size=args.threads,
+        max_pool_size=args.threads
+    )
+
+    suffix = uuid.uuid4().hex[:8]
+    user_id = database.insert_user(
+        User('Bench', 'Mark', str(uuid.uuid4().int)[:10], f'bench_{suffix}@bench.com', 'x'), return_id=True)
+    if not database.select_ids('clothes_type'):
+        database.insert_clothes_type(ClothesType('benchmark'))
+    clothes_type_id = min(database.select_ids('clothes_type'))
+
+    clothes_id = database.insert_clothes(
+        Clothes(clothes_type_id, f'hot item {suffix}', 'benchmark', 'M', 'cotton', 'black', 10.0, 0.0, args.in_stock),
+        return_id=True)
+    line = BasketClothes(clothes_id, 'hot item', 'M', 'cotton', 'black', args.quantity, 10.0, 0.0,
+                         10.0 * args.quantity)
+
+    def checkout(_) -> bool:
+        try:
+            database.checkout(Order(user_id, datetime.now()), [line])
+        except OutOfStockError:
+            return False
+        return True
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        results = list(executor.map(checkout, range(args.checkouts)))
+    elapsed = time.perf_counter() - start
+
+    succeeded = sum(results)
+    in_stock = database.select_clothes_by_id(clothes_id)[0]['in_stock']
+    expected_in_stock = args.in_stock - succeeded * args.quantity
+
+    print(f'threads: {args.threads}, checkouts: {args.checkouts}, elapsed: {elapsed:.2f}s,'
+          f' throughput: {args.checkouts / elapsed:.1f} checkouts/s')
+    print(f'succeeded: {succeeded}, rejected: {args.checkouts - succeeded}, in_stock left: {in_stock}')
+
+    if in_stock != expected_in_stock or in_stock < 0:
+        raise SystemExit(f'Lost update detected: expected in_stock {expected_in_stock}, got {in_stock}')
+
+
+if __name__ == '__main__':
+    main()
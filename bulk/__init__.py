@@ -0,0 +1,2 @@
+from .imports import ImportReport, import_clothes, read_rows
+from .exports import EXPORTS, FORMATS, ExportJob, start_export
@@ -0,0 +1,82 @@
+import argparse
+import csv
+import time
+
+from termcolor import colored
+
+from bulk import EXPORTS, FORMATS, import_clothes, start_export
+from database import Database, add_config_arguments, create_backend, load_config
+
+
+def parse_args() -> argparse.Namespace:
+    parser = add_config_arguments(argparse.ArgumentParser(description='Bulk load and unload shop data.'))
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help='import clothes from a .csv or .jsonl file')
+    import_parser.add_argument('file')
+    import_parser.add_argument('--chunk-size', type=int, default=1000, help='rows inserted per transaction')
+    import_parser.add_argument('--rejects', default=None, help='write rejected rows (line, reason) to this csv file')
+
+    export_parser = subparsers.add_parser('export', help='export orders or the catalog to gzip files')
+    export_parser.add_argument('name', choices=sorted(EXPORTS))
+    export_parser.add_argument('directory')
+    export_parser.add_argument('--format', choices=FORMATS, default='csv')
+    export_parser.add_argument('--chunk-ids', type=int, default=10000, help='ids written per file')
+    export_parser.add_argument('--after-id', type=int, default=None, help='export ids greater than this')
+    export_parser.add_argument('--before-id', type=int, default=None, help='export ids less than this')
+
+    return parser.parse_args()
+
+
+def run_import(database: Database, args: argparse.Namespace) -> None:
+    report = import_clothes(database, args.file, chunk_size=args.chunk_size)
+
+    print(colored(f'Imported {report.inserted} of {report.rows} rows in {report.elapsed:.2f}s'
+                  f' ({report.rows_per_second:.0f} rows/s)', 'green'))
+    if not report.rejects:
+        return
+
+    print(colored(f'Rejected {len(report.rejects)} rows', 'red'))
+    if args.rejects is None:
+        for line_number, reason in report.rejects:
+            print(f' line {line_number}: {reason}')
+    else:
+        with open(args.rejects, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['line', 'reason'])
+            writer.writerows(report.rejects)
+
+
+def run_export(database: Database, args: argparse.Namespace) -> None:
+    job = start_export(database, args.name, args.directory, format_=args.format, chunk_ids=args.chunk_ids,
+                       after_id=args.after_id, before_id=args.before_id)
+    start = time.perf_counter()
+
+    try:
+        while job.is_alive():
+            job.join(timeout=1)
+            print(f'\r{job.chunks_done}/{job.chunks_total} chunks, {job.rows} rows', end='', flush=True)
+    except KeyboardInterrupt:
+        # the chunk being written is finished, so a rerun resumes after it
+        job.stop()
+        job.join()
+    print()
+
+    if job.error is not None:
+        raise job.error
+    print(colored(f'Exported {job.rows} rows to {len(job.files)} files in {time.perf_counter() - start:.2f}s,'
+                  f' skipped {len(job.skipped)} existing files', 'green'))
+
+
+def main() -> None:
+    args = parse_args()
+    database = Database(backend=create_backend(load_config(vars(args))))
+
+    if args.command == 'import':
+        run_import(database, args)
+    elif args.command == 'export':
+        run_export(database, args)
+
+
+if __name__ == '__main__':
+    main()
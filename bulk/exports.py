@@ -0,0 +1,134 @@
+import csv
+import gzip
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from database import Database
+
+FORMATS = ('csv', 'jsonl')
+
+
+@dataclass(frozen=True)
+class ExportSource:
+    table: str
+    stream: Callable[[Database, Optional[int], Optional[int]], Iterator[dict]]
+
+
+EXPORTS: Dict[str, ExportSource] = {
+    'orders': ExportSource(
+        table='order',
+        stream=lambda database, after_id, before_id: database.stream_order_items(after_id, before_id)
+    ),
+    'clothes': ExportSource(
+        table='clothes',
+        stream=lambda database, after_id, before_id: database.stream_rows('clothes', after_id, before_id)
+    )
+}
+
+
+def chunk_file_name(name: str, first_id: int, last_id: int, format_: str) -> str:
+    return f'{name}-{first_id:010d}-{last_id:010d}.{format_}.gz'
+
+
+def write_rows(path: str, rows: Iterable[dict], format_: str) -> int:
+    # the chunk is written next to its final name and renamed when complete, so a file that exists is whole
+    part_path = path + '.part'
+    count = 0
+
+    with gzip.open(part_path, 'wt', encoding='utf-8', newline='') as file:
+        if format_ == 'csv':
+            writer = None
+            for row in rows:
+                if writer is None:
+                    writer = csv.DictWriter(file, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in rows:
+                # decimals and datetimes are written as strings, so amounts keep their exact cents
+                file.write(json.dumps(row, default=str) + '\n')
+                count += 1
+
+    os.replace(part_path, path)
+    return count
+
+
+class ExportJob(threading.Thread):
+    # exports ids in (after_id, before_id) in chunks of chunk_ids ids, one gzip file per chunk; each chunk
+    # borrows a single pooled connection only while it streams, so interactive sessions keep running, and
+    # chunks whose file already exists are skipped, so a rerun picks up where an interrupted one stopped
+    def __init__(self, database: Database, name: str, directory: str, format_: str = 'csv',
+                 chunk_ids: int = 10000, after_id: Optional[int] = None, before_id: Optional[int] = None) -> None:
+        if name not in EXPORTS:
+            raise ValueError(f'Expected one of the exports: {sorted(EXPORTS)}, got "{name}" instead')
+        if format_ not in FORMATS:
+            raise ValueError(f'Expected one of the formats: {FORMATS}, got "{format_}" instead')
+        if chunk_ids < 1:
+            raise ValueError('chunk_ids must be at least 1')
+
+        super().__init__(name=f'export-{name}', daemon=True)
+        self.database = database
+        self.export_name = name
+        self.directory = directory
+        self.format = format_
+        self.chunk_ids = chunk_ids
+        self.after_id = after_id
+        self.before_id = before_id
+
+        self.files: List[str] = []
+        self.skipped: List[str] = []
+        self.rows = 0
+        self.chunks_total = 0
+        self.error: Optional[BaseException] = None
+        self._stop_requested = threading.Event()
+
+    @property
+    def chunks_done(self) -> int:
+        return len(self.files) + len(self.skipped)
+
+    def stop(self) -> None:
+        # finishes the chunk being written and stops before the next one
+        self._stop_requested.set()
+
+    def run(self) -> None:
+        try:
+            self._export()
+        except BaseException as error:
+            self.error = error
+
+    def _export(self) -> None:
+        source = EXPORTS[self.export_name]
+        os.makedirs(self.directory, exist_ok=True)
+
+        # the range is fixed when the job starts, rows added while it runs are left for the next export
+        first_id = (self.after_id or 0) + 1
+        if self.before_id is not None:
+            last_id = self.before_id - 1
+        else:
+            last_id = self.database.select_max_id(source.table) or 0
+
+        starts = range(first_id, last_id + 1, self.chunk_ids)
+        self.chunks_total = len(starts)
+
+        for start in starts:
+            if self._stop_requested.is_set():
+                return
+
+            end = min(start + self.chunk_ids - 1, last_id)
+            path = os.path.join(self.directory, chunk_file_name(self.export_name, start, end, self.format))
+            if os.path.exists(path):
+                self.skipped.append(path)
+                continue
+
+            self.rows += write_rows(path, source.stream(self.database, start - 1, end + 1), self.format)
+            self.files.append(path)
+
+
+def start_export(database: Database, name: str, directory: str, **kwargs) -> ExportJob:
+    job = ExportJob(database, name, directory, **kwargs)
+    job.start()
+    return job
@@ -0,0 +1,104 @@
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple
+
+from database import Database
+from menu.role_specific import WorkerMenus
+from models import Clothes
+from user_input_validation import validate_fields
+
+CLOTHES_FIELDS = ['clothes_type_id', 'title', 'description', 'size', 'material', 'color', 'price', 'discount',
+                  'in_stock']
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    inserted: int = 0
+    rejects: List[Tuple[int, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def read_rows(path: str) -> Iterator[Tuple[int, dict]]:
+    # yields (line number, row) so rejects point at the line of the file
+    extension = os.path.splitext(path)[1].lower()
+
+    with open(path, newline='', encoding='utf-8') as file:
+        if extension == '.csv':
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+        elif extension in ('.jsonl', '.ndjson'):
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as error:
+                    row = {'__error__': f'Invalid JSON: {error}'}
+                yield line_number, row if isinstance(row, dict) else {'__error__': 'Expected a JSON object'}
+        else:
+            raise ValueError(f'Expected a .csv or .jsonl file, got {path}')
+
+
+def _insert_chunk(database: Database, chunk: List[Tuple[int, Clothes]], report: ImportReport) -> None:
+    try:
+        database.insert_clothes_many([clothes for _, clothes in chunk])
+        report.inserted += len(chunk)
+        return
+    except database.backend.row_errors:
+        # the chunk was rolled back as a whole, e.g. for a clothes type deleted since validation
+        pass
+
+    # inserting its rows one by one keeps the good ones and reports the bad ones like any other reject
+    for line_number, clothes in chunk:
+        try:
+            database.insert_clothes(clothes)
+        except database.backend.row_errors as error:
+            report.rejects.append((line_number, f'Database error: {error}'))
+        else:
+            report.inserted += 1
+
+
+def import_clothes(database: Database, path: str, chunk_size: int = 1000) -> ImportReport:
+    # rows are checked with the validators of the add clothes menu, so a bulk import accepts exactly
+    # what a worker could type in; valid rows are inserted chunk_size at a time, one transaction per chunk
+    menu = WorkerMenus.add_clothes_menu(existing_clothes_type_ids=database.select_ids(table='clothes_type'))
+    settings = {**menu.choice_menu.settings, **menu.no_choice_menu.settings}
+    names = {name: name for name in CLOTHES_FIELDS}
+
+    report = ImportReport()
+    chunk = []
+    start = time.perf_counter()
+
+    for line_number, row in read_rows(path):
+        report.rows += 1
+        if '__error__' in row:
+            report.rejects.append((line_number, row['__error__']))
+            continue
+
+        try:
+            values = validate_fields(settings, row, names=names, strict=False)
+        except ValueError as error:
+            report.rejects.append((line_number, str(error)))
+            continue
+
+        chunk.append((line_number, Clothes(**values)))
+        if len(chunk) == chunk_size:
+            _insert_chunk(database, chunk, report)
+            chunk = []
+
+    if chunk:
+        _insert_chunk(database, chunk, report)
+
+    # rows failing in the database are found after the validation rejects of the lines behind them
+    report.rejects.sort()
+    report.elapsed = time.perf_counter() - start
+    return report
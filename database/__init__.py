@@ -1 +1,17 @@
-from .database import Database
+from .backends import Backend, SQLiteBackend, create_backend
+from .cache import CatalogCache, ReferenceCache, SessionCache, TableVersions
+from .config import load_config, add_config_arguments
+from .database import ClothesNotFoundError, Database, OutOfStockError
+from .instrumentation import (Instrument, QueryEvent, QueryStats, SlowQueryLog, add_instrumentation_arguments,
+                              create_instruments, fingerprint)
+from .lookup import IdLookup
+from .pagination import Paginator
+from .pool import ConnectionPool, PoolTimeoutError
+
+
+def __getattr__(name: str):
+    # asyncio is slow to import and only the JSON API needs it, so the wrapper is loaded when first asked for
+    if name == 'AsyncDatabase':
+        from .aio import AsyncDatabase
+        return AsyncDatabase
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,44 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Any, Optional
+
+from database.database import Database
+from database.instrumentation import calling, find_caller
+
+
+class AsyncDatabase:
+    def __init__(self, database: Database, executor: Optional[ThreadPoolExecutor] = None) -> None:
+        self.database = database
+
+        # one thread per pooled connection, so a blocked call never waits on the pool while holding a thread
+        self.executor = executor or ThreadPoolExecutor(max_workers=database.pool.max_size,
+                                                       thread_name_prefix='database')
+
+    async def run(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        if self.database.instruments:
+            # the awaiting coroutine is only on the stack here, not on the executor thread
+            return await loop.run_in_executor(self.executor, functools.partial(
+                self._run_as, find_caller(), function, *args, **kwargs))
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+    @staticmethod
+    def _run_as(caller: Optional[str], function: Callable[..., Any], *args, **kwargs) -> Any:
+        with calling(caller):
+            return function(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # caches and other attributes are shared as is, public Database methods become coroutines
+        attribute = getattr(self.database, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        async def call(*args, **kwargs) -> Any:
+            return await self.run(attribute, *args, **kwargs)
+
+        return call
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.database.pool.close()
@@ -0,0 +1,17 @@
+from .base import Backend
+from .sqlite import SQLiteBackend
+
+
+def create_backend(config: dict) -> Backend:
+    if config['backend'] == 'mysql':
+        from .mysql import MySQLBackend
+        return MySQLBackend(
+            host=config['host'],
+            user=config['user'],
+            password=config['password'],
+            database=config['database']
+        )
+    elif config['backend'] == 'sqlite':
+        return SQLiteBackend(path=config['path'])
+
+    raise ValueError(f'Unknown database backend "{config["backend"]}", expected "mysql" or "sqlite"')
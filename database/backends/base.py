@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Tuple, Type
+
+
+class Backend(ABC):
+    name: str
+    integrity_error: Type[Exception]
+    # errors caused by the values of a row, e.g. a missing foreign key or a value out of the column's range
+    row_errors: Tuple[Type[Exception], ...]
+    explain_prefix: str
+    # whether every statement outside begin() commits by itself, so single statements need no commit
+    autocommit: bool
+
+    @abstractmethod
+    def connect(self) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def cursor(self, connection: Any, dictionary: bool = True) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def begin(self, connection: Any) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_lock_conflict(self, error: Exception) -> bool:
+        # a deadlock or lock wait timeout, after which the transaction can simply be run again
+        raise NotImplementedError
+
+    @abstractmethod
+    def ping(self, connection: Any) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def full_scan_table(self, plan: dict) -> Optional[str]:
+        raise NotImplementedError
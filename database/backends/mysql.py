@@ -0,0 +1,58 @@
+from typing import Any, Optional, Tuple, Type
+
+from database.backends.base import Backend
+
+
+# ER_LOCK_WAIT_TIMEOUT and ER_LOCK_DEADLOCK
+LOCK_CONFLICT_ERRNOS = (1205, 1213)
+
+
+def _connector() -> Any:
+    # the driver takes longer to import than the rest of the app, so it is loaded with the first connection
+    import mysql.connector
+    return mysql.connector
+
+
+class MySQLBackend(Backend):
+    name = 'mysql'
+    explain_prefix = 'explain '
+    # reads don't leave a transaction, and with it an old snapshot, open on a pooled connection
+    autocommit = True
+
+    def __init__(self, host: str, user: str, password: str, database: str) -> None:
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+
+    @property
+    def integrity_error(self) -> Type[Exception]:
+        return _connector().errors.IntegrityError
+
+    @property
+    def row_errors(self) -> Tuple[Type[Exception], ...]:
+        return _connector().errors.IntegrityError, _connector().errors.DataError
+
+    def connect(self) -> Any:
+        return _connector().connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            autocommit=self.autocommit
+        )
+
+    def cursor(self, connection: Any, dictionary: bool = True) -> Any:
+        return connection.cursor(dictionary=dictionary)
+
+    def begin(self, connection: Any) -> None:
+        connection.start_transaction()
+
+    def is_lock_conflict(self, error: Exception) -> bool:
+        return isinstance(error, _connector().Error) and error.errno in LOCK_CONFLICT_ERRNOS
+
+    def ping(self, connection: Any) -> None:
+        connection.ping(reconnect=False)
+
+    def full_scan_table(self, plan: dict) -> Optional[str]:
+        return plan['table'] if plan['type'] == 'ALL' else None
@@ -0,0 +1,95 @@
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional, List, Iterable, Iterator
+
+from database.backends.base import Backend
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=' '))
+sqlite3.register_adapter(Decimal, str)
+
+
+def _dict_row_factory(cursor: sqlite3.Cursor, row: tuple) -> dict:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class _SQLiteCursor:
+    # accepts the %s paramstyle the Database queries are written in
+    def __init__(self, cursor: sqlite3.Cursor) -> None:
+        self._cursor = cursor
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    def execute(self, query: str, params: Optional[tuple] = None) -> '_SQLiteCursor':
+        self._cursor.execute(query.replace('%s', '?'), params or ())
+        return self
+
+    def executemany(self, query: str, seq_of_params: Iterable[tuple]) -> '_SQLiteCursor':
+        self._cursor.executemany(query.replace('%s', '?'), seq_of_params)
+        return self
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._cursor)
+
+    def fetchone(self) -> Optional[dict]:
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size: int) -> List[dict]:
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self) -> List[dict]:
+        return self._cursor.fetchall()
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class SQLiteBackend(Backend):
+    name = 'sqlite'
+    integrity_error = sqlite3.IntegrityError
+    row_errors = (sqlite3.IntegrityError, sqlite3.DataError)
+    explain_prefix = 'explain query plan '
+    # the driver opens a transaction before the first write, which has to be committed
+    autocommit = False
+
+    def __init__(self, path: str, busy_timeout: float = 30.0) -> None:
+        self.path = path
+        self.busy_timeout = busy_timeout
+
+    def connect(self) -> Any:
+        # pooled connections are handed between threads, but only ever used by one at a time
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+        connection.row_factory = _dict_row_factory
+        connection.execute('pragma journal_mode = wal')
+        connection.execute('pragma synchronous = normal')
+        connection.execute('pragma foreign_keys = on')
+        return connection
+
+    def cursor(self, connection: Any, dictionary: bool = True) -> Any:
+        cursor = connection.cursor()
+        if not dictionary:
+            cursor.row_factory = None
+        return _SQLiteCursor(cursor)
+
+    def begin(self, connection: Any) -> None:
+        connection.execute('begin')
+
+    def is_lock_conflict(self, error: Exception) -> bool:
+        # raised once the busy timeout has passed without getting the write lock
+        return isinstance(error, sqlite3.OperationalError) and 'locked' in str(error)
+
+    def ping(self, connection: Any) -> None:
+        connection.execute('select 1')
+
+    def full_scan_table(self, plan: dict) -> Optional[str]:
+        # plan details look like "SCAN u" or "SEARCH u USING INDEX user_email_uindex (email=?)"
+        detail = plan['detail'].split()
+        if detail[0] == 'SCAN' and 'INDEX' not in detail:
+            return detail[1]
+        return None
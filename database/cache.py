@@ -0,0 +1,285 @@
+import copy
+import itertools
+import secrets
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, List, Optional, Dict, Set
+
+from models import User
+
+# unique across caches, so a version names one snapshot or table state even with several Database instances
+# in a process
+_snapshot_versions = itertools.count(1)
+
+
+class CatalogSnapshot:
+    def __init__(self, rows: List[dict], version: int, loaded_at: Optional[float] = None) -> None:
+        self.rows = rows
+        self.version = version
+        self.ids = [row['id'] for row in rows]
+        self.rows_by_id = {row['id']: row for row in rows}
+        self.loaded_at = time.monotonic() if loaded_at is None else loaded_at
+
+    def replace_rows(self, ids: Iterable[int], rows: List[dict], version: int) -> 'CatalogSnapshot':
+        # a copy with the rows of ids swapped for their fresh rows, or dropped if they no longer exist; it keeps
+        # the load time, so the ttl still bounds how long the other rows are served
+        stale_ids = set(ids)
+        fresh_rows = {row['id']: row for row in rows}
+
+        # the common case of rows changing in place reuses the ids and copies the rest without a python loop
+        if fresh_rows.keys() == stale_ids and all(id_ in self.rows_by_id for id_ in stale_ids):
+            snapshot = copy.copy(self)
+            snapshot.version = version
+            snapshot.rows = list(self.rows)
+            snapshot.rows_by_id = {**self.rows_by_id, **fresh_rows}
+            for id_, row in fresh_rows.items():
+                snapshot.rows[bisect_left(self.ids, id_)] = row
+            return snapshot
+
+        merged = {id_: row for id_, row in self.rows_by_id.items() if id_ not in stale_ids}
+        merged.update(fresh_rows)
+        return CatalogSnapshot([merged[id_] for id_ in sorted(merged)], version=version, loaded_at=self.loaded_at)
+
+
+class _Load:
+    # a catalog load in flight, which sessions missing the cache meanwhile wait for
+    def __init__(self, generation: int) -> None:
+        self.generation = generation
+        self.done = threading.Event()
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self.error: Optional[BaseException] = None
+
+
+class CatalogCache:
+    def __init__(self, ttl: float = 30.0) -> None:
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._snapshot = None
+        self._loading: Optional[_Load] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_all(self, load: Callable[[], List[dict]]) -> List[dict]:
+        return list(self._get(load).rows)
+
+    def get_by_id(self, id_: int, load: Callable[[], List[dict]]) -> Optional[dict]:
+        return self._get(load).rows_by_id.get(id_)
+
+    def invalidate(self) -> None:
+        # a load in flight is left to its waiters, and the next miss starts a fresh one
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+            self._loading = None
+
+    def refresh_rows(self, ids: List[int], load_rows: Callable[[List[int]], List[dict]]) -> None:
+        # after a write to a few known rows, e.g. the stock taken by a checkout, only those rows are read again
+        # and swapped into a new snapshot instead of reloading the whole catalog
+        with self._lock:
+            self._generation += 1
+            self._loading = None
+            snapshot = self._snapshot
+        if snapshot is None:
+            return
+
+        rows = load_rows(ids)
+        with self._lock:
+            # a snapshot installed meanwhile was loaded after the write, so it holds these rows already
+            if self._snapshot is snapshot:
+                self._snapshot = snapshot.replace_rows(ids, rows, version=next(_snapshot_versions))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def _get(self, load: Callable[[], List[dict]]) -> CatalogSnapshot:
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and not self._is_expired(snapshot):
+                self.hits += 1
+                return snapshot
+
+            # single flight: concurrent sessions missing at once wait for one load instead of all querying
+            loading = self._loading
+            is_loader = loading is None
+            if is_loader:
+                self.misses += 1
+                loading = self._loading = _Load(self._generation)
+            else:
+                self.hits += 1
+
+        if not is_loader:
+            loading.done.wait()
+            if loading.error is not None:
+                raise loading.error
+            return loading.snapshot
+
+        # the query runs outside the lock, so writes invalidating the cache don't wait behind it
+        try:
+            loading.snapshot = CatalogSnapshot(load(), version=next(_snapshot_versions))
+        except BaseException as error:
+            loading.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._loading is loading:
+                    self._loading = None
+                # an invalidation that raced with the load means the rows may already be stale
+                if loading.snapshot is not None and loading.generation == self._generation:
+                    self._snapshot = loading.snapshot
+            loading.done.set()
+        return loading.snapshot
+
+    def _is_expired(self, snapshot: CatalogSnapshot) -> bool:
+        return time.monotonic() - snapshot.loaded_at > self.ttl
+
+
+class ReferenceCache:
+    # small lookup tables and the column holding their value
+    tables = {
+        'role': 'role',
+        'status': 'status',
+        'clothes_type': 'type'
+    }
+
+    def __init__(self, load: Callable[[str], List[dict]]) -> None:
+        self._load = load
+        self._mappings = {}
+        self._versions = {table: 0 for table in self.tables}
+        # refreshes are numbered in the order they start, and a later one has read at least as new rows
+        self._refreshes = itertools.count(1)
+        self._installed = {table: 0 for table in self.tables}
+        self._lock = threading.Lock()
+
+    def get(self, table: str) -> Dict[int, str]:
+        mapping = self._mappings.get(table)
+        if mapping is None:
+            mapping = self.refresh(table)
+        return mapping
+
+    def version(self, table: str) -> int:
+        return self._versions[table]
+
+    def refresh(self, table: Optional[str] = None) -> Optional[Dict[int, str]]:
+        tables = self.tables if table is None else [table]
+
+        with self._lock:
+            refresh = next(self._refreshes)
+
+        # the queries run outside the lock, which only guards swapping the new mappings in
+        mappings = {}
+        for table_ in tables:
+            column = self.tables[table_]
+            mappings[table_] = {row['id']: row[column] for row in self._load(table_)}
+
+        with self._lock:
+            for table_, mapping in mappings.items():
+                if refresh > self._installed[table_]:
+                    self._mappings[table_] = mapping
+                    self._installed[table_] = refresh
+                    self._versions[table_] += 1
+
+        return None if table is None else self._mappings[table]
+
+    def rows(self, table: str) -> List[dict]:
+        column = self.tables[table]
+        return [{'id': id_, column: value} for id_, value in self.get(table).items()]
+
+
+class TableVersions:
+    # a version per table that every write through the Database bumps, so pages read at one version come from
+    # the same data; deleting a row also deletes the rows referencing it
+    cascades = {
+        'role': ('user',),
+        'user': ('order',),
+        'status': ('order',),
+        'order': ('item_ordered',),
+        'clothes_type': ('clothes',),
+        'clothes': ('item_ordered',)
+    }
+
+    def __init__(self) -> None:
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, table: str) -> int:
+        with self._lock:
+            version = self._versions.get(table)
+            if version is None:
+                version = self._versions[table] = next(_snapshot_versions)
+            return version
+
+    def bump(self, *tables: str, deleted: bool = False) -> None:
+        tables = list(tables)
+        if deleted:
+            for table in tables:
+                tables.extend(table_ for table_ in self.cascades.get(table, ()) if table_ not in tables)
+
+        with self._lock:
+            for table in tables:
+                self._versions[table] = next(_snapshot_versions)
+
+
+class SessionCache:
+    # a user may be signed in from several clients at once, each with its own token
+    def __init__(self, ttl: float = 1800.0) -> None:
+        self.ttl = ttl
+        self._sessions = {}
+        self._tokens_by_email: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, user: User) -> str:
+        token = secrets.token_urlsafe(32)
+        now = time.monotonic()
+        with self._lock:
+            # other sessions of the user stay signed in; only those that expired unread are dropped
+            tokens = self._tokens_by_email.setdefault(user.email, set())
+            for expired_token in [token_ for token_ in tokens if self._sessions[token_][1] < now]:
+                tokens.discard(expired_token)
+                del self._sessions[expired_token]
+
+            self._sessions[token] = (user, now + self.ttl)
+            tokens.add(token)
+        return token
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, token: str) -> Optional[User]:
+        session = self._sessions.get(token)
+        if session is None:
+            return None
+
+        user, expires_at = session
+        if time.monotonic() > expires_at:
+            self.revoke(token)
+            return None
+        return user
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        # the user of any live session signed in with this email
+        for token in list(self._tokens_by_email.get(email, ())):
+            user = self.get(token)
+            if user is not None:
+                return user
+        return None
+
+    def revoke(self, token: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(token, None)
+            if session is None:
+                return
+
+            tokens = self._tokens_by_email.get(session[0].email)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_email[session[0].email]
+
+    def revoke_user(self, user_id: int) -> None:
+        tokens = [token for token, (user, _) in list(self._sessions.items()) if user.id == user_id]
+        for token in tokens:
+            self.revoke(token)
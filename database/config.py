@@ -0,0 +1,30 @@
+import argparse
+import os
+from typing import Optional
+
+DEFAULT_CONFIG = {
+    'backend': 'mysql',
+    'host': 'localhost',
+    'user': 'root',
+    'password': 'qwerty',
+    'database': 'clothing_shop_db',
+    'path': 'clothing_shop.db'
+}
+
+
+def load_config(overrides: Optional[dict] = None) -> dict:
+    config = {key: os.environ.get(f'CLOTHING_SHOP_DB_{key.upper()}', value) for key, value in DEFAULT_CONFIG.items()}
+
+    if overrides is not None:
+        config.update({key: value for key, value in overrides.items() if key in config and value is not None})
+    return config
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    parser.add_argument('--backend', choices=['mysql', 'sqlite'], default=None)
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--user', default=None)
+    parser.add_argument('--password', default=None)
+    parser.add_argument('--database', default=None)
+    parser.add_argument('--path', default=None, help='database file of the sqlite backend')
+    return parser
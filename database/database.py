@@ -1,53 +1,364 @@
-from typing import List, Tuple, Optional
+import hmac
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import fields
+from decimal import Decimal
+from typing import List, Tuple, Optional, Iterator, Any, Set, Dict, Type, TypeVar, Callable, Sequence
 
-import mysql.connector
+from database.backends import Backend
+from database.cache import CatalogCache, ReferenceCache, SessionCache, TableVersions
+from database.instrumentation import Instrument, InstrumentedCursor
+from database.lookup import IdLookup
+from database.pool import ConnectionPool
+from models import User, Order, ItemOrdered, Clothes, ClothesType, Role, Status, BasketClothes, Page
+from utils import line_totals
 
-from models import User, Order, ItemOrdered, Clothes, ClothesType, Role, Status
-from utils import calculate_single_item_total
+Model = TypeVar('Model')
+Result = TypeVar('Result')
+
+
+class OutOfStockError(Exception):
+    def __init__(self, clothes_ids: List[int]) -> None:
+        super().__init__(f'Not enough items in stock for clothes with ids {clothes_ids}')
+        self.clothes_ids = clothes_ids
+
+
+class ClothesNotFoundError(Exception):
+    def __init__(self, clothes_ids: List[int]) -> None:
+        super().__init__(f'Clothes with ids {clothes_ids} no longer exist')
+        self.clothes_ids = clothes_ids
 
 
 class Database:
-    def __init__(self, host: str, user: str, password: str, database: str) -> None:
-        self.db = mysql.connector.connect(
-            host=host,
-            user=user,
-            password=password,
-            database=database
+    model_tables = {
+        User: 'user',
+        Role: 'role',
+        Status: 'status',
+        ClothesType: 'clothes_type',
+        Clothes: 'clothes',
+        Order: 'order',
+        ItemOrdered: 'item_ordered'
+    }
+
+    def __init__(
+            self,
+            backend: Backend,
+            min_pool_size: int = 1,
+            max_pool_size: int = 5,
+            pool_timeout: float = 10.0,
+            health_check: bool = True,
+            catalog_ttl: float = 30.0,
+            session_ttl: float = 1800.0,
+            page_size: int = 20,
+            fetch_size: int = 500,
+            preload_references: bool = True,
+            instruments: Optional[List[Instrument]] = None,
+            lazy_connect: bool = False,
+            transaction_attempts: int = 3,
+            retry_delay: float = 0.05
+    ) -> None:
+        self.backend = backend
+        self.transaction_attempts = transaction_attempts
+        self.retry_delay = retry_delay
+        self.instruments = list(instruments or [])
+        self.pool = ConnectionPool(
+            connect=backend.connect,
+            ping=backend.ping,
+            min_size=min_pool_size,
+            max_size=max_pool_size,
+            timeout=pool_timeout,
+            health_check=health_check,
+            lazy=lazy_connect
         )
-        self.cursor = self.db.cursor(dictionary=True)
+        self.catalog = CatalogCache(ttl=catalog_ttl)
+        self.references = ReferenceCache(load=self._select_reference_rows)
+        # a lazily connected database does no I/O until its first query or warm_up
+        if preload_references and not lazy_connect:
+            self.references.refresh()
+        self.sessions = SessionCache(ttl=session_ttl)
+        self.table_versions = TableVersions()
+        self.page_size = page_size
+        self.fetch_size = fetch_size
+
+    def warm_up(self) -> None:
+        self.pool.fill()
+        self.references.refresh()
+
+    def start_warm_up(self) -> threading.Thread:
+        # connects while the first screen is shown; a failure is left for the first query to report,
+        # which retries the connection anyway
+        def warm_up_quietly() -> None:
+            try:
+                self.warm_up()
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=warm_up_quietly, name='database-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def add_instrument(self, instrument: Instrument) -> None:
+        self.instruments.append(instrument)
+
+    def _cursor(self, connection: Any, dictionary: bool = True) -> Any:
+        # statements are only timed while an instrument is listening
+        cursor = self.backend.cursor(connection, dictionary=dictionary)
+        if self.instruments:
+            return InstrumentedCursor(cursor, self.instruments)
+        return cursor
+
+    @staticmethod
+    def _commit(connection: Any, cursor: Any) -> None:
+        if not isinstance(cursor, InstrumentedCursor):
+            connection.commit()
+            return
+
+        start = time.perf_counter()
+        connection.commit()
+        cursor.record_commit(time.perf_counter() - start)
 
     def _execute_and_commit(self, query: str, params: Optional[Tuple], return_id: bool) -> Optional[int]:
-        self.cursor.execute(query, params)
-        self.db.commit()
-        return self.cursor.lastrowid if return_id else None
+        connection = self.pool.acquire()
+        finished = False
+        try:
+            cursor = self._cursor(connection)
+            try:
+                cursor.execute(query, params)
+                if not self.backend.autocommit:
+                    self._commit(connection, cursor)
+                finished = True
+                return cursor.lastrowid if return_id else None
+            finally:
+                cursor.close()
+        finally:
+            self.pool.release(connection, rollback=not finished)
 
     def _execute_and_fetchall(self, query: str, params: Optional[Tuple]) -> List[dict]:
-        self.cursor.execute(query, params)
-        return self.cursor.fetchall()
+        with self.pool.connection() as connection:
+            cursor = self._cursor(connection)
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def _execute_and_stream(self, query: str, params: Optional[Tuple],
+                            fetch_size: Optional[int] = None) -> Iterator[dict]:
+        # the connection stays borrowed until the caller has read every row or closed the generator,
+        # and at most fetch_size rows are held on the client at a time
+        fetch_size = fetch_size or self.fetch_size
+        connection = self.pool.acquire()
+        exhausted = False
+        try:
+            cursor = self._cursor(connection)
+            try:
+                cursor.execute(query, params)
+                while rows := cursor.fetchmany(fetch_size):
+                    yield from rows
+                exhausted = True
+            finally:
+                # an unbuffered MySQL cursor refuses to close with rows left unread
+                try:
+                    cursor.close()
+                except Exception:
+                    if exhausted:
+                        raise
+        finally:
+            # reading the rest of a result the caller stopped early could take long, so the connection
+            # is closed instead and the pool opens a new one when needed
+            if exhausted:
+                self.pool.release(connection)
+            else:
+                self.pool.discard(connection)
+
+    def _execute_and_fetch_models(self, query: str, params: Optional[Tuple], model: Type[Model]) -> List[Model]:
+        # plain tuples go straight into the slotted model, so no dict is ever built for a row
+        with self.pool.connection() as connection:
+            cursor = self._cursor(connection, dictionary=False)
+            try:
+                cursor.execute(query, params)
+                return [model(*row) for row in cursor]
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Any]:
+        # a transaction that doesn't reach its commit is rolled back when the connection is returned
+        connection = self.pool.acquire()
+        finished = False
+        try:
+            self.backend.begin(connection)
+            cursor = self._cursor(connection)
+            try:
+                yield cursor
+                self._commit(connection, cursor)
+                finished = True
+            finally:
+                cursor.close()
+        finally:
+            self.pool.release(connection, rollback=not finished)
 
-    def select_user_by_email_and_phash(self, email: str, password_hash: str) -> List[dict]:
-        query = 'select * from user as u where (u.email = %s and u.password_hash = %s)'
-        params = (email, password_hash)
+    def _retry_transaction(self, work: Callable[[Any], Result]) -> Result:
+        # the server rolls back a transaction that lost a deadlock or timed out waiting for a lock, so the whole
+        # transaction is run again, after a jittered backoff so the competing ones don't collide again
+        delay = self.retry_delay
+        for attempt in range(self.transaction_attempts):
+            try:
+                with self._transaction() as cursor:
+                    return work(cursor)
+            except Exception as error:
+                if attempt == self.transaction_attempts - 1 or not self.backend.is_lock_conflict(error):
+                    raise
+                time.sleep(delay * random.uniform(0.5, 1.5))
+                delay *= 2
+
+    def select_user_by_email(self, email: str) -> List[dict]:
+        query = 'select id, first_name, last_name, phone_number, email, password_hash, role_id' \
+                ' from user as u where u.email = %s limit 1'
+        params = (email,)
         return self._execute_and_fetchall(query, params=params)
 
+    def authenticate(self, email: str, password_hash: str) -> Optional[User]:
+        # users signed in earlier in this process are verified without a round-trip
+        user = self.sessions.get_by_email(email)
+
+        if user is None:
+            response = self.select_user_by_email(email)
+            if len(response) == 0:
+                return None
+            user = User(**response[0])
+
+        if not hmac.compare_digest(user.password_hash, password_hash):
+            return None
+        return user
+
     def select_all_columns_from_table(self, table: str) -> List[dict]:
+        if table == 'clothes':
+            return self.catalog.get_all(load=self._select_all_clothes)
+        if table in ReferenceCache.tables:
+            return self.references.rows(table)
+
         query = 'select * from `%s`' % table
         return self._execute_and_fetchall(query, params=None)
 
+    def select_page(
+            self,
+            table: str,
+            after_id: Optional[int] = None,
+            before_id: Optional[int] = None,
+            page_size: Optional[int] = None
+    ) -> Page:
+        page_size = page_size or self.page_size
+        # read before the rows, so a write that lands meanwhile gives later pages a newer version
+        version = self.table_versions.get(table)
+
+        # one extra row tells whether there is anything beyond this page; the catalog is paged in the database
+        # too, so listing it never loads the whole table
+        if before_id is not None:
+            query = 'select * from `%s` where id < %%s order by id desc limit %%s' % table
+            rows = self._execute_and_fetchall(query, params=(before_id, page_size + 1))
+        elif after_id is not None:
+            query = 'select * from `%s` where id > %%s order by id limit %%s' % table
+            rows = self._execute_and_fetchall(query, params=(after_id, page_size + 1))
+        else:
+            query = 'select * from `%s` order by id limit %%s' % table
+            rows = self._execute_and_fetchall(query, params=(page_size + 1,))
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if before_id is not None:
+            return Page(rows=rows[::-1], has_next=True, has_previous=has_more, version=version)
+        return Page(rows=rows, has_next=has_more, has_previous=after_id is not None, version=version)
+
+    def select_models(self, model: Type[Model], after_id: Optional[int] = None,
+                      limit: Optional[int] = None) -> List[Model]:
+        # columns are selected in field order so every row maps positionally onto the model
+        columns = ', '.join(field.name for field in fields(model))
+        query = 'select %s from `%s`' % (columns, self.model_tables[model])
+        params = ()
+
+        if after_id is not None:
+            query += ' where id > %s'
+            params += (after_id,)
+        query += ' order by id'
+        if limit is not None:
+            query += ' limit %s'
+            params += (limit,)
+
+        return self._execute_and_fetch_models(query, params=params, model=model)
+
+    def stream_rows(
+            self,
+            table: str,
+            after_id: Optional[int] = None,
+            before_id: Optional[int] = None,
+            fetch_size: Optional[int] = None
+    ) -> Iterator[dict]:
+        # every row of the table in id order, optionally within the id range (after_id, before_id)
+        conditions, params = [], ()
+        if after_id is not None:
+            conditions.append('id > %s')
+            params += (after_id,)
+        if before_id is not None:
+            conditions.append('id < %s')
+            params += (before_id,)
+
+        query = 'select * from `%s`' % table
+        if conditions:
+            query += ' where ' + ' and '.join(conditions)
+        query += ' order by id'
+        return self._execute_and_stream(query, params=params, fetch_size=fetch_size)
+
+    def select_max_id(self, table: str) -> Optional[int]:
+        query = 'select max(id) as max_id from `%s`' % table
+        return self._execute_and_fetchall(query, params=None)[0]['max_id']
+
+    def select_ids(self, table: str) -> Set[int]:
+        if table == 'clothes':
+            return {row['id'] for row in self.catalog.get_all(load=self._select_all_clothes)}
+        if table in ReferenceCache.tables:
+            return set(self.references.get(table))
+
+        query = 'select id from `%s`' % table
+        return {row['id'] for row in self._execute_and_fetchall(query, params=None)}
+
+    def exists_by_id(self, table: str, id_: int) -> bool:
+        if table == 'clothes':
+            return self.catalog.get_by_id(id_, load=self._select_all_clothes) is not None
+        if table in ReferenceCache.tables:
+            return id_ in self.references.get(table)
+
+        query = 'select 1 from `%s` where id = %%s limit 1' % table
+        return len(self._execute_and_fetchall(query, params=(id_,))) != 0
+
+    def id_lookup(self, table: str) -> IdLookup:
+        return IdLookup(table=table, exists=self.exists_by_id)
+
+    def select_reference(self, table: str) -> Dict[int, str]:
+        return dict(self.references.get(table))
+
     def select_column_from_table(self, column: str, table: str) -> List[dict]:
+        if ReferenceCache.tables.get(table) == column:
+            return [{column: value} for value in self.references.get(table).values()]
+
         query = 'select %s from %s' % (column, table)
         return self._execute_and_fetchall(query, params=None)
 
     def select_clothes_by_id(self, clothes_id: int) -> List[dict]:
-        query = 'select * from clothes as c where c.id = %s'
-        params = (clothes_id,)
-        return self._execute_and_fetchall(query, params=params)
+        clothes = self.catalog.get_by_id(clothes_id, load=self._select_all_clothes)
+        return [] if clothes is None else [clothes]
 
     def select_user_orders(self, user_id: int) -> List[dict]:
+        return list(self.stream_user_orders(user_id))
+
+    def stream_user_orders(self, user_id: int, fetch_size: Optional[int] = None) -> Iterator[dict]:
         query = 'select o.id, o.date_time, s.status from `order` as o, status as s' \
-                ' where o.user_id = %s and o.status_id = s.id '
+                ' where o.user_id = %s and o.status_id = s.id order by o.id'
         params = (user_id,)
-        return self._execute_and_fetchall(query, params=params)
+        return self._execute_and_stream(query, params=params, fetch_size=fetch_size)
 
     def select_single_user_order(self, order_id: int) -> List[dict]:
         query = 'select order_id, title, size, material, color, quantity, price, c.discount, total, date_time, s.status' \
@@ -58,65 +369,216 @@ class Database:
         params = (order_id,)
         return self._execute_and_fetchall(query, params=params)
 
+    def stream_order_items(
+            self,
+            after_order_id: Optional[int] = None,
+            before_order_id: Optional[int] = None,
+            fetch_size: Optional[int] = None
+    ) -> Iterator[dict]:
+        # the rows of select_single_user_order for every order in the id range (after_order_id, before_order_id)
+        query = 'select order_id, title, size, material, color, quantity, price, c.discount, total, date_time, s.status' \
+                ' from status as s, `order` as o' \
+                ' join item_ordered i on o.id = i.order_id' \
+                ' join clothes c on c.id = i.clothes_id' \
+                ' where o.status_id = s.id'
+        params = ()
+        if after_order_id is not None:
+            query += ' and o.id > %s'
+            params += (after_order_id,)
+        if before_order_id is not None:
+            query += ' and o.id < %s'
+            params += (before_order_id,)
+        query += ' order by o.id, i.id'
+        return self._execute_and_stream(query, params=params, fetch_size=fetch_size)
+
     def insert_clothes(self, clothes: Clothes, return_id: bool = False) -> Optional[int]:
         query = 'insert into clothes (clothes_type_id, title, description, size, material, color, price, discount, in_stock)' \
                 ' values (%s, %s, %s, %s, %s, %s, %s, %s, %s)'
         params = (clothes.clothes_type_id, clothes.title, clothes.description, clothes.size,
                   clothes.material, clothes.color, clothes.price, clothes.discount, clothes.in_stock)
-        return self._execute_and_commit(query, params=params, return_id=return_id)
+        id_ = self._execute_and_commit(query, params=params, return_id=return_id)
+        self.table_versions.bump('clothes')
+        self.catalog.invalidate()
+        return id_
+
+    def insert_clothes_many(self, clothes: List[Clothes]) -> None:
+        # one transaction and one executemany for the whole batch
+        query = 'insert into clothes (clothes_type_id, title, description, size, material, color, price, discount, in_stock)' \
+                ' values (%s, %s, %s, %s, %s, %s, %s, %s, %s)'
+        params = [(item.clothes_type_id, item.title, item.description, item.size, item.material, item.color,
+                   item.price, item.discount, item.in_stock) for item in clothes]
+
+        with self._transaction() as cursor:
+            cursor.executemany(query, params)
+        self.table_versions.bump('clothes')
+        self.catalog.invalidate()
 
     def insert_user(self, user: User, return_id: bool = False) -> Optional[int]:
         query = 'insert into user (first_name, last_name, phone_number, email, password_hash)' \
                 ' values (%s, %s, %s, %s, %s)'
         params = (user.first_name, user.last_name, user.phone_number, user.email, user.password_hash)
-        return self._execute_and_commit(query, params=params, return_id=return_id)
+        id_ = self._execute_and_commit(query, params=params, return_id=return_id)
+        self.table_versions.bump('user')
+        return id_
 
     def insert_order(self, order: Order, return_id: bool = False) -> Optional[int]:
         query = 'insert into `order` (user_id, date_time) values (%s, %s)'
         params = (order.user_id, order.date_time)
-        return self._execute_and_commit(query, params=params, return_id=return_id)
+        id_ = self._execute_and_commit(query, params=params, return_id=return_id)
+        self.table_versions.bump('order')
+        return id_
 
     def insert_item_ordered(self, item_ordered: ItemOrdered, return_id: bool = False) -> Optional[int]:
         query = 'insert into item_ordered (order_id, clothes_id, quantity, discount, total)' \
-                'values (%s, %s, %s, %s, %s)'
+                ' values (%s, %s, %s, %s, %s)'
+        line = (item_ordered.clothes_id, item_ordered.quantity)
 
-        clothes = self.select_clothes_by_id(item_ordered.clothes_id)[0]
-        price, discount = clothes['price'], clothes['discount']
-        item_ordered.total = calculate_single_item_total(item_ordered.quantity, float(price), float(discount))
+        # the line and its stock reservation are written in one transaction, like a checkout
+        def insert(cursor: Any) -> int:
+            failed_ids = self._reserve_stock(cursor, [line])
+            item_ordered.total = self._price_lines(cursor, [line])[0]
+            if failed_ids:
+                raise OutOfStockError(failed_ids)
 
-        params = (item_ordered.order_id, item_ordered.clothes_id, item_ordered.quantity,
-                  item_ordered.discount, item_ordered.total)
+            cursor.execute(query, (item_ordered.order_id, item_ordered.clothes_id, item_ordered.quantity,
+                                   item_ordered.discount, item_ordered.total))
+            return cursor.lastrowid
 
-        id_ = self._execute_and_commit(query, params=params, return_id=return_id)
-        self._on_inserted_item_ordered(item_ordered)
-        return id_
+        id_ = self._retry_transaction(insert)
+        self.table_versions.bump('item_ordered', 'clothes')
+        self.catalog.refresh_rows([item_ordered.clothes_id], load_rows=self._select_clothes_rows)
+        return id_ if return_id else None
+
+    def checkout(self, order: Order, basket_contents: Sequence[BasketClothes]) -> int:
+        order_query = 'insert into `order` (user_id, date_time) values (%s, %s)'
+        items_query = 'insert into item_ordered (order_id, clothes_id, quantity, discount, total)' \
+                      ' values (%s, %s, %s, %s, %s)'
+        lines = [(item.id, item.quantity) for item in basket_contents]
+
+        def place(cursor: Any) -> int:
+            # stock is reserved first, so the rows are locked exclusively before anything reads or references them
+            failed_ids = self._reserve_stock(cursor, lines) if lines else []
+            totals = self._price_lines(cursor, lines) if lines else []
+            if failed_ids:
+                raise OutOfStockError(failed_ids)
+
+            cursor.execute(order_query, (order.user_id, order.date_time))
+            order_id = cursor.lastrowid
+            if lines:
+                cursor.executemany(items_query, [(order_id, item.id, item.quantity, item.discount, total)
+                                                 for item, total in zip(basket_contents, totals)])
+            return order_id
+
+        order_id = self._retry_transaction(place)
+        self.table_versions.bump('order', 'item_ordered', 'clothes')
+        if lines:
+            self.catalog.refresh_rows([clothes_id for clothes_id, _ in lines], load_rows=self._select_clothes_rows)
+
+        order.id = order_id
+        return order_id
+
+    def reserve_stock(self, lines: List[Tuple[int, int]]) -> List[int]:
+        def reserve(cursor: Any) -> None:
+            failed_ids = self._reserve_stock(cursor, lines)
+            if failed_ids:
+                raise OutOfStockError(failed_ids)
+
+        try:
+            self._retry_transaction(reserve)
+        except OutOfStockError as error:
+            return error.clothes_ids
+
+        self.table_versions.bump('clothes')
+        self.catalog.refresh_rows([clothes_id for clothes_id, _ in lines], load_rows=self._select_clothes_rows)
+        return []
 
     def insert_clothes_type(self, clothes_type: ClothesType) -> None:
         query = 'insert into clothes_type (type) values (%s)'
         params = (clothes_type.type,)
-        return self._execute_and_commit(query, params=params, return_id=False)
+        self._execute_and_commit(query, params=params, return_id=False)
+        self.table_versions.bump('clothes_type')
+        self.references.refresh('clothes_type')
 
     def insert_role(self, role: Role) -> None:
         query = 'insert into role (role) values (%s)'
         params = (role.role,)
-        return self._execute_and_commit(query, params=params, return_id=False)
+        self._execute_and_commit(query, params=params, return_id=False)
+        self.table_versions.bump('role')
+        self.references.refresh('role')
 
     def insert_status(self, status: Status) -> None:
         query = 'insert into status (status) values (%s)'
         params = (status.status,)
-        return self._execute_and_commit(query, params=params, return_id=False)
+        self._execute_and_commit(query, params=params, return_id=False)
+        self.table_versions.bump('status')
+        self.references.refresh('status')
 
     def delete_from_table_by_id(self, table: str, id_: int) -> None:
         query = 'delete from %s where %s.id = %s' % (table, table, id_)
-        return self._execute_and_commit(query, params=None, return_id=False)
+        self._execute_and_commit(query, params=None, return_id=False)
+        self.table_versions.bump(table, deleted=True)
+
+        # deleting a clothes type cascades to its clothes
+        if table == 'clothes':
+            self.catalog.refresh_rows([id_], load_rows=self._select_clothes_rows)
+        if table == 'clothes_type':
+            self.catalog.invalidate()
+        if table in ReferenceCache.tables:
+            self.references.refresh(table)
+        if table == 'user':
+            self.sessions.revoke_user(id_)
 
     def update_value_by_id(self, table: str, column: str, new_value, id_: int) -> None:
         query = 'update {} set {} = %s where id = %s'.format(table, column)
         params = (new_value, id_)
-        return self._execute_and_commit(query, params=params, return_id=False)
+        self._execute_and_commit(query, params=params, return_id=False)
+        self.table_versions.bump(table)
+
+        if table == 'clothes':
+            self.catalog.refresh_rows([id_], load_rows=self._select_clothes_rows)
+        if table in ReferenceCache.tables:
+            self.references.refresh(table)
+        if table == 'user':
+            self.sessions.revoke_user(id_)
+
+    def _select_all_clothes(self) -> List[dict]:
+        return self._execute_and_fetchall('select * from clothes order by id', params=None)
+
+    def _select_clothes_rows(self, ids: List[int]) -> List[dict]:
+        query = 'select * from clothes where id in (%s)' % ', '.join(['%s'] * len(ids))
+        return self._execute_and_fetchall(query, params=tuple(ids))
+
+    def _select_reference_rows(self, table: str) -> List[dict]:
+        query = 'select id, %s from `%s` order by id' % (ReferenceCache.tables[table], table)
+        return self._execute_and_fetchall(query, params=None)
+
+    @staticmethod
+    def _price_lines(cursor: Any, lines: List[Tuple[int, int]]) -> List[Decimal]:
+        # lines are priced at the current price, for all of them at once; clothes deleted since
+        # they were put in the basket fail the whole order
+        clothes_ids = [clothes_id for clothes_id, _ in lines]
+        query = 'select id, price, discount from clothes where id in (%s)' % ', '.join(['%s'] * len(clothes_ids))
+        cursor.execute(query, tuple(clothes_ids))
+        prices = {row['id']: (row['price'], row['discount']) for row in cursor.fetchall()}
+
+        missing_ids = sorted(set(clothes_ids) - prices.keys())
+        if missing_ids:
+            raise ClothesNotFoundError(missing_ids)
+
+        return line_totals(quantities=[quantity for _, quantity in lines],
+                           prices=[prices[clothes_id][0] for clothes_id in clothes_ids],
+                           discounts=[prices[clothes_id][1] for clothes_id in clothes_ids])
+
+    @staticmethod
+    def _reserve_stock(cursor: Any, lines: List[Tuple[int, int]]) -> List[int]:
+        # the conditional update checks and takes the stock under one exclusive row lock. It runs before anything
+        # reads or references these rows, so no checkout holds a shared lock on them that another one waits to
+        # upgrade; deadlocks that still happen are retried by _retry_transaction
+        query = 'update clothes set in_stock = in_stock - %s where id = %s and in_stock >= %s'
 
-    def _on_inserted_item_ordered(self, inserted_item: ItemOrdered) -> None:
-        query = 'update clothes set in_stock = %s where clothes.id = %s'
-        clothes = self.select_clothes_by_id(inserted_item.clothes_id)[0]
-        params = (clothes['in_stock'] - inserted_item.quantity, inserted_item.clothes_id)
-        return self._execute_and_commit(query, params=params, return_id=False)
+        failed_ids = []
+        for clothes_id, quantity in sorted(lines):
+            cursor.execute(query, (quantity, clothes_id, quantity))
+            if cursor.rowcount == 0:
+                failed_ids.append(clothes_id)
+        return failed_ids
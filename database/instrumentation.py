@@ -0,0 +1,261 @@
+import argparse
+import re
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+# statements are attributed to the first frame on the stack from one of these packages
+CALLER_MODULES = ('interface.', 'api.', 'bulk.')
+
+# upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                   float('inf'))
+
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+(?:\.\d+)?\b|%s|\?")
+_VALUE_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_SPACES = re.compile(r'\s+')
+
+_caller: ContextVar[Optional[str]] = ContextVar('query_caller', default=None)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    # literals and placeholders become ?, and lists of them (?+), so one shape of query is one fingerprint
+    query = _LITERALS.sub('?', query)
+    query = _VALUE_LISTS.sub('(?+)', query)
+    return _SPACES.sub(' ', query).strip().lower()
+
+
+def find_caller() -> Optional[str]:
+    caller = _caller.get()
+    if caller is not None:
+        return caller
+
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_globals.get('__name__', '').startswith(CALLER_MODULES):
+            instance = frame.f_locals.get('self', frame.f_locals.get('cls'))
+            if instance is None:
+                return frame.f_code.co_qualname
+            owner = instance if isinstance(instance, type) else type(instance)
+            return f'{owner.__name__}.{frame.f_code.co_name}'
+        frame = frame.f_back
+    return None
+
+
+@contextmanager
+def calling(caller: Optional[str]) -> Iterator[None]:
+    # attributes statements run on another thread, e.g. by AsyncDatabase, to the method that asked for them
+    token = _caller.set(caller)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+@dataclass(slots=True)
+class QueryEvent:
+    fingerprint: str
+    query: str
+    caller: Optional[str]
+    latency: float
+    rows: int = 0
+    commit_time: float = 0.0
+
+
+class Instrument(ABC):
+    @abstractmethod
+    def record(self, event: QueryEvent) -> None:
+        raise NotImplementedError
+
+
+class InstrumentedCursor:
+    # times every statement run through the cursor together with the fetches of its rows, and reports it
+    # to the instruments when the next statement starts or the cursor is closed
+    def __init__(self, cursor: Any, instruments: Sequence[Instrument]) -> None:
+        self._cursor = cursor
+        self._instruments = instruments
+        self._event: Optional[QueryEvent] = None
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    def execute(self, query: str, params: Optional[tuple] = None) -> 'InstrumentedCursor':
+        self._flush()
+        start = time.perf_counter()
+        self._cursor.execute(query, params)
+        self._event = QueryEvent(fingerprint(query), query, find_caller(), time.perf_counter() - start)
+        return self
+
+    def executemany(self, query: str, seq_of_params: Any) -> 'InstrumentedCursor':
+        self._flush()
+        start = time.perf_counter()
+        self._cursor.executemany(query, seq_of_params)
+        self._event = QueryEvent(fingerprint(query), query, find_caller(), time.perf_counter() - start)
+        return self
+
+    def __iter__(self) -> Iterator[Any]:
+        rows = iter(self._cursor)
+        while True:
+            start = time.perf_counter()
+            row = next(rows, None)
+            self._fetched(start, 0 if row is None else 1)
+            if row is None:
+                return
+            yield row
+
+    def fetchone(self) -> Any:
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size: int) -> List[Any]:
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def record_commit(self, seconds: float) -> None:
+        if self._event is not None:
+            self._event.commit_time += seconds
+
+    def close(self) -> None:
+        self._flush()
+        self._cursor.close()
+
+    def _fetched(self, start: float, rows: int) -> None:
+        if self._event is not None:
+            self._event.latency += time.perf_counter() - start
+            self._event.rows += rows
+
+    def _flush(self) -> None:
+        event, self._event = self._event, None
+        if event is not None:
+            for instrument in self._instruments:
+                instrument.record(event)
+
+
+@dataclass
+class QueryStatistics:
+    count: int = 0
+    latency: float = 0.0
+    max_latency: float = 0.0
+    rows: int = 0
+    commit_time: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+
+    def add(self, event: QueryEvent) -> None:
+        self.count += 1
+        self.latency += event.latency
+        self.max_latency = max(self.max_latency, event.latency)
+        self.rows += event.rows
+        self.commit_time += event.commit_time
+        self.buckets[bisect_left(LATENCY_BUCKETS, event.latency)] += 1
+
+    def quantile(self, q: float) -> float:
+        # the upper bound of the bucket holding the q-th statement, capped by the slowest one seen
+        rank, seen = q * self.count, 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_latency)
+        return self.max_latency
+
+
+class QueryStats(Instrument):
+    # latency histograms per query fingerprint, and the load put on the database by each calling method
+    def __init__(self) -> None:
+        self.queries: Dict[str, QueryStatistics] = {}
+        self.callers: Dict[Optional[str], QueryStatistics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, event: QueryEvent) -> None:
+        with self._lock:
+            statistics = self.queries.get(event.fingerprint)
+            if statistics is None:
+                statistics = self.queries[event.fingerprint] = QueryStatistics()
+            statistics.add(event)
+
+            statistics = self.callers.get(event.caller)
+            if statistics is None:
+                statistics = self.callers[event.caller] = QueryStatistics()
+            statistics.add(event)
+
+    def top(self, by: str = 'latency', limit: int = 10) -> Tuple[List[Tuple[str, QueryStatistics]],
+                                                                List[Tuple[Optional[str], QueryStatistics]]]:
+        with self._lock:
+            queries = sorted(self.queries.items(), key=lambda item: getattr(item[1], by), reverse=True)
+            callers = sorted(self.callers.items(), key=lambda item: getattr(item[1], by), reverse=True)
+        return queries[:limit], callers[:limit]
+
+    def report(self, limit: int = 10) -> str:
+        queries, callers = self.top(limit=limit)
+        lines = ['Database time by caller:']
+        for caller, statistics in callers:
+            lines.append(f' {statistics.latency * 1000:10.1f}ms {statistics.count:>8} queries'
+                         f' {statistics.rows:>10} rows  {caller or "-"}')
+
+        lines.append('Slowest queries in total:')
+        for query, statistics in queries:
+            lines.append(f' {statistics.latency * 1000:10.1f}ms {statistics.count:>8}x'
+                         f'  p50 {statistics.quantile(0.5) * 1000:.2f}ms  p99 {statistics.quantile(0.99) * 1000:.2f}ms'
+                         f'  max {statistics.max_latency * 1000:.2f}ms  commit {statistics.commit_time * 1000:.1f}ms'
+                         f'  {query}')
+        return '\n'.join(lines)
+
+
+class SlowQueryLog(Instrument):
+    # statements slower than threshold seconds, commit included, one line each; parameters are never written
+    def __init__(self, threshold: float = 0.1, stream: Optional[TextIO] = None) -> None:
+        self.threshold = threshold
+        self.stream = stream or sys.stderr
+        self._lock = threading.Lock()
+
+    def record(self, event: QueryEvent) -> None:
+        total = event.latency + event.commit_time
+        if total < self.threshold:
+            return
+
+        line = f'{datetime.now().isoformat(sep=" ", timespec="milliseconds")} {total * 1000:.1f}ms' \
+               f' rows={event.rows} commit={event.commit_time * 1000:.1f}ms caller={event.caller or "-"}' \
+               f' {_SPACES.sub(" ", event.query).strip()}\n'
+        with self._lock:
+            self.stream.write(line)
+            self.stream.flush()
+
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    parser.add_argument('--slow-query-log', default=None, help='append statements slower than the threshold here')
+    parser.add_argument('--slow-query-ms', type=float, default=100.0)
+    parser.add_argument('--query-stats', action='store_true', help='print database time per caller and query on exit')
+    return parser
+
+
+def create_instruments(args: argparse.Namespace) -> List[Instrument]:
+    instruments = []
+    if args.slow_query_log is not None:
+        stream = sys.stderr if args.slow_query_log == '-' else open(args.slow_query_log, 'a', encoding='utf-8')
+        instruments.append(SlowQueryLog(threshold=args.slow_query_ms / 1000, stream=stream))
+    if args.query_stats:
+        instruments.append(QueryStats())
+    return instruments
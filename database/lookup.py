@@ -0,0 +1,15 @@
+from typing import Callable
+
+
+class IdLookup:
+    def __init__(self, table: str, exists: Callable[[str, int], bool]) -> None:
+        self.table = table
+        self._exists = exists
+
+    def __contains__(self, id_: int) -> bool:
+        return isinstance(id_, int) and self._exists(self.table, id_)
+
+    def __str__(self) -> str:
+        return f'id of an existing {self.table}'
+
+    __repr__ = __str__
@@ -0,0 +1,2 @@
+from .migrator import Migrator, Migration
+from .plans import check_query_plans, find_full_scans, FullScanError
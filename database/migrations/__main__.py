@@ -0,0 +1,48 @@
+import argparse
+
+from termcolor import colored
+
+from database import Database, add_config_arguments, create_backend, load_config
+from database.migrations import Migrator, check_query_plans, FullScanError
+
+
+def parse_args() -> argparse.Namespace:
+    parser = add_config_arguments(argparse.ArgumentParser(description='Manage the clothing shop database schema.'))
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('status', help='list migrations and whether they are applied')
+    apply_parser = subparsers.add_parser('apply', help='apply pending migrations')
+    apply_parser.add_argument('--target', type=int, default=None, help='last version to apply')
+    rollback_parser = subparsers.add_parser('rollback', help='roll back applied migrations')
+    rollback_parser.add_argument('--steps', type=int, default=1)
+    subparsers.add_parser('check', help='fail if a hot query falls back to a full table scan')
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    database = Database(backend=create_backend(load_config(vars(args))), preload_references=False)
+    migrator = Migrator(database)
+
+    if args.command == 'status':
+        for migration, is_applied in migrator.status():
+            state = colored('applied', 'green') if is_applied else colored('pending', 'yellow')
+            print(f'{migration.version:04d} {migration.name}: {state}')
+    elif args.command == 'apply':
+        for migration in migrator.apply(target=args.target):
+            print(colored(f'Applied {migration.version:04d} {migration.name}', 'green'))
+    elif args.command == 'rollback':
+        for migration in migrator.rollback(steps=args.steps):
+            print(colored(f'Rolled back {migration.version:04d} {migration.name}', 'blue'))
+    elif args.command == 'check':
+        try:
+            check_query_plans(database)
+        except FullScanError as error:
+            print(colored(str(error), 'red'))
+            raise SystemExit(1)
+        print(colored('All hot queries use an index.', 'green'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import os
+import re
+from datetime import datetime
+from typing import List, Tuple, Optional, NamedTuple
+
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), 'versions')
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    up_path: str
+    down_path: str
+
+
+class Migrator:
+    def __init__(self, database, versions_dir: Optional[str] = None) -> None:
+        self.database = database
+        self.versions_dir = versions_dir or os.path.join(VERSIONS_DIR, database.backend.name)
+
+    def migrations(self) -> List[Migration]:
+        migrations = []
+        for file_name in sorted(os.listdir(self.versions_dir)):
+            match = re.fullmatch(r'(\d+)_(\w+)\.up\.sql', file_name)
+            if match is None:
+                continue
+
+            up_path = os.path.join(self.versions_dir, file_name)
+            down_path = up_path[:-len('.up.sql')] + '.down.sql'
+            migrations.append(Migration(int(match.group(1)), match.group(2), up_path, down_path))
+
+        return migrations
+
+    def applied_versions(self) -> List[int]:
+        self._ensure_migrations_table()
+        rows = self.database._execute_and_fetchall(
+            'select version from schema_migrations order by version', params=None)
+        return [row['version'] for row in rows]
+
+    def status(self) -> List[Tuple[Migration, bool]]:
+        applied = set(self.applied_versions())
+        return [(migration, migration.version in applied) for migration in self.migrations()]
+
+    def apply(self, target: Optional[int] = None) -> List[Migration]:
+        applied = set(self.applied_versions())
+        pending = [migration for migration in self.migrations() if migration.version not in applied
+                   and (target is None or migration.version <= target)]
+
+        for migration in pending:
+            self._run_script(migration.up_path)
+            self.database._execute_and_commit(
+                'insert into schema_migrations (version, name, applied_at) values (%s, %s, %s)',
+                params=(migration.version, migration.name, datetime.now()), return_id=False)
+
+        return pending
+
+    def rollback(self, steps: int = 1) -> List[Migration]:
+        applied = set(self.applied_versions())
+        to_rollback = [migration for migration in reversed(self.migrations())
+                       if migration.version in applied][:steps]
+
+        for migration in to_rollback:
+            self._run_script(migration.down_path)
+            self.database._execute_and_commit(
+                'delete from schema_migrations where version = %s',
+                params=(migration.version,), return_id=False)
+
+        return to_rollback
+
+    def _ensure_migrations_table(self) -> None:
+        self.database._execute_and_commit(
+            'create table if not exists schema_migrations ('
+            ' version int not null primary key,'
+            ' name varchar(255) not null,'
+            ' applied_at datetime not null)',
+            params=None, return_id=False)
+
+    def _run_script(self, path: str) -> None:
+        with open(path) as file:
+            statements = [statement.strip() for statement in file.read().split(';')]
+
+        for statement in statements:
+            if statement:
+                self.database._execute_and_commit(statement, params=None, return_id=False)
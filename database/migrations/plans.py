@@ -0,0 +1,61 @@
+from typing import List, Tuple, Optional, Iterator
+
+# hot queries issued by Database methods, with sample arguments and the tables (by alias)
+# that are small enough for a full scan to be fine
+HOT_QUERIES = [
+    ('select_user_by_email', {'email': 'user@example.com'}, ()),
+    ('select_user_orders', {'user_id': 1}, ('s',)),
+    ('stream_rows', {'table': 'order', 'after_id': 1, 'before_id': 100}, ()),
+    ('select_single_user_order', {'order_id': 1}, ('s',)),
+    ('stream_order_items', {'after_order_id': 1, 'before_order_id': 100}, ('s',)),
+    ('exists_by_id', {'table': 'user', 'id_': 1}, ()),
+    ('exists_by_id', {'table': 'order', 'id_': 1}, ()),
+    ('select_page', {'table': 'user', 'after_id': 1}, ()),
+    ('select_page', {'table': 'order', 'after_id': 1}, ()),
+    ('select_page', {'table': 'clothes', 'after_id': 1}, ()),
+    ('select_page', {'table': 'order', 'before_id': 100}, ())
+]
+
+
+class FullScanError(Exception):
+    pass
+
+
+def explain(database, method: str, **kwargs) -> List[dict]:
+    plans = []
+    execute_and_fetchall = database._execute_and_fetchall
+
+    def explain_and_fetchall(query: str, params) -> List[dict]:
+        plans.extend(execute_and_fetchall(database.backend.explain_prefix + query, params=params))
+        return []
+
+    def explain_and_stream(query: str, params, fetch_size: Optional[int] = None) -> Iterator[dict]:
+        return iter(explain_and_fetchall(query, params))
+
+    database._execute_and_fetchall = explain_and_fetchall
+    database._execute_and_stream = explain_and_stream
+    try:
+        getattr(database, method)(**kwargs)
+    finally:
+        del database._execute_and_fetchall
+        del database._execute_and_stream
+
+    return plans
+
+
+def find_full_scans(database) -> List[Tuple[str, dict, str]]:
+    full_scans = []
+    for method, kwargs, allowed_tables in HOT_QUERIES:
+        for plan in explain(database, method, **kwargs):
+            table = database.backend.full_scan_table(plan)
+            if table is not None and table not in allowed_tables:
+                full_scans.append((method, kwargs, table))
+
+    return full_scans
+
+
+def check_query_plans(database) -> None:
+    full_scans = find_full_scans(database)
+    if full_scans:
+        details = '\n'.join(f' {method}({kwargs}) scans table "{table}"' for method, kwargs, table in full_scans)
+        raise FullScanError(f'Queries falling back to a full table scan:\n{details}')
@@ -0,0 +1,69 @@
+create table role (
+    id int not null auto_increment primary key,
+    role varchar(255) not null unique
+);
+
+create table status (
+    id int not null auto_increment primary key,
+    status varchar(255) not null unique
+);
+
+create table clothes_type (
+    id int not null auto_increment primary key,
+    type varchar(255) not null unique
+);
+
+create table user (
+    id int not null auto_increment primary key,
+    first_name varchar(255) not null,
+    last_name varchar(255) not null,
+    phone_number varchar(10) not null unique,
+    email varchar(255) not null,
+    password_hash char(64) not null,
+    role_id int not null default 1,
+    index user_role_id_index (role_id),
+    foreign key (role_id) references role (id) on delete cascade
+);
+
+create table clothes (
+    id int not null auto_increment primary key,
+    clothes_type_id int not null,
+    title varchar(255) not null,
+    description varchar(255) not null,
+    size varchar(255) not null,
+    material varchar(255) not null,
+    color varchar(255) not null,
+    price decimal(10, 2) not null,
+    discount decimal(5, 2) not null default 0,
+    in_stock int not null default 0,
+    index clothes_clothes_type_id_index (clothes_type_id),
+    foreign key (clothes_type_id) references clothes_type (id) on delete cascade
+);
+
+create table `order` (
+    id int not null auto_increment primary key,
+    user_id int not null,
+    date_time datetime not null,
+    status_id int not null default 1,
+    index order_user_id_index (user_id),
+    index order_status_id_index (status_id),
+    foreign key (user_id) references user (id) on delete cascade,
+    foreign key (status_id) references status (id) on delete cascade
+);
+
+create table item_ordered (
+    id int not null auto_increment primary key,
+    order_id int not null,
+    clothes_id int not null,
+    quantity int not null,
+    discount decimal(5, 2) not null default 0,
+    total decimal(12, 2) not null,
+    index item_ordered_order_id_index (order_id),
+    index item_ordered_clothes_id_index (clothes_id),
+    foreign key (order_id) references `order` (id) on delete cascade,
+    foreign key (clothes_id) references clothes (id) on delete cascade
+);
+
+insert into role (id, role) values (1, 'customer'), (2, 'worker'), (3, 'admin');
+
+insert into status (id, status) values (1, 'registered'), (2, 'rejected'), (3, 'accepted'), (4, 'done');
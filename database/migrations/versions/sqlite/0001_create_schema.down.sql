@@ -0,0 +1,13 @@
+drop table item_ordered;
+
+drop table `order`;
+
+drop table clothes;
+
+drop table user;
+
+drop table clothes_type;
+
+drop table status;
+
+drop table role;
@@ -0,0 +1,69 @@
+create table role (
+    id integer primary key autoincrement,
+    role varchar(255) not null unique
+);
+
+create table status (
+    id integer primary key autoincrement,
+    status varchar(255) not null unique
+);
+
+create table clothes_type (
+    id integer primary key autoincrement,
+    type varchar(255) not null unique
+);
+
+create table user (
+    id integer primary key autoincrement,
+    first_name varchar(255) not null,
+    last_name varchar(255) not null,
+    phone_number varchar(10) not null unique,
+    email varchar(255) not null,
+    password_hash char(64) not null,
+    role_id integer not null default 1 references role (id) on delete cascade
+);
+
+create index user_role_id_index on user (role_id);
+
+create table clothes (
+    id integer primary key autoincrement,
+    clothes_type_id integer not null references clothes_type (id) on delete cascade,
+    title varchar(255) not null,
+    description varchar(255) not null,
+    size varchar(255) not null,
+    material varchar(255) not null,
+    color varchar(255) not null,
+    price decimal(10, 2) not null,
+    discount decimal(5, 2) not null default 0,
+    in_stock integer not null default 0
+);
+
+create index clothes_clothes_type_id_index on clothes (clothes_type_id);
+
+create table `order` (
+    id integer primary key autoincrement,
+    user_id integer not null references user (id) on delete cascade,
+    date_time datetime not null,
+    status_id integer not null default 1 references status (id) on delete cascade
+);
+
+create index order_user_id_index on `order` (user_id);
+
+create index order_status_id_index on `order` (status_id);
+
+create table item_ordered (
+    id integer primary key autoincrement,
+    order_id integer not null references `order` (id) on delete cascade,
+    clothes_id integer not null references clothes (id) on delete cascade,
+    quantity integer not null,
+    discount decimal(5, 2) not null default 0,
+    total decimal(12, 2) not null
+);
+
+create index item_ordered_order_id_index on item_ordered (order_id);
+
+create index item_ordered_clothes_id_index on item_ordered (clothes_id);
+
+insert into role (id, role) values (1, 'customer'), (2, 'worker'), (3, 'admin');
+
+insert into status (id, status) values (1, 'registered'), (2, 'rejected'), (3, 'accepted'), (4, 'done');
@@ -0,0 +1 @@
+drop index user_email_uindex;
@@ -0,0 +1 @@
+create unique index user_email_uindex on user (email);
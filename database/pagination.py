@@ -0,0 +1,42 @@
+from typing import Optional
+
+from models import Page
+
+
+class Paginator:
+    def __init__(self, database, table: str, page_size: Optional[int] = None) -> None:
+        self.database = database
+        self.table = table
+        self.page_size = page_size
+        self.page = None
+
+        # exclusive lower id bound of the current page, None for the first page
+        self._after_id = None
+
+    def current(self) -> Page:
+        self.page = self.database.select_page(self.table, after_id=self._after_id, page_size=self.page_size)
+
+        # the rows of this page may have been deleted in the meantime
+        if len(self.page.rows) == 0 and self._after_id is not None:
+            self.first()
+            self.page = self.database.select_page(self.table, page_size=self.page_size)
+        return self.page
+
+    def first(self) -> None:
+        self._after_id = None
+
+    def next(self) -> None:
+        if self.page is not None and self.page.has_next and len(self.page.rows) != 0:
+            self._after_id = self.page.rows[-1]['id']
+
+    def previous(self) -> None:
+        if self.page is None or len(self.page.rows) == 0:
+            self.first()
+            return
+
+        previous_page = self.database.select_page(self.table, before_id=self.page.rows[0]['id'],
+                                                  page_size=self.page_size)
+        if previous_page.has_previous and len(previous_page.rows) != 0:
+            self._after_id = previous_page.rows[0]['id'] - 1
+        else:
+            self.first()
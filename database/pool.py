@@ -0,0 +1,169 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Any, Iterator, Optional
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+    def __init__(
+            self,
+            connect: Callable[[], Any],
+            ping: Optional[Callable[[Any], None]] = None,
+            min_size: int = 1,
+            max_size: int = 5,
+            timeout: float = 10.0,
+            health_check: bool = True,
+            reconnect_attempts: int = 3,
+            reconnect_delay: float = 0.5,
+            lazy: bool = False
+    ) -> None:
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f'Invalid pool size: min_size={min_size}, max_size={max_size}')
+
+        self._connect = connect
+        self._ping = ping
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check = health_check
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_delay = reconnect_delay
+
+        # LIFO keeps the most recently used connections warm and lets the rest idle out
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+
+        # a lazy pool opens its first connections on demand or when filled, e.g. from a background thread
+        if not lazy:
+            self.fill()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return self._idle.qsize()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def acquire(self) -> Any:
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self._grow_or_wait()
+
+        if self.health_check and not self._is_healthy(connection):
+            connection = self._replace(connection)
+        return connection
+
+    def release(self, connection: Any, rollback: bool = False) -> None:
+        # only a connection whose transaction was left unfinished needs the extra round-trip of a rollback
+        if rollback:
+            try:
+                connection.rollback()
+            except Exception:
+                self._discard(connection)
+                return
+        self._idle.put(connection)
+
+    def discard(self, connection: Any) -> None:
+        # for a borrowed connection left in a state the next borrower must not see
+        self._discard(connection)
+
+    def close(self) -> None:
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
+
+    def fill(self) -> None:
+        while True:
+            with self._lock:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+
+            try:
+                connection = self._connect_with_retries()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                raise
+            self._idle.put(connection)
+
+    def _grow_or_wait(self) -> Any:
+        with self._lock:
+            can_grow = self._size < self.max_size
+            if can_grow:
+                self._size += 1
+
+        if can_grow:
+            try:
+                return self._connect_with_retries()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeoutError(f'No database connection became available within {self.timeout} seconds')
+
+    def _replace(self, connection: Any) -> Any:
+        self._close_quietly(connection)
+        try:
+            return self._connect_with_retries()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+            raise
+
+    def _discard(self, connection: Any) -> None:
+        self._close_quietly(connection)
+        with self._lock:
+            self._size -= 1
+
+    def _connect_with_retries(self) -> Any:
+        # back off exponentially so a database restart doesn't get hammered by every session at once
+        delay = self.reconnect_delay
+        for attempt in range(self.reconnect_attempts):
+            try:
+                return self._connect()
+            except Exception:
+                if attempt == self.reconnect_attempts - 1:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+    def _is_healthy(self, connection: Any) -> bool:
+        try:
+            if self._ping is None:
+                connection.ping(reconnect=False)
+            else:
+                self._ping(connection)
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _close_quietly(connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -1,17 +1,23 @@
+import time
 from abc import ABC, abstractmethod
 from typing import Union, Tuple
 
-import mysql.connector
 from termcolor import colored
 
-from database import Database
+from database import Database, Paginator
+from metrics import MENU_INTERACTIONS, MENU_RENDER_SECONDS, SIGN_INS, SIGN_UPS
 from menu.role_specific import GuestMenus, CustomerMenus, WorkerMenus, AdminMenus
-from models import User
+from models import Role, User
+from utils.console import write_output
 from utils.hash import hash_password
 from utils.other import rename_dict_key
+from utils.profiling import profiled_action
 
 
 class CommonInterface(ABC):
+    # roles with an interface of their own; users of roles added later through the reference data can't sign in
+    supported_roles = ('customer', 'worker', 'admin')
+
     def __init__(
             self,
             database: Database,
@@ -23,6 +29,9 @@ class CommonInterface(ABC):
 
         self.current_user = None
         self.is_signed_in = False
+        self.session_token = None
+
+        self.clothes_pages = Paginator(database=database, table='clothes')
 
     @abstractmethod
     def run(self) -> None:
@@ -30,30 +39,43 @@ class CommonInterface(ABC):
 
     @classmethod
     def show_and_interact_with_menu(cls, menu, *args, **kwargs) -> Union[Tuple[bool, dict], dict]:
+        start = time.perf_counter()
         menu_ = menu.__call__(*args, **kwargs)
+        shown = (menu_[1] if isinstance(menu_, tuple) else menu_).show()
+        MENU_RENDER_SECONDS.observe(time.perf_counter() - start, menu=menu.__name__)
+        MENU_INTERACTIONS.inc(menu=menu.__name__)
+
         if isinstance(menu_, tuple):
-            return menu_[0], menu_[1].show().interact()
+            return menu_[0], shown.interact()
         else:
-            return menu_.show().interact()
+            return shown.interact()
 
     def interact_with_start_menu(self) -> int:
         return self.show_and_interact_with_menu(menu=self.menu.start_menu)['choice']
 
+    @profiled_action('Sign in')
     def sign_in(self) -> None:
         menu = self.menu.sign_in_menu().show()
 
         while not self.is_signed_in:
             inputs = menu.interact()
-            inputs['password'] = hash_password(inputs['password'])
-            inputs = rename_dict_key(inputs, old_key='password', new_key='password_hash')
-
-            response = self.database.select_user_by_email_and_phash(*inputs.values())
-            if len(response) == 0:
-                print(colored('Wrong email and/or password. Try again!', 'red'))
+            user = self.database.authenticate(email=inputs['email'], password_hash=hash_password(inputs['password']))
+
+            if user is None:
+                SIGN_INS.inc(result='failure')
+                write_output(colored('Wrong email and/or password. Try again!', 'red'))
+                continue
+
+            role = Role.map_id_to_role(user.role_id, roles_mapping=self.database.select_reference('role'))
+            if role not in self.supported_roles:
+                SIGN_INS.inc(result='unsupported_role')
+                write_output(colored(f'Users with the {role} role cannot use the shop yet. Try another account!',
+                                     'red'))
             else:
-                user = User(id=response[0]['id'], *list(response[0].values())[1:])
+                SIGN_INS.inc(result='success')
                 self._on_successful_sign_in(user=user)
 
+    @profiled_action('Sign up')
     def sign_up(self) -> None:
         menu = self.menu.sign_up_menu().show()
 
@@ -64,26 +86,46 @@ class CommonInterface(ABC):
             user = User(*inputs.values())
 
             try:
-                inserted_user_id = self.database.insert_user(user)
+                inserted_user_id = self.database.insert_user(user, return_id=True)
+                SIGN_UPS.inc(result='success')
                 self._on_successful_sign_in(user=User(*inputs.values(), id=inserted_user_id))
-            except mysql.connector.errors.IntegrityError:
-                print(colored('User with given email/phone number already exists. Try again!', 'red'))
+            except self.database.backend.integrity_error:
+                SIGN_UPS.inc(result='duplicate')
+                write_output(colored('User with given email/phone number already exists. Try again!', 'red'))
 
     def sign_off(self) -> None:
+        if self.session_token is not None:
+            self.database.sessions.revoke(self.session_token)
         self.current_user = None
         self.is_signed_in = False
+        self.session_token = None
 
     def switch_users(self) -> User:
         self.sign_off()
         self.sign_in()
         return self.current_user
 
+    @profiled_action('View available clothes')
     def interact_with_available_clothes_menu(self) -> Tuple[bool, int]:
-        response = self.database.select_all_columns_from_table('clothes')
-        is_empty, user_input = self.show_and_interact_with_menu(menu=self.menu.clothes_menu, select_result=response)
-        return is_empty, user_input['choice']
+        return self.interact_with_paginated_menu(
+            menu=self.menu.clothes_menu,
+            paginator=self.clothes_pages,
+            next_page_choice=self.menu.clothes_menu_next_page_choice)
+
+    def interact_with_paginated_menu(self, menu, paginator: Paginator, next_page_choice: int) -> Tuple[bool, int]:
+        while True:
+            is_empty, user_input = self.show_and_interact_with_menu(menu=menu, page=paginator.current())
+
+            if is_empty or user_input['choice'] not in (next_page_choice, next_page_choice + 1):
+                return is_empty, user_input['choice']
+
+            if user_input['choice'] == next_page_choice:
+                paginator.next()
+            else:
+                paginator.previous()
 
     def _on_successful_sign_in(self, user: User) -> None:
         self.is_signed_in = True
         self.current_user = user
-        print(colored(f'Successfully signed into your account', 'green'))
+        self.session_token = self.database.sessions.create(user)
+        write_output(colored(f'Successfully signed into your account', 'green'))
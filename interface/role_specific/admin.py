@@ -2,18 +2,21 @@ from typing import Tuple, Optional
 
 from termcolor import colored
 
-from database import Database
+from database import Database, Paginator
 from interface import CommonInterface
 from interface.role_specific import WorkerInterface, CustomerInterface
 from menu.role_specific import AdminMenus
 from models import User, Role
-from utils.parse import extract_ids, extract_all_values_from_list_of_dicts
+from utils.console import write_output
+from utils.parse import extract_all_values_from_list_of_dicts
+from utils.profiling import profiled_action
 
 
 class AdminInterface(CommonInterface):
     def __init__(self, database: Database, current_user: User) -> None:
         super().__init__(database, menu=AdminMenus())
         self.current_user = current_user
+        self.user_pages = Paginator(database=database, table='user')
 
     def run(self) -> Optional[User]:
         lower_level_interfaces = {
@@ -45,6 +48,7 @@ class AdminInterface(CommonInterface):
             elif next_action_top == 10:
                 break
 
+    @profiled_action('Manage users')
     def run_manage_users_menu(self) -> None:
         while True:
             is_empty, next_action = self.interact_with_manage_users_menu()
@@ -59,6 +63,7 @@ class AdminInterface(CommonInterface):
                 elif next_action == 3:
                     break
 
+    @profiled_action('Manage roles')
     def run_manage_roles_menu(self) -> None:
         while True:
             is_empty, next_action = self.interact_with_manage_roles_menu()
@@ -84,12 +89,10 @@ class AdminInterface(CommonInterface):
             user_name=self.current_user.first_name)['choice']
 
     def interact_with_manage_users_menu(self) -> Tuple[bool, int]:
-        available_users = self.database.select_all_columns_from_table(table='user')
-        is_empty, user_input = self.show_and_interact_with_menu(
+        return self.interact_with_paginated_menu(
             menu=self.menu.manage_users_menu,
-            select_result=available_users)
-
-        return is_empty, user_input['choice']
+            paginator=self.user_pages,
+            next_page_choice=self.menu.manage_users_menu_next_page_choice)
 
     def change_user_info(self) -> None:
         fields_mapping = {
@@ -107,14 +110,14 @@ class AdminInterface(CommonInterface):
 
         self.database.update_value_by_id(table='user', column=field,
                                          new_value=new_field_value, id_=user_id)
-        print(colored(f'Successfully changed value of {field} to {new_field_value} for user with id {user_id}',
-                      'blue'))
+        write_output(colored(f'Successfully changed value of {field} to {new_field_value} for user with id {user_id}',
+                             'blue'))
 
     def delete_user(self) -> None:
         user_id = self._interact_with_delete_user_menu()
         self.database.delete_from_table_by_id(table='user', id_=user_id)
 
-        print(colored(f'Successfully deleted user with id {user_id}', 'blue'))
+        write_output(colored(f'Successfully deleted user with id {user_id}', 'blue'))
 
     def interact_with_manage_roles_menu(self) -> Tuple[bool, int]:
         select_result = self.database.select_all_columns_from_table(table='role')
@@ -127,19 +130,19 @@ class AdminInterface(CommonInterface):
     def add_role(self) -> None:
         role = Role(self._interact_with_add_role_menu())
         self.database.insert_role(role)
-        print(colored(f'Successfully added {role} role.', 'blue'))
+        write_output(colored(f'Successfully added {role} role.', 'blue'))
 
     def delete_role(self) -> None:
         id_to_remove = self._interact_with_delete_role_menu()
         self.database.delete_from_table_by_id(table='role', id_=id_to_remove)
-        print(colored(f'Successfully removed role with id {id_to_remove}', 'blue'))
+        write_output(colored(f'Successfully removed role with id {id_to_remove}', 'blue'))
 
     def change_role_info(self) -> None:
         role_id = self._interact_with_change_role_info_menu()
         new_role = self._interact_with_specify_new_role_info_menu()
 
         self.database.update_value_by_id(table='role', column='role', new_value=new_role, id_=role_id)
-        print(colored(f'Successfully changed role with id {role_id} to {new_role}'))
+        write_output(colored(f'Successfully changed role with id {role_id} to {new_role}'))
 
     def _interact_with_add_role_menu(self) -> str:
         existing_roles = extract_all_values_from_list_of_dicts(
@@ -151,13 +154,13 @@ class AdminInterface(CommonInterface):
             existing_roles=existing_roles)['role']
 
     def _interact_with_delete_role_menu(self) -> int:
-        existing_role_ids = extract_ids(self.database.select_all_columns_from_table(table='role'))
+        existing_role_ids = self.database.select_ids(table='role')
         return self.show_and_interact_with_menu(
             menu=self.menu.delete_role_menu,
             existing_role_ids=existing_role_ids)['choice']
 
     def _interact_with_change_role_info_menu(self) -> int:
-        existing_role_ids = extract_ids(self.database.select_all_columns_from_table(table='role'))
+        existing_role_ids = self.database.select_ids(table='role')
         return self.show_and_interact_with_menu(
             menu=self.menu.change_role_info_menu,
             existing_role_ids=existing_role_ids)['choice']
@@ -172,7 +175,7 @@ class AdminInterface(CommonInterface):
             existing_roles=existing_roles)['role']
 
     def _interact_with_change_user_info_menu(self) -> int:
-        existing_user_ids = extract_ids(self.database.select_all_columns_from_table(table='user'))
+        existing_user_ids = self.database.id_lookup(table='user')
         return self.show_and_interact_with_menu(
             menu=self.menu.change_user_info_menu,
             existing_user_ids=existing_user_ids)['choice']
@@ -181,14 +184,14 @@ class AdminInterface(CommonInterface):
         return self.show_and_interact_with_menu(menu=self.menu.specify_user_field_to_change_menu)['choice']
 
     def _interact_with_specify_new_user_info_menu(self, key: int, field: str) -> str:
-        existing_role_ids = extract_ids(self.database.select_all_columns_from_table(table='role'))
+        existing_role_ids = self.database.select_ids(table='role')
         return self.show_and_interact_with_menu(
             menu=self.menu.specify_new_user_info_menu,
             settings_key=key,
             existing_role_ids=existing_role_ids)[field]
 
     def _interact_with_delete_user_menu(self) -> int:
-        available_ids = extract_ids(self.database.select_all_columns_from_table(table='user'))
+        available_ids = self.database.id_lookup(table='user')
         return self.show_and_interact_with_menu(
             menu=self.menu.delete_user_menu,
             existing_user_ids=available_ids)['choice']
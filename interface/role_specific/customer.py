@@ -1,20 +1,24 @@
+import time
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import Tuple, Optional, Container
 
 from termcolor import colored
 
-from database import Database
+from database import ClothesNotFoundError, Database, OutOfStockError
 from interface import CommonInterface
 from menu.role_specific import CustomerMenus
+from metrics import BASKET_LINES, CHECKOUTS, CHECKOUT_SECONDS
 from models import User, BasketClothes, Basket, Order, Clothes
+from utils.console import write_output
 from utils.parse import extract_ids
+from utils.profiling import profiled_action
 
 
 class CustomerInterface(CommonInterface):
     def __init__(self, database: Database, current_user: User) -> None:
         super().__init__(database=database, menu=CustomerMenus())
         self.current_user = current_user
-        self.basket = Basket(contents=[])
+        self.basket = Basket()
 
     def run(self) -> Optional[User]:
         while True:
@@ -31,6 +35,7 @@ class CustomerInterface(CommonInterface):
             elif next_action_top == 5:
                 break
 
+    @profiled_action('View available clothes')
     def run_view_available_clothes_menu(self) -> None:
         while True:
             is_empty, next_action = self.interact_with_available_clothes_menu()
@@ -72,6 +77,7 @@ class CustomerInterface(CommonInterface):
                 elif next_action == 3:
                     break
 
+    @profiled_action('View my basket')
     def run_view_my_basket_menu(self) -> None:
         while True:
             is_empty, next_action = self.interact_with_modify_basket_menu()
@@ -123,6 +129,7 @@ class CustomerInterface(CommonInterface):
                     elif next_action == 2:
                         continue
 
+    @profiled_action('View my orders')
     def run_view_my_orders_menu(self) -> None:
         while True:
             is_empty, next_action = self.interact_with_my_orders_menu()
@@ -146,7 +153,7 @@ class CustomerInterface(CommonInterface):
             user_name=self.current_user.first_name)['choice']
 
     def interact_with_my_orders_menu(self) -> Tuple[bool, int]:
-        select_result = self.database.select_user_orders(user_id=self.current_user.id)
+        select_result = self.database.stream_user_orders(user_id=self.current_user.id)
         is_empty, user_input = self.show_and_interact_with_menu(
             menu=self.menu.all_orders_menu,
             select_result=select_result)
@@ -164,11 +171,11 @@ class CustomerInterface(CommonInterface):
             select_result=order)['choice']
 
     def add_to_basket_menu(self) -> int:
-        existing_ids = extract_ids(self.database.select_all_columns_from_table(table='clothes'))
+        existing_ids = self.database.id_lookup(table='clothes')
         clothes = self._interact_with_adding_to_basket_menu(existing_ids=existing_ids)
 
         if clothes is not None:
-            if clothes.id in self.basket.get_ids():
+            if clothes.id in self.basket:
                 self.basket.add_existing(clothes)
             else:
                 self.basket.add_new(clothes)
@@ -179,26 +186,25 @@ class CustomerInterface(CommonInterface):
             message = colored(f'You cant order this item no more.', 'red')
 
         self.basket.print()
-        print(message)
+        write_output(message)
         return self._interact_with_post_modify_basket_menu(modify_type='add')
 
     def remove_from_basket_menu(self) -> int:
-        existing_ids = extract_ids(self.database.select_all_columns_from_table(table='clothes'))
+        existing_ids = self.basket.get_ids()
 
         clothes_id_to_remove = self._interact_with_remove_from_basket_menu(existing_ids=existing_ids)
-        basket_clothes_id = self.basket.get_basket_clothes_id_by_clothes_id(clothes_id_to_remove)
         amount_to_remove = self._interact_with_specify_removal_amount_menu(
-            clothes=self.basket.contents[basket_clothes_id])
+            clothes=self.basket.get_line(clothes_id_to_remove))
 
         self.basket.remove_single(clothes_id_to_remove, amount_to_remove)
-        print(colored(f'Successfully removed {amount_to_remove} of '
-                      f'item #{clothes_id_to_remove} from your basket', 'blue'))
+        write_output(colored(f'Successfully removed {amount_to_remove} of '
+                             f'item #{clothes_id_to_remove} from your basket', 'blue'))
 
         return self._interact_with_post_modify_basket_menu(modify_type='remove')
 
     def clear_basket(self) -> int:
-        self.basket.contents.clear()
-        print(colored('Your basket is now empty.', 'blue'))
+        self.basket.clear()
+        write_output(colored('Your basket is now empty.', 'blue'))
 
         return self._interact_with_post_modify_basket_menu(modify_type='clear')
 
@@ -213,18 +219,28 @@ class CustomerInterface(CommonInterface):
 
     def checkout(self) -> int:
         order = Order(self.current_user.id, datetime.now())
-        inserted_order_id = self.database.insert_order(order, return_id=True)
-
-        for item in self.basket.contents:
-            item_ordered = item.to_item_ordered(inserted_order_id)
-            self.database.insert_item_ordered(item_ordered)
-
-        print(colored(f'Thank you for you order! Our manager will contact you very soon', 'blue'))
-        self.basket.contents.clear()
+        BASKET_LINES.observe(len(self.basket))
+
+        start = time.perf_counter()
+        try:
+            self.database.checkout(order, self.basket.contents)
+        except OutOfStockError as error:
+            CHECKOUTS.inc(result='out_of_stock')
+            write_output(colored(f'Sorry, items {error.clothes_ids} are no longer available in the requested quantity.'
+                                 f' Please, modify your basket and try again!', 'red'))
+        except ClothesNotFoundError as error:
+            CHECKOUTS.inc(result='not_found')
+            write_output(colored(f'Sorry, items {error.clothes_ids} are no longer sold.'
+                                 f' Please, remove them from your basket and try again!', 'red'))
+        else:
+            CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+            CHECKOUTS.inc(result='success')
+            write_output(colored(f'Thank you for you order! Our manager will contact you very soon', 'blue'))
+            self.basket.clear()
 
         return self._interact_with_post_checkout_menu()
 
-    def _interact_with_remove_from_basket_menu(self, existing_ids: List[int]) -> int:
+    def _interact_with_remove_from_basket_menu(self, existing_ids: Container[int]) -> int:
         return self.show_and_interact_with_menu(
             menu=self.menu.remove_from_basket_menu,
             existing_ids=existing_ids)['choice']
@@ -234,7 +250,7 @@ class CustomerInterface(CommonInterface):
             menu=self.menu.specify_removal_amount_menu,
             clothes=clothes)['removal_amount']
 
-    def _interact_with_adding_to_basket_menu(self, existing_ids: List[int]) -> Optional[BasketClothes]:
+    def _interact_with_adding_to_basket_menu(self, existing_ids: Container[int]) -> Optional[BasketClothes]:
         clothes_id = self.show_and_interact_with_menu(
             menu=self.menu.add_to_basket_menu,
             existing_ids=existing_ids)['choice']
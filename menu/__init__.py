@@ -1,4 +1,6 @@
 from .base import BaseMenuWithChoice, BaseMenuWithNoChoice
-from .build import build_menu_with_single_int_choice
+from .build import build_menu_with_single_int_choice, build_page_navigation
+from .registry import cached_menu, clear_menu_caches, menu_cache_info
 from .common import CommonMenus
+from .table import TableRenderer
 from .role_specific import CustomerMenus, WorkerMenus, AdminMenus
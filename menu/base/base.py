@@ -1,18 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import Union, Any, Optional
+from typing import Union, Any, Optional, Iterable
 
 from termcolor import colored
 
 from user_input_validation import validate_input
+from utils.console import read_input, write_output
 
 
 class BaseMenu(ABC):
-    def __init__(self, menu_message: str, settings: Optional[dict]):
+    def __init__(self, menu_message: Union[str, Iterable[str]], settings: Optional[dict]):
         self.menu_message = menu_message
         self.settings = settings
 
     def show(self):
-        print(self.menu_message)
+        # a message given as lines is written as it is produced, e.g. a listing drawn while its rows are fetched
+        if isinstance(self.menu_message, str):
+            write_output(self.menu_message)
+        else:
+            for line in self.menu_message:
+                write_output(line)
         return self
 
     @abstractmethod
@@ -33,7 +39,7 @@ class BaseMenuWithChoice(BaseMenu):
 
                 try:
                     input_ = validate_input(
-                        user_input=input(input_message),
+                        user_input=read_input(input_message),
                         expected_type=input_settings['expected_type'],
                         expected_values=input_settings['expected_values'],
                         additional_validators=input_settings.get('additional_validators', None),
@@ -42,7 +48,7 @@ class BaseMenuWithChoice(BaseMenu):
                     return {input_value: input_}
 
                 except ValueError as error:
-                    print(colored(str(error), 'red'))
+                    write_output(colored(str(error), 'red'))
 
 
 class BaseMenuWithNoChoice(BaseMenu):
@@ -72,7 +78,7 @@ class BaseMenuWithNoChoice(BaseMenu):
                     error_messages=input_settings.get('error_messages', None)
                 )
             else:
-                input_ = input(input_message)
+                input_ = read_input(input_message)
             inputs[input_value] = input_
 
         return inputs
@@ -88,12 +94,12 @@ class BaseMenuWithNoChoice(BaseMenu):
         while True:
             try:
                 input_ = validate_input(
-                    user_input=input(input_message),
+                    user_input=read_input(input_message),
                     expected_type=expected_type,
                     **kwargs
                 )
             except ValueError as error:
-                print(colored(str(error), 'red'))
+                write_output(colored(str(error), 'red'))
                 continue
 
             if not confirm:
@@ -102,13 +108,13 @@ class BaseMenuWithNoChoice(BaseMenu):
                 self._confirm_input(input_message=kwargs['confirm_message'], first_input=input_)
                 break
             except ValueError as error:
-                print(colored(str(error), 'red'))
+                write_output(colored(str(error), 'red'))
 
         return input_
 
     @staticmethod
     def _confirm_input(input_message: str, first_input: Any) -> None:
-        second_input = input(input_message)
+        second_input = read_input(input_message)
 
         if first_input != second_input:
             raise ValueError(f'{input_message.split(" ")[-2][:-1].capitalize()}s dont match. Try again!')
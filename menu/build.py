@@ -1,9 +1,11 @@
-from typing import List
+from typing import Container, Iterable, List, Tuple, Union
 
 from menu.base import BaseMenuWithChoice
+from models import Page
 
 
-def build_menu_with_single_int_choice(menu_message: str, expected_values: List[int]) -> BaseMenuWithChoice:
+def build_menu_with_single_int_choice(menu_message: Union[str, Iterable[str]],
+                                      expected_values: Container[int]) -> BaseMenuWithChoice:
     settings = {
         'choice': {
             'expected_type': 'int',
@@ -12,3 +14,17 @@ def build_menu_with_single_int_choice(menu_message: str, expected_values: List[i
     }
     menu = BaseMenuWithChoice(menu_message=menu_message, settings=settings)
     return menu
+
+
+def build_page_navigation(page: Page, next_page_choice: int) -> Tuple[str, List[int]]:
+    navigation_message = ''
+    expected_values = []
+
+    if page.has_next:
+        navigation_message += f'\n {next_page_choice}) Next page'
+        expected_values.append(next_page_choice)
+    if page.has_previous:
+        navigation_message += f'\n {next_page_choice + 1}) Previous page'
+        expected_values.append(next_page_choice + 1)
+
+    return navigation_message, expected_values
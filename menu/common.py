@@ -3,16 +3,21 @@ from abc import ABC
 
 from menu import build_menu_with_single_int_choice
 from menu.base import BaseMenuWithChoice, BaseMenuWithNoChoice
+from menu.registry import cached_menu
+
+EMAIL_PATTERN = re.compile(r'^\w+_?\w+@\w+[.]\w{2,3}$')
 
 
 class CommonMenus(ABC):
     @staticmethod
+    @cached_menu()
     def start_menu() -> BaseMenuWithChoice:
         menu_message = 'Choose one of the options:\n 1) Sign in\n 2) Sign up\n 3) Continue as guest'
         expected_values = [1, 2, 3]
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
 
     @staticmethod
+    @cached_menu()
     def sign_in_menu() -> BaseMenuWithNoChoice:
         settings = {
             'email': {
@@ -28,6 +33,7 @@ class CommonMenus(ABC):
         return BaseMenuWithNoChoice(menu_message=menu_message, settings=settings)
 
     @staticmethod
+    @cached_menu()
     def sign_up_menu() -> BaseMenuWithNoChoice:
         settings = {
             'name': {
@@ -49,7 +55,7 @@ class CommonMenus(ABC):
             },
             'email': {
                 'expected_type': 'str',
-                'additional_validators': [lambda x: re.search(r'^\w+_?\w+@\w+[.]\w{2,3}$', x)],
+                'additional_validators': [EMAIL_PATTERN.search],
                 'error_messages': ['Email must only contains letters of english alphabet, digits 0-9, @ symbol,'
                                    ' and it must have . after @. Try again!']
             },
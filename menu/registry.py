@@ -0,0 +1,24 @@
+import functools
+from typing import Callable, Dict, List, Optional
+
+_cached_menus: List[Callable] = []
+
+
+def cached_menu(maxsize: Optional[int] = None) -> Callable[[Callable], Callable]:
+    # showing or interacting with a menu never changes it, so a menu built once for some arguments is shared by
+    # every session; only for menus whose message is a string and whose arguments are hashable
+    def decorator(build: Callable) -> Callable:
+        cached = functools.lru_cache(maxsize=maxsize)(build)
+        _cached_menus.append(cached)
+        return cached
+
+    return decorator
+
+
+def menu_cache_info() -> Dict[str, functools._CacheInfo]:
+    return {build.__qualname__: build.cache_info() for build in _cached_menus}
+
+
+def clear_menu_caches() -> None:
+    for build in _cached_menus:
+        build.cache_clear()
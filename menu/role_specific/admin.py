@@ -1,17 +1,49 @@
-import re
-from typing import Tuple, List
+from typing import Tuple, List, Container
 
-from tabulate import tabulate
 from termcolor import colored
 
 from menu import CommonMenus
-from menu import build_menu_with_single_int_choice
+from menu import build_menu_with_single_int_choice, build_page_navigation
 from menu.base import BaseMenuWithChoice, BaseMenuWithNoChoice
+from menu.common import EMAIL_PATTERN
+from menu.registry import cached_menu
+from menu.table import users_table
+from models import Page
+from utils.other import tabulate_psql
 from utils.parse import separate_headers_and_items
 
+# the user fields that don't depend on the database, the role id is checked against the roles of each call
+USER_FIELD_SETTINGS = {
+    'name': {
+        'expected_type': 'str',
+        'additional_validators': [str.isalpha],
+        'error_messages': ['Name must contain only letters of english alphabet. Try again!']
+    },
+    'last_name': {
+        'expected_type': 'str',
+        'additional_validators': [str.isalpha],
+        'error_messages': ['Last name must contain only letters of english alphabet. Try again!']
+    },
+    'phone_number': {
+        'expected_type': 'str',
+        'additional_validators': [str.isnumeric, lambda x: len(x) == 10],
+        'error_messages': ['Phone number must contain only digits 0-9. Try again!',
+                           'Phone number length must be 10. Try again!']
+    },
+    'email': {
+        'expected_type': 'str',
+        'additional_validators': [EMAIL_PATTERN.search],
+        'error_messages': ['Email must only contains letters of english alphabet, digits 0-9, "@" symbol,'
+                           ' and it must have "." after @. Try again!']
+    }
+}
+
 
 class AdminMenus(CommonMenus):
+    manage_users_menu_next_page_choice = 4
+
     @staticmethod
+    @cached_menu(maxsize=1024)
     def main_menu(user_name: str) -> BaseMenuWithChoice:
         menu_message = f'Welcome, {user_name}! Choose what you want to do:\n 1) Manage users\n' \
                        f' 2) Manage roles\n 3) Manage orders\n' \
@@ -22,17 +54,18 @@ class AdminMenus(CommonMenus):
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
 
     @staticmethod
-    def manage_users_menu(select_result: List[dict]) -> Tuple[bool, BaseMenuWithChoice]:
-        if is_empty := (len(select_result) == 0):
+    def manage_users_menu(page: Page) -> Tuple[bool, BaseMenuWithChoice]:
+        if is_empty := (len(page.rows) == 0):
             users_message = colored('No users found. Please, try again later!', 'yellow')
             choices_message = '\n 1) Return to main menu'
             expected_values = [1]
         else:
-            headers, items = separate_headers_and_items(select_result)
+            navigation_message, navigation_values = build_page_navigation(
+                page, next_page_choice=AdminMenus.manage_users_menu_next_page_choice)
 
-            users_message = tabulate(items, headers, tablefmt='psql')
-            choices_message = '\n 1) Change user info\n 2) Delete user\n 3) Back to main menu'
-            expected_values = [1, 2, 3]
+            users_message = users_table.render(page.rows, version=page.version)
+            choices_message = '\n 1) Change user info\n 2) Delete user\n 3) Back to main menu' + navigation_message
+            expected_values = [1, 2, 3] + navigation_values
 
         menu_message = 'Here is list of all users:\n' + users_message + choices_message
         menu = build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
@@ -40,11 +73,12 @@ class AdminMenus(CommonMenus):
         return is_empty, menu
 
     @staticmethod
-    def change_user_info_menu(existing_user_ids: List[int]) -> BaseMenuWithChoice:
+    def change_user_info_menu(existing_user_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Specify user id whose info you want to change.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_user_ids)
 
     @staticmethod
+    @cached_menu()
     def specify_user_field_to_change_menu() -> BaseMenuWithChoice:
         menu_message = 'Specify which field you want to change:\n 1) First name\n 2) Last name\n 3) Phone number\n ' \
                        '4) Email\n 5) Role id'
@@ -52,30 +86,9 @@ class AdminMenus(CommonMenus):
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
 
     @staticmethod
-    def specify_new_user_info_menu(settings_key: int, existing_role_ids: List[int]) -> BaseMenuWithNoChoice:
+    def specify_new_user_info_menu(settings_key: int, existing_role_ids: Container[int]) -> BaseMenuWithNoChoice:
         settings_all = {
-            'name': {
-                'expected_type': 'str',
-                'additional_validators': [str.isalpha],
-                'error_messages': ['Name must contain only letters of english alphabet. Try again!']
-            },
-            'last_name': {
-                'expected_type': 'str',
-                'additional_validators': [str.isalpha],
-                'error_messages': ['Last name must contain only letters of english alphabet. Try again!']
-            },
-            'phone_number': {
-                'expected_type': 'str',
-                'additional_validators': [str.isnumeric, lambda x: len(x) == 10],
-                'error_messages': ['Phone number must contain only digits 0-9. Try again!',
-                                   'Phone number length must be 10. Try again!']
-            },
-            'email': {
-                'expected_type': 'str',
-                'additional_validators': [lambda x: re.search(r'^\w+_?\w+@\w+[.]\w{2,3}$', x)],
-                'error_messages': ['Email must only contains letters of english alphabet, digits 0-9, "@" symbol,'
-                                   ' and it must have "." after @. Try again!']
-            },
+            **USER_FIELD_SETTINGS,
             'role_id': {
                 'expected_type': 'int',
                 'additional_validators': [lambda x: x in existing_role_ids],
@@ -90,7 +103,7 @@ class AdminMenus(CommonMenus):
         return BaseMenuWithNoChoice(menu_message=menu_message, settings=settings)
 
     @staticmethod
-    def delete_user_menu(existing_user_ids: List[int]) -> BaseMenuWithChoice:
+    def delete_user_menu(existing_user_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Specify id of the user you want to delete.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_user_ids)
 
@@ -103,7 +116,7 @@ class AdminMenus(CommonMenus):
         else:
             headers, items = separate_headers_and_items(select_result)
 
-            roles_message = tabulate(items, headers, tablefmt='psql')
+            roles_message = tabulate_psql(items, headers)
             choices_message = '\n 1) Add new role \n 2) Delete role\n 3) Change existing role\n' \
                               ' 4) Back to main menu'
             expected_values = [1, 2, 3, 4]
@@ -128,13 +141,13 @@ class AdminMenus(CommonMenus):
         return BaseMenuWithNoChoice(menu_message=menu_message, settings=settings)
 
     @staticmethod
-    def delete_role_menu(existing_role_ids: List[int]) -> BaseMenuWithChoice:
+    def delete_role_menu(existing_role_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Specify id of the role you want to delete.'\
                        + colored('\nWARNING!!! ALL USERS WITH THIS ROLE WILL ALSO BE DELETED', 'red')
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_role_ids)
 
     @staticmethod
-    def change_role_info_menu(existing_role_ids: List[int]) -> BaseMenuWithChoice:
+    def change_role_info_menu(existing_role_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Specify id of the role whose info you want to change.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_role_ids)
 
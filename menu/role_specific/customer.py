@@ -1,17 +1,23 @@
-from typing import List, Tuple
+from itertools import chain
+from typing import Iterable, List, Tuple, Container
 
-from tabulate import tabulate
 from termcolor import colored
 
 from menu import CommonMenus
-from menu import build_menu_with_single_int_choice
+from menu import build_menu_with_single_int_choice, build_page_navigation
 from menu.base import BaseMenuWithChoice, BaseMenuWithNoChoice
-from models import Basket, BasketClothes
+from menu.registry import cached_menu
+from menu.table import clothes_table, user_orders_table
+from models import Basket, BasketClothes, Page
+from utils.other import tabulate_psql
 from utils.parse import separate_headers_and_items
 
 
 class CustomerMenus(CommonMenus):
+    clothes_menu_next_page_choice = 4
+
     @staticmethod
+    @cached_menu(maxsize=1024)
     def main_menu(user_name: str) -> BaseMenuWithChoice:
         menu_message = f'Welcome, {user_name}! Choose what you want to do:\n 1) View available clothes\n' \
                        f' 2) View my basket\n 3) View my orders\n 4) Switch users\n 5) Exit application'
@@ -20,18 +26,20 @@ class CustomerMenus(CommonMenus):
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
 
     @staticmethod
-    def clothes_menu(select_result: List[dict]) -> Tuple[bool, BaseMenuWithChoice]:
-        if is_empty := (len(select_result) == 0):
+    def clothes_menu(page: Page) -> Tuple[bool, BaseMenuWithChoice]:
+        if is_empty := (len(page.rows) == 0):
             clothes_message = colored('No clothes currently available. Please, try again later!', 'yellow')
             choices_message = '\n 1) View my basket\n 2) Back to main menu'
             expected_values = [1, 2]
 
         else:
-            headers, items = separate_headers_and_items(select_result)
+            navigation_message, navigation_values = build_page_navigation(
+                page, next_page_choice=CustomerMenus.clothes_menu_next_page_choice)
 
-            clothes_message = tabulate(items, headers=headers, tablefmt='psql')
-            choices_message = '\n 1) Add item to basket\n 2) View my basket\n 3) Back to main menu'
-            expected_values = [1, 2, 3]
+            clothes_message = clothes_table.render(page.rows, version=page.version)
+            choices_message = '\n 1) Add item to basket\n 2) View my basket\n 3) Back to main menu' \
+                              + navigation_message
+            expected_values = [1, 2, 3] + navigation_values
 
         menu_message = 'Here is list of all available clothes:\n' + clothes_message + choices_message
         menu = build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
@@ -39,24 +47,26 @@ class CustomerMenus(CommonMenus):
         return is_empty, menu
 
     @staticmethod
-    def specify_order_id_menu(existing_ids: List[int]) -> BaseMenuWithChoice:
+    def specify_order_id_menu(existing_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Specify order id.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_ids)
 
     @staticmethod
-    def all_orders_menu(select_result: List[dict]) -> Tuple[bool, BaseMenuWithChoice]:
-        if is_empty := len(select_result) == 0:
-            orders_message = colored('You have no orders yet.', 'yellow')
-            choices_message = '\n 1) Back to main menu'
+    def all_orders_menu(select_result: Iterable[dict]) -> Tuple[bool, BaseMenuWithChoice]:
+        rows = iter(select_result)
+        first_row = next(rows, None)
+
+        if is_empty := first_row is None:
+            orders_message = [colored('You have no orders yet.', 'yellow')]
+            choices_message = ' 1) Back to main menu'
             expected_values = [1]
         else:
-            headers, items = separate_headers_and_items(select_result)
-
-            orders_message = tabulate(items, headers=headers, tablefmt='psql')
-            choices_message = '\n 1) View specific order\n 2) Back to main menu'
+            # the orders are drawn line by line while they are still being fetched
+            orders_message = user_orders_table.stream(chain([first_row], rows))
+            choices_message = ' 1) View specific order\n 2) Back to main menu'
             expected_values = [1, 2]
 
-        menu_message = 'Here is list of all your orders:\n' + orders_message + choices_message
+        menu_message = chain(['Here is list of all your orders:'], orders_message, [choices_message])
         menu = build_menu_with_single_int_choice(menu_message, expected_values=expected_values)
 
         return is_empty, menu
@@ -66,7 +76,7 @@ class CustomerMenus(CommonMenus):
         headers, items = separate_headers_and_items(select_result)
         choices_message = '\n 1) Back to my orders menu'
 
-        menu_message = tabulate(items, headers=headers, tablefmt='psql') + choices_message
+        menu_message = tabulate_psql(items, headers) + choices_message
         expected_values = [1]
 
         return build_menu_with_single_int_choice(menu_message, expected_values=expected_values)
@@ -87,12 +97,12 @@ class CustomerMenus(CommonMenus):
         return BaseMenuWithNoChoice(menu_message=menu_message, settings=settings)
 
     @staticmethod
-    def add_to_basket_menu(existing_ids: List[int]) -> BaseMenuWithChoice:
+    def add_to_basket_menu(existing_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Enter id of the item you want to add to your basket.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_ids)
 
     @staticmethod
-    def remove_from_basket_menu(existing_ids: List[int]) -> BaseMenuWithChoice:
+    def remove_from_basket_menu(existing_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Enter id of the item you want to delete from your basket.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_ids)
 
@@ -111,6 +121,7 @@ class CustomerMenus(CommonMenus):
         return BaseMenuWithNoChoice(menu_message=menu_message, settings=settings)
 
     @staticmethod
+    @cached_menu()
     def checkout_menu() -> BaseMenuWithChoice:
         menu_message = 'Check your basket again. Do you confirm your order?\n 1) Yes\n 2) No'
         expected_values = [1, 2]
@@ -118,6 +129,7 @@ class CustomerMenus(CommonMenus):
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
 
     @staticmethod
+    @cached_menu()
     def post_checkout_menu() -> BaseMenuWithChoice:
         menu_message = 'Choose what you want to do next.\n 1) Back to main menu'
         expected_values = [1]
@@ -126,7 +138,7 @@ class CustomerMenus(CommonMenus):
 
     @staticmethod
     def modify_basket_menu(basket: Basket) -> Tuple[bool, BaseMenuWithChoice]:
-        if is_empty := (len(basket.get_contents()) == 0):
+        if is_empty := (len(basket) == 0):
             basket_message = colored('Your basket is currently empty', 'yellow')
             choices_message = '\n 1) Back to main menu'
             expected_values = [1]
@@ -144,6 +156,7 @@ class CustomerMenus(CommonMenus):
         return is_empty, menu
 
     @staticmethod
+    @cached_menu()
     def post_modify_basket_menu(modify_type: str) -> BaseMenuWithChoice:
         if modify_type == 'clear':
             menu_message = 'Choose what you want to do next:\n 1) Back to main menu'
@@ -1,26 +1,30 @@
-from typing import List, Tuple
+from typing import Tuple
 
-from tabulate import tabulate
 from termcolor import colored
 
 from menu import CommonMenus
-from menu import build_menu_with_single_int_choice
+from menu import build_menu_with_single_int_choice, build_page_navigation
 from menu.base import BaseMenuWithChoice
-from utils import separate_headers_and_items
+from menu.table import clothes_table
+from models import Page
 
 
 class GuestMenus(CommonMenus):
+    clothes_menu_next_page_choice = 2
+
     @staticmethod
-    def clothes_menu(select_result: List[dict]) -> Tuple[bool, BaseMenuWithChoice]:
-        if is_empty := (len(select_result) == 0):
+    def clothes_menu(page: Page) -> Tuple[bool, BaseMenuWithChoice]:
+        navigation_message, navigation_values = '', []
+        if is_empty := (len(page.rows) == 0):
             clothes_message = colored('No clothes currently available. Please, try again later!', 'yellow')
         else:
-            headers, items = separate_headers_and_items(select_result=select_result)
-            clothes_message = tabulate(items, headers=headers, tablefmt='psql')
-        choices_message = '\n 1) Back to start menu'
+            clothes_message = clothes_table.render(page.rows, version=page.version)
+            navigation_message, navigation_values = build_page_navigation(
+                page, next_page_choice=GuestMenus.clothes_menu_next_page_choice)
+        choices_message = '\n 1) Back to start menu' + navigation_message
 
         menu_message = 'Here is list of all available clothes:\n' + clothes_message + choices_message
-        expected_values = [1]
+        expected_values = [1] + navigation_values
         menu = build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
 
         return is_empty, menu
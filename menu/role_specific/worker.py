@@ -1,16 +1,56 @@
-from typing import List, Tuple, Union
+from typing import List, Tuple, Union, Container
 
-from tabulate import tabulate
 from termcolor import colored
 
 from menu import CommonMenus
-from menu import build_menu_with_single_int_choice
+from menu import build_menu_with_single_int_choice, build_page_navigation
 from menu.base import BaseMenuWithChoice, BaseMenuWithNoChoice, BaseMenuMixed
-from utils import separate_headers_and_items
+from menu.registry import cached_menu
+from menu.table import clothes_table, orders_table
+from models import Page
+from utils import separate_headers_and_items, tabulate_psql
+
+# the clothes fields a worker types in, shared by the menus that add and edit clothes and by the bulk import
+CLOTHES_FIELD_SETTINGS = {
+    'title': {
+        'expected_type': 'str',
+    },
+    'description': {
+        'expected_type': 'str'
+    },
+    'size': {
+        'expected_type': 'str'
+    },
+    'material': {
+        'expected_type': 'str',
+    },
+    'color': {
+        'expected_type': 'str'
+    },
+    'price': {
+        'expected_type': 'float',
+        'additional_validators': [lambda x: x > 0],
+        'error_messages': ['Price must be greater than 0. Try again!']
+    },
+    'discount': {
+        'expected_type': 'float',
+        'additional_validators': [lambda x: 0 <= x < 100],
+        'error_messages': ['Discount must be between 0 and 100. Try again!']
+    },
+    'in_stock': {
+        'expected_type': 'int',
+        'additional_validators': [lambda x: x > 0],
+        'error_messages': ['In stock amount must be greater than 0. Try again!']
+    }
+}
 
 
 class WorkerMenus(CommonMenus):
+    manage_orders_menu_next_page_choice = 3
+    manage_clothes_menu_next_page_choice = 6
+
     @staticmethod
+    @cached_menu(maxsize=1024)
     def main_menu(user_name: str) -> BaseMenuWithChoice:
         menu_message = f'Welcome, {user_name}! Choose what you want to do:\n 1) Manage orders\n' \
                        f' 2) Manage clothes\n 3) Manage clothes type\n 4) Manage statuses\n 5) View available clothes\n' \
@@ -20,18 +60,19 @@ class WorkerMenus(CommonMenus):
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
 
     @staticmethod
-    def manage_orders_menu(select_result: List[dict]) -> Tuple[bool, BaseMenuWithChoice]:
-        if is_empty := (len(select_result) == 0):
+    def manage_orders_menu(page: Page) -> Tuple[bool, BaseMenuWithChoice]:
+        if is_empty := (len(page.rows) == 0):
             orders_message = colored('No orders found. Please, try again later!', 'yellow')
             choices_message = '\n 1) Back to main menu'
             expected_values = [1]
 
         else:
-            headers, items = separate_headers_and_items(select_result)
+            navigation_message, navigation_values = build_page_navigation(
+                page, next_page_choice=WorkerMenus.manage_orders_menu_next_page_choice)
 
-            orders_message = tabulate(items, headers=headers, tablefmt='psql')
-            choices_message = '\n 1) Change order status\n 2) Back to main menu'
-            expected_values = [1, 2]
+            orders_message = orders_table.render(page.rows, version=page.version)
+            choices_message = '\n 1) Change order status\n 2) Back to main menu' + navigation_message
+            expected_values = [1, 2] + navigation_values
 
         menu_message = 'Here is list of all orders:\n' + orders_message + choices_message
         menu = build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
@@ -39,12 +80,12 @@ class WorkerMenus(CommonMenus):
         return is_empty, menu
 
     @staticmethod
-    def change_order_status_menu(existing_order_ids: List[int]) -> BaseMenuWithChoice:
+    def change_order_status_menu(existing_order_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Enter id of the order you want to change.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_order_ids)
 
     @staticmethod
-    def specify_new_order_status_menu(existing_status_ids: List[int]) -> BaseMenuWithChoice:
+    def specify_new_order_status_menu(existing_status_ids: Container[int]) -> BaseMenuWithChoice:
         settings = {
             'choice': {
                 'expected_type': 'int',
@@ -55,19 +96,20 @@ class WorkerMenus(CommonMenus):
         return BaseMenuWithChoice(menu_message=menu_message, settings=settings)
 
     @staticmethod
-    def manage_clothes_menu(select_result: List[dict]) -> Tuple[bool, BaseMenuWithChoice]:
-        if is_empty := (len(select_result) == 0):
+    def manage_clothes_menu(page: Page) -> Tuple[bool, BaseMenuWithChoice]:
+        if is_empty := (len(page.rows) == 0):
             clothes_message = colored('No clothes found. Please, try again later!', 'yellow')
             choices_message = '\n 1) Back to main menu\n 2) Add new clothes'
             expected_values = [1, 2]
 
         else:
-            headers, items = separate_headers_and_items(select_result)
+            navigation_message, navigation_values = build_page_navigation(
+                page, next_page_choice=WorkerMenus.manage_clothes_menu_next_page_choice)
 
-            clothes_message = tabulate(items, headers=headers, tablefmt='psql')
+            clothes_message = clothes_table.render(page.rows, version=page.version)
             choices_message = '\n 1) Add new clothes\n 2) Delete clothes\n 3) Restock existing clothes\n' \
-                              ' 4) Edit existing clothes info\n 5) Back to main menu '
-            expected_values = [1, 2, 3, 4, 5]
+                              ' 4) Edit existing clothes info\n 5) Back to main menu' + navigation_message
+            expected_values = [1, 2, 3, 4, 5] + navigation_values
 
         menu_message = 'Here is list of all clothes:\n' + clothes_message + choices_message
         menu = build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
@@ -75,7 +117,7 @@ class WorkerMenus(CommonMenus):
         return is_empty, menu
 
     @staticmethod
-    def add_clothes_menu(existing_clothes_type_ids: List[int]) -> BaseMenuMixed:
+    def add_clothes_menu(existing_clothes_type_ids: Container[int]) -> BaseMenuMixed:
         choice_settings = {
             'clothes_type_id': {
                 'expected_type': 'int',
@@ -83,38 +125,7 @@ class WorkerMenus(CommonMenus):
             }
         }
 
-        no_choice_settings = {
-            'title': {
-                'expected_type': 'str',
-            },
-            'description': {
-                'expected_type': 'str'
-            },
-            'size': {
-                'expected_type': 'str'
-            },
-            'material': {
-                'expected_type': 'str',
-            },
-            'color': {
-                'expected_type': 'str'
-            },
-            'price': {
-                'expected_type': 'float',
-                'additional_validators': [lambda x: x > 0],
-                'error_messages': ['Price must be greater than 0. Try again!']
-            },
-            'discount': {
-                'expected_type': 'float',
-                'additional_validators': [lambda x: 0 <= x < 100],
-                'error_messages': ['Discount must be between 0 and 100. Try again!']
-            },
-            'in_stock': {
-                'expected_type': 'int',
-                'additional_validators': [lambda x: x > 0],
-                'error_messages': ['In stock amount must be greater than 0. Try again!']
-            }
-        }
+        no_choice_settings = CLOTHES_FIELD_SETTINGS
 
         choice_menu_message = 'Enter information about clothes you want to add.'
         no_choice_menu_message = ''
@@ -122,16 +133,17 @@ class WorkerMenus(CommonMenus):
         return BaseMenuMixed(choice_settings, choice_menu_message, no_choice_settings, no_choice_menu_message)
 
     @staticmethod
-    def remove_clothes_menu(existing_clothes_ids: List[int]) -> BaseMenuWithChoice:
+    def remove_clothes_menu(existing_clothes_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Enter id of the clothes you want to delete'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_clothes_ids)
 
     @staticmethod
-    def restock_clothes_menu(existing_clothes_ids: List[int]) -> BaseMenuWithChoice:
+    def restock_clothes_menu(existing_clothes_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Enter id of the clothes you want to restock'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_clothes_ids)
 
     @staticmethod
+    @cached_menu()
     def specify_restock_amount_menu() -> BaseMenuWithNoChoice:
         settings = {
             'restock_amount': {
@@ -152,7 +164,7 @@ class WorkerMenus(CommonMenus):
         else:
             headers, items = separate_headers_and_items(select_result)
 
-            clothes_type_message = tabulate(items, headers=headers, tablefmt='psql')
+            clothes_type_message = tabulate_psql(items, headers)
             choices_messages = '\n 1) Add clothes type\n 2) Remove clothes type\n' \
                                ' 3) Edit existing clothes type info\n 4) Back to main menu'
             expected_values = [1, 2, 3, 4]
@@ -175,12 +187,12 @@ class WorkerMenus(CommonMenus):
         return BaseMenuWithNoChoice(menu_message=menu_message, settings=settings)
 
     @staticmethod
-    def remove_clothes_type_menu(existing_clothes_type_ids: List[int]) -> BaseMenuWithChoice:
+    def remove_clothes_type_menu(existing_clothes_type_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Specify clothes type id you want to delete.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_clothes_type_ids)
 
     @staticmethod
-    def change_clothes_type_info_menu(existing_clothes_type_ids: List[int]) -> BaseMenuWithChoice:
+    def change_clothes_type_info_menu(existing_clothes_type_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Specify clothes type id whose info you want to change.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_clothes_type_ids)
 
@@ -197,11 +209,12 @@ class WorkerMenus(CommonMenus):
         return BaseMenuWithNoChoice(menu_message=menu_message, settings=settings)
 
     @staticmethod
-    def change_clothes_info_menu(existing_clothes_ids: List[int]) -> BaseMenuWithChoice:
+    def change_clothes_info_menu(existing_clothes_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Specify clothes id whose info you want to change.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_clothes_ids)
 
     @staticmethod
+    @cached_menu()
     def specify_clothes_field_to_change_menu() -> BaseMenuWithChoice:
         menu_message = 'Specify which field you want to change:\n 1) Clothes type id\n 2) Title\n 3) Description\n ' \
                        '4) Size\n 5) Material\n 6) Color\n 7) Price\n 8) Discount\n 9) In stock'
@@ -209,7 +222,7 @@ class WorkerMenus(CommonMenus):
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=expected_values)
 
     @staticmethod
-    def specify_new_clothes_info_menu(settings_key: int, existing_clothes_type_ids: List[int]) \
+    def specify_new_clothes_info_menu(settings_key: int, existing_clothes_type_ids: Container[int]) \
             -> Union[BaseMenuWithChoice, BaseMenuWithNoChoice]:
         choice_settings = {
             'clothes_type_id': {
@@ -217,44 +230,17 @@ class WorkerMenus(CommonMenus):
                 'expected_values': existing_clothes_type_ids
             }
         }
-        no_choice_settings = {
-            'title': {
-                'expected_type': 'str',
-            },
-            'description': {
-                'expected_type': 'str'
-            },
-            'size': {
-                'expected_type': 'str'
-            },
-            'material': {
-                'expected_type': 'str',
-            },
-            'color': {
-                'expected_type': 'str'
-            },
-            'price': {
-                'expected_type': 'float',
-                'additional_validators': [lambda x: x > 0],
-                'error_messages': ['Price must be greater than 0. Try again!']
-            },
-            'discount': {
-                'expected_type': 'float',
-                'additional_validators': [lambda x: 0 <= x < 100],
-                'error_messages': ['Discount must be between 0 and 100. Try again!']
-            },
-            'in_stock': {
-                'expected_type': 'int',
-                'additional_validators': [lambda x: x > 0],
-                'error_messages': ['In stock amount must be greater than 0. Try again!']
-            }
-        }
 
         if settings_key == 1:
             menu_message = 'Specify new clothes type id'
             return BaseMenuWithChoice(menu_message=menu_message, settings=choice_settings)
 
-        settings_mapping = {i + 2: {k: v} for i, (k, v) in enumerate(no_choice_settings.items())}
+        return WorkerMenus._specify_new_clothes_field_menu(settings_key)
+
+    @staticmethod
+    @cached_menu()
+    def _specify_new_clothes_field_menu(settings_key: int) -> BaseMenuWithNoChoice:
+        settings_mapping = {i + 2: {k: v} for i, (k, v) in enumerate(CLOTHES_FIELD_SETTINGS.items())}
         settings = settings_mapping[settings_key]
 
         menu_message = f'Specify new {list(settings.keys())[0]}.'
@@ -269,7 +255,7 @@ class WorkerMenus(CommonMenus):
         else:
             headers, items = separate_headers_and_items(select_result)
 
-            statuses_message = tabulate(items, headers=headers, tablefmt='psql')
+            statuses_message = tabulate_psql(items, headers)
             choices_messages = '\n 1) Add status\n 2) Remove status\n' \
                                ' 3) Edit existing status info\n 4) Back to main menu'
             expected_values = [1, 2, 3, 4]
@@ -292,12 +278,12 @@ class WorkerMenus(CommonMenus):
         return BaseMenuWithNoChoice(menu_message=menu_message, settings=settings)
 
     @staticmethod
-    def remove_status_menu(existing_status_ids: List[int]) -> BaseMenuWithChoice:
+    def remove_status_menu(existing_status_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Specify id of status you want to delete.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_status_ids)
 
     @staticmethod
-    def change_status_info_menu(existing_status_ids: List[int]) -> BaseMenuWithChoice:
+    def change_status_info_menu(existing_status_ids: Container[int]) -> BaseMenuWithChoice:
         menu_message = 'Specify status id whose info you want to change.'
         return build_menu_with_single_int_choice(menu_message=menu_message, expected_values=existing_status_ids)
 
@@ -0,0 +1,113 @@
+from decimal import Decimal
+from typing import Dict, List, Optional, Iterable, Iterator, Tuple, Any, Hashable
+
+
+def format_cell(value: Any) -> str:
+    return '' if value is None else str(value)
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+class TableRenderer:
+    # draws psql-style tables like tabulate, but remembers what it drew: whole tables by data version,
+    # and single rows by id, so a redraw after one row changed formats only that row
+    def __init__(self, widths: Optional[Dict[str, int]] = None, key: str = 'id', max_cached_rows: int = 10000,
+                 max_cached_tables: int = 256) -> None:
+        # fixed widths are only used by stream(), to draw rows as they arrive
+        self.widths = widths or {}
+        self.key = key
+        self.max_cached_rows = max_cached_rows
+        self.max_cached_tables = max_cached_tables
+
+        self._tables: Dict[Hashable, str] = {}
+        self._rows: Dict[Hashable, Tuple[tuple, str]] = {}
+
+    def render(self, rows: List[dict], version: Optional[Hashable] = None) -> str:
+        if len(rows) == 0:
+            return ''
+
+        table_key = None
+        if version is not None:
+            table_key = (version, tuple(row[self.key] for row in rows))
+            table = self._tables.get(table_key)
+            if table is not None:
+                return table
+
+        table = '\n'.join(self._render_lines(rows, widths=self._measure(rows)))
+
+        if table_key is not None:
+            if len(self._tables) >= self.max_cached_tables:
+                self._tables.clear()
+            self._tables[table_key] = table
+        return table
+
+    def stream(self, rows: Iterable[dict]) -> Iterator[str]:
+        # with fixed widths every row is drawn as soon as it arrives, without a pass to measure the columns
+        rows = iter(rows)
+        first_row = next(rows, None)
+        if first_row is None:
+            return
+
+        widths = {column: self.widths.get(column, len(column)) for column in first_row}
+        yield from self._render_lines(self._chain(first_row, rows), widths=widths)
+
+    @staticmethod
+    def _measure(rows: List[dict]) -> Dict[str, int]:
+        # whole tables are always measured, so no cell is ever cut
+        return {column: max([len(column)] + [len(format_cell(row[column])) for row in rows]) for column in rows[0]}
+
+    def _render_lines(self, rows: Iterable[dict], widths: Dict[str, int]) -> Iterator[str]:
+        border = '+' + '+'.join('-' * (width + 2) for width in widths.values()) + '+'
+        header_separator = '|' + '+'.join('-' * (width + 2) for width in widths.values()) + '|'
+
+        header = None
+        for row in rows:
+            if header is None:
+                # columns holding numbers are right aligned, headers included
+                alignments = {column: is_number(value) for column, value in row.items()}
+                header = self._draw(list(widths), widths, alignments)
+                yield border
+                yield header
+                yield header_separator
+            yield self._render_row(row, widths)
+
+        if header is not None:
+            yield border
+
+    def _render_row(self, row: dict, widths: Dict[str, int]) -> str:
+        values = tuple(row.values())
+        row_key = (row.get(self.key), tuple(widths.items()))
+
+        cached = self._rows.get(row_key)
+        if cached is not None and cached[0] == values:
+            return cached[1]
+
+        line = self._draw([format_cell(value) for value in values], widths,
+                          {column: is_number(value) for column, value in row.items()})
+        if len(self._rows) >= self.max_cached_rows:
+            self._rows.clear()
+        self._rows[row_key] = (values, line)
+        return line
+
+    @staticmethod
+    def _draw(cells: List[str], widths: Dict[str, int], alignments: Dict[str, bool]) -> str:
+        drawn = []
+        for cell, (column, width) in zip(cells, widths.items()):
+            if len(cell) > width:
+                cell = cell[:width - 1] + '~'
+            drawn.append(cell.rjust(width) if alignments.get(column, False) else cell.ljust(width))
+        return '| ' + ' | '.join(drawn) + ' |'
+
+    @staticmethod
+    def _chain(first_row: dict, rows: Iterator[dict]) -> Iterator[dict]:
+        yield first_row
+        yield from rows
+
+
+# the paged listings measure their columns; only streamed tables draw with fixed widths
+clothes_table = TableRenderer()
+orders_table = TableRenderer()
+user_orders_table = TableRenderer(widths={'id': 6, 'date_time': 26, 'status': 16})
+users_table = TableRenderer()
@@ -0,0 +1,12 @@
+from .registry import REGISTRY, Counter, Gauge, Histogram, Registry
+from .exposition import add_metrics_arguments, write_metrics
+from .shop import (ACTIVE_SESSIONS, BASKET_LINES, CHECKOUTS, CHECKOUT_SECONDS, DB_QUERY_SECONDS, DB_ROWS,
+                   MENU_INTERACTIONS, MENU_RENDER_SECONDS, SIGN_INS, SIGN_UPS, DatabaseMetrics, register_database)
+
+
+def __getattr__(name: str):
+    # http.server pulls in the email package, so the server is only imported by processes that serve metrics
+    if name == 'MetricsServer':
+        from .server import MetricsServer
+        return MetricsServer
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
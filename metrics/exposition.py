@@ -0,0 +1,19 @@
+import argparse
+import os
+
+from metrics.registry import REGISTRY, Registry
+
+
+def write_metrics(path: str, registry: Registry = REGISTRY) -> None:
+    # written next to the target and renamed, so a collector reading the file never sees half of it
+    part_path = path + '.part'
+    with open(part_path, 'w', encoding='utf-8') as file:
+        file.write(registry.render())
+    os.replace(part_path, path)
+
+
+def add_metrics_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    parser.add_argument('--metrics-port', type=int, default=None, help='serve Prometheus metrics on /metrics')
+    parser.add_argument('--metrics-bind', default='127.0.0.1')
+    parser.add_argument('--metrics-file', default=None, help='write Prometheus metrics to this file on exit')
+    return parser
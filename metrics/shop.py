@@ -0,0 +1,50 @@
+from database import Database
+from database.instrumentation import Instrument, QueryEvent
+from metrics.registry import REGISTRY, Counter, Gauge, Histogram, Registry
+
+ACTIVE_SESSIONS = Gauge('shop_active_sessions', 'Sessions currently running, by role', labels=('role',),
+                        registry=REGISTRY)
+SIGN_INS = Counter('shop_sign_ins_total', 'Sign in attempts, by result', labels=('result',), registry=REGISTRY)
+SIGN_UPS = Counter('shop_sign_ups_total', 'Sign up attempts, by result', labels=('result',), registry=REGISTRY)
+MENU_INTERACTIONS = Counter('shop_menu_interactions_total', 'Menus shown to a user, by menu', labels=('menu',),
+                            registry=REGISTRY)
+MENU_RENDER_SECONDS = Histogram('shop_menu_render_seconds', 'Time to build and draw a menu, without user input',
+                                labels=('menu',), registry=REGISTRY,
+                                buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+CHECKOUTS = Counter('shop_checkouts_total', 'Checkouts, by result', labels=('result',), registry=REGISTRY)
+CHECKOUT_SECONDS = Histogram('shop_checkout_seconds', 'Time to place an order', registry=REGISTRY)
+BASKET_LINES = Histogram('shop_basket_lines', 'Distinct items in a basket at checkout', registry=REGISTRY,
+                         buckets=(1, 2, 3, 5, 10, 20, 50, 100))
+DB_QUERY_SECONDS = Histogram('shop_db_query_seconds', 'Database statement latency, fetch and commit included',
+                             labels=('operation', 'caller'), registry=REGISTRY,
+                             buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                                      0.5, 1.0, 2.5))
+DB_ROWS = Counter('shop_db_rows_total', 'Rows returned by database statements', labels=('operation', 'caller'),
+                  registry=REGISTRY)
+
+
+class DatabaseMetrics(Instrument):
+    # labelled by statement kind and calling method rather than by query, which keeps the series few
+    def record(self, event: QueryEvent) -> None:
+        operation = event.fingerprint.split(' ', 1)[0]
+        caller = event.caller or ''
+        DB_QUERY_SECONDS.observe(event.latency + event.commit_time, operation=operation, caller=caller)
+        if event.rows:
+            DB_ROWS.inc(event.rows, operation=operation, caller=caller)
+
+
+def register_database(database: Database, registry: Registry = REGISTRY) -> None:
+    # times the statements of the database and exposes its pool and caches; a later database replaces it
+    database.add_instrument(DatabaseMetrics())
+
+    for metric in (
+            Counter('shop_catalog_cache_hits_total', 'Catalog reads served from the cache',
+                    function=lambda: database.catalog.hits),
+            Counter('shop_catalog_cache_misses_total', 'Catalog reads that loaded the catalog',
+                    function=lambda: database.catalog.misses),
+            Gauge('shop_signed_in_sessions', 'Sessions held by the session cache',
+                  function=lambda: len(database.sessions)),
+            Gauge('shop_db_pool_connections', 'Open database connections', function=lambda: database.pool.size),
+            Gauge('shop_db_pool_idle_connections', 'Idle database connections', function=lambda: database.pool.idle)
+    ):
+        registry.register(metric, replace=True)
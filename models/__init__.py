@@ -1,3 +1,4 @@
 from .models import Basket, BasketClothes
+from .models import Page
 from .models import Role, Status
 from .models import User, Clothes, Order, ItemOrdered, ClothesType
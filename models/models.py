@@ -1,11 +1,12 @@
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
-from typing import List, Tuple, Any, Union, Optional
+from typing import List, Tuple, Any, Union, Optional, Dict, Iterable
 
-from tabulate import tabulate
-
-from utils.other import calculate_single_item_total
+from utils.console import write_output
+from utils.money import to_cents, from_cents
+from utils.other import calculate_single_item_total, tabulate_psql
 from utils.parse import separate_headers_and_items
 
 
@@ -16,7 +17,8 @@ class Status(Enum):
     DONE = 'done'
 
 
-@dataclass
+# slotted models carry no per-instance __dict__, which is most of a row's footprint in large listings
+@dataclass(slots=True)
 class User:
     first_name: str
     last_name: str
@@ -27,34 +29,35 @@ class User:
     id: int = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Role:
     role: str
     id: int = None
 
     @staticmethod
-    def map_id_to_role(role_id: int) -> str:
-        roles_mapping = {
-            1: 'customer',
-            2: 'worker',
-            3: 'admin'
-        }
+    def map_id_to_role(role_id: int, roles_mapping: Optional[Dict[int, str]] = None) -> str:
+        if roles_mapping is None:
+            roles_mapping = {
+                1: 'customer',
+                2: 'worker',
+                3: 'admin'
+            }
         return roles_mapping[role_id]
 
 
-@dataclass
+@dataclass(slots=True)
 class Status:
     status: str
     id: int = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ClothesType:
     type: str
     id: int = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Clothes:
     clothes_type_id: int
     title: str
@@ -72,11 +75,11 @@ class Clothes:
         return BasketClothes(
             clothes['id'], clothes['title'], clothes['size'], clothes['material'],
             clothes['color'], basket_quantity, clothes['price'], clothes['discount'],
-            calculate_single_item_total(basket_quantity, float(clothes['price']), float(clothes['discount']))
+            calculate_single_item_total(basket_quantity, clothes['price'], clothes['discount'])
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     user_id: int
     date_time: datetime
@@ -84,16 +87,25 @@ class Order:
     id: int = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ItemOrdered:
     order_id: int
     clothes_id: int
     quantity: int
     discount: float
-    total: float
+    total: Decimal
 
 
 @dataclass
+class Page:
+    rows: List[dict]
+    has_next: bool
+    has_previous: bool
+    # identifies the state of the table the rows were read from, None when it is not tracked
+    version: Optional[int] = None
+
+
+@dataclass(slots=True)
 class BasketClothes:
     id: int
     title: str
@@ -103,94 +115,116 @@ class BasketClothes:
     quantity: int
     price: float
     discount: float
-    total: float
+    total: Decimal
 
     def to_item_ordered(self, order_id: int) -> ItemOrdered:
         return ItemOrdered(order_id, self.id, self.quantity, self.discount, self.total)
 
 
-@dataclass
 class Basket:
-    contents: List[BasketClothes]
+    def __init__(self, contents: Optional[List[BasketClothes]] = None) -> None:
+        # lines in insertion order and the position of every clothes id among them, so lookups by either are
+        # O(1); only removing a line shifts the positions after it
+        self._lines: List[BasketClothes] = []
+        self._positions: Dict[int, int] = {}
+        self._total_cents = 0
+        self.contents = contents or []
+
+    @property
+    def contents(self) -> Tuple[BasketClothes, ...]:
+        # read-only, so code still changing the lines in place fails loudly instead of changing a copy
+        return tuple(self._lines)
+
+    @contents.setter
+    def contents(self, contents: Iterable[BasketClothes]) -> None:
+        self.clear()
+        for clothes in contents:
+            self.add_new(clothes)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __contains__(self, clothes_id: int) -> bool:
+        return clothes_id in self._positions
 
     def add_new(self, clothes: BasketClothes) -> 'Basket':
-        self.contents.append(clothes)
+        # clothes already in the basket are added to their line, which keeps the total right
+        if clothes.id in self._positions:
+            return self.add_existing(clothes)
+
+        self._positions[clothes.id] = len(self._lines)
+        self._lines.append(clothes)
+        self._total_cents += to_cents(clothes.total)
         return self
 
     def add_existing(self, clothes: BasketClothes) -> 'Basket':
-        idx = self.get_basket_clothes_id_by_clothes_id(clothes.id)
-        self.contents[idx].quantity += clothes.quantity
-        self.contents[idx].total += calculate_single_item_total(
-            clothes.quantity,
-            float(clothes.price),
-            float(clothes.discount))
-
+        line = self.get_line(clothes.id)
+        self._set_quantity(line, line.quantity + clothes.quantity)
         return self
 
     def remove_single(self, clothes_id: int, amount: int) -> 'Basket':
-        id_to_remove = self.get_basket_clothes_id_by_clothes_id(clothes_id)
-        clothes_to_remove = self.get_contents_by_index(id_to_remove)
-
-        new_quantity = clothes_to_remove.quantity - amount
+        line = self.get_line(clothes_id)
+        new_quantity = line.quantity - amount
 
         if new_quantity == 0:
-            del self.contents[id_to_remove]
+            position = self._positions.pop(clothes_id)
+            del self._lines[position]
+            for moved_line in self._lines[position:]:
+                self._positions[moved_line.id] -= 1
+            self._total_cents -= to_cents(line.total)
         else:
-            self.contents[id_to_remove].quantity = new_quantity
-            self.contents[id_to_remove].total = calculate_single_item_total(
-                clothes_to_remove.quantity,
-                float(clothes_to_remove.price),
-                float(clothes_to_remove.discount))
+            self._set_quantity(line, new_quantity)
 
         return self
 
     def clear(self) -> None:
-        self.contents.clear()
+        self._lines.clear()
+        self._positions.clear()
+        self._total_cents = 0
 
     def get_basket_clothes_id_by_clothes_id(self, clothes_id: int) -> Optional[int]:
-        all_ids = self.get_ids()
-
-        try:
-            idx = all_ids.index(clothes_id)
-        except ValueError:
-            idx = None
-        return idx
+        return self._positions.get(clothes_id)
 
     def get_in_basket_quantity_by_clothes_id(self, clothes_id: int) -> int:
-        in_basket_quantity = 0
-
-        idx = self.get_basket_clothes_id_by_clothes_id(clothes_id)
-        if idx is not None:
-            in_basket_quantity = self.get_contents_by_index(idx).quantity
-        return in_basket_quantity
+        position = self._positions.get(clothes_id)
+        return 0 if position is None else self._lines[position].quantity
 
     def get_ids(self) -> List[int]:
-        return [clothes.id for clothes in self.contents]
+        return list(self._positions)
 
-    def get_contents(self, raw: bool = True) -> Union[List[BasketClothes], Tuple[List[str], List[List[Any]]]]:
+    def get_contents(self, raw: bool = True) -> Union[Tuple[BasketClothes, ...], Tuple[List[str], List[List[Any]]]]:
         if raw:
             return self.contents
         else:
-            contents = [asdict(item) for item in self.contents]
+            contents = [asdict(item) for item in self._lines]
             headers, items = separate_headers_and_items(contents)
 
             return headers, items
 
     def get_tabulated_contents(self) -> str:
         headers, items = self.get_contents(raw=False)
-        tabulated_contents = tabulate(items, headers=headers, tablefmt="psql")
+        tabulated_contents = tabulate_psql(items, headers)
 
         return tabulated_contents
 
     def get_contents_by_index(self, idx: int) -> BasketClothes:
-        return self.contents[idx]
+        return self._lines[idx]
+
+    def get_line(self, clothes_id: int) -> BasketClothes:
+        return self._lines[self._positions[clothes_id]]
+
+    def calculate_basket_total(self) -> Decimal:
+        return from_cents(self._total_cents)
 
-    def calculate_basket_total(self) -> float:
-        return sum([item.total for item in self.contents])
+    def _set_quantity(self, line: BasketClothes, quantity: int) -> None:
+        # the line total is recomputed from the quantity rather than accumulated, so it can't drift
+        new_total = calculate_single_item_total(quantity, line.price, line.discount)
+        self._total_cents += to_cents(new_total) - to_cents(line.total)
+        line.quantity, line.total = quantity, new_total
 
     def print(self) -> 'Basket':
-        if len(self.contents) != 0:
-            print(f'Your basket:\n {self.get_tabulated_contents()}\n'
-                  f'Current basket total: {self.calculate_basket_total()}')
+        if len(self._lines) != 0:
+            write_output(f'Your basket:\n {self.get_tabulated_contents()}\n'
+                         f'Current basket total: {self.calculate_basket_total()}')
 
         return self
@@ -0,0 +1,39 @@
+import socketserver
+import threading
+
+from termcolor import colored
+
+from app import run_session
+from database import Database
+from utils.console import SocketConsole, use_console
+
+
+class TerminalSessionHandler(socketserver.StreamRequestHandler):
+    server: 'TerminalServer'
+
+    def handle(self) -> None:
+        console = SocketConsole(reader=self.rfile, writer=self.wfile)
+
+        if not self.server.sessions.acquire(blocking=False):
+            console.write(colored('The shop is full right now. Please, try again later!', 'red'))
+            return
+
+        try:
+            with use_console(console):
+                run_session(self.server.database)
+        except (EOFError, ConnectionError):
+            pass
+        finally:
+            self.server.sessions.release()
+
+
+class TerminalServer(socketserver.ThreadingTCPServer):
+    # one thread per connection runs its own interface state machine, the pool and the caches are shared
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, database: Database, host: str = '127.0.0.1', port: int = 2323,
+                 max_sessions: int = 1000) -> None:
+        super().__init__((host, port), TerminalSessionHandler)
+        self.database = database
+        self.sessions = threading.BoundedSemaphore(max_sessions)
@@ -0,0 +1,19 @@
+import pytest
+
+from database import Database, SQLiteBackend
+from database.migrations import Migrator
+from models import Clothes, ClothesType
+
+
+@pytest.fixture
+def database(tmp_path) -> Database:
+    # a fresh SQLite database per test with every migration applied and one clothes type to hang clothes off
+    database = Database(backend=SQLiteBackend(path=str(tmp_path / 'shop.db')), preload_references=False)
+    Migrator(database).apply()
+    database.insert_clothes_type(ClothesType('shirt'))
+    yield database
+    database.pool.close()
+
+
+def make_clothes(number: int, in_stock: int = 10) -> Clothes:
+    return Clothes(1, f'shirt {number}', 'a shirt', 'M', 'cotton', 'black', 10.0, 0, in_stock)
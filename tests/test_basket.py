@@ -0,0 +1,123 @@
+from decimal import Decimal
+
+import pytest
+
+from models import Basket, BasketClothes
+from utils.other import calculate_single_item_total
+
+
+def line(clothes_id: int, quantity: int = 1, price: float = 10.0, discount: float = 0) -> BasketClothes:
+    total = calculate_single_item_total(quantity, price, discount)
+    return BasketClothes(clothes_id, f'item {clothes_id}', 'M', 'cotton', 'black', quantity, price, discount, total)
+
+
+def assert_consistent(basket: Basket) -> None:
+    # the running total always equals the lines recomputed from scratch, and every lookup agrees with the lines
+    lines = basket.contents
+    assert basket.calculate_basket_total() == sum(
+        (calculate_single_item_total(item.quantity, item.price, item.discount) for item in lines), Decimal('0.00'))
+    assert all(item.total == calculate_single_item_total(item.quantity, item.price, item.discount) for item in lines)
+    assert basket.get_ids() == [item.id for item in lines]
+    assert len(basket) == len(lines)
+    for position, item in enumerate(lines):
+        assert basket.get_basket_clothes_id_by_clothes_id(item.id) == position
+        assert basket.get_contents_by_index(position) is item
+        assert basket.get_line(item.id) is item
+        assert basket.get_in_basket_quantity_by_clothes_id(item.id) == item.quantity
+
+
+def test_add_new():
+    basket = Basket()
+    basket.add_new(line(1, 2, 10.0)).add_new(line(2, 1, 19.99, 12.5))
+    assert basket.calculate_basket_total() == Decimal('37.49')
+    assert_consistent(basket)
+
+
+def test_add_new_with_a_clothes_id_already_in_the_basket_adds_to_its_line():
+    basket = Basket([line(1, 2, 10.0), line(2)])
+    basket.add_new(line(1, 3, 10.0))
+    assert len(basket) == 2
+    assert basket.get_line(1).quantity == 5
+    assert basket.calculate_basket_total() == Decimal('60.00')
+    assert_consistent(basket)
+
+
+def test_add_existing_recomputes_the_line_total():
+    basket = Basket([line(1, 1, 0.05, 10)])
+    for _ in range(9):
+        basket.add_existing(line(1, 1, 0.05, 10))
+    # ten separately rounded 0.045 lines would add up to 0.50; one line of ten is 0.45
+    assert basket.calculate_basket_total() == Decimal('0.45')
+    assert_consistent(basket)
+
+
+def test_remove_single_lowers_the_quantity():
+    basket = Basket([line(1, 5, 2.5), line(2)])
+    basket.remove_single(1, 2)
+    assert basket.get_line(1).quantity == 3
+    assert basket.calculate_basket_total() == Decimal('17.50')
+    assert_consistent(basket)
+
+
+def test_remove_single_drops_an_emptied_line_and_shifts_the_rest():
+    basket = Basket([line(1), line(2, 2), line(3, 3), line(4)])
+    basket.remove_single(2, 2)
+    assert 2 not in basket
+    assert basket.get_ids() == [1, 3, 4]
+    assert basket.get_basket_clothes_id_by_clothes_id(4) == 2
+    assert basket.get_in_basket_quantity_by_clothes_id(2) == 0
+    assert basket.calculate_basket_total() == Decimal('50.00')
+    assert_consistent(basket)
+
+    basket.remove_single(1, 1).remove_single(4, 1).remove_single(3, 3)
+    assert len(basket) == 0
+    assert basket.calculate_basket_total() == 0
+    assert_consistent(basket)
+
+
+def test_missing_clothes_id_raises():
+    basket = Basket([line(1)])
+    with pytest.raises(KeyError):
+        basket.remove_single(2, 1)
+    with pytest.raises(KeyError):
+        basket.add_existing(line(2))
+    assert_consistent(basket)
+
+
+def test_contents_setter_replaces_the_lines():
+    basket = Basket([line(1, 3), line(2)])
+    basket.contents = [line(3, 2, 1.99), line(4), line(3, 1, 1.99)]
+    assert basket.get_ids() == [3, 4]
+    assert basket.get_line(3).quantity == 3
+    assert basket.calculate_basket_total() == Decimal('15.97')
+    assert_consistent(basket)
+
+    basket.contents = []
+    assert basket.calculate_basket_total() == 0
+    assert_consistent(basket)
+
+
+def test_contents_are_read_only():
+    basket = Basket([line(1)])
+    with pytest.raises((TypeError, AttributeError)):
+        basket.contents.append(line(2))
+    assert_consistent(basket)
+
+
+def test_clear():
+    basket = Basket([line(1), line(2)])
+    basket.clear()
+    assert basket.get_ids() == []
+    assert basket.calculate_basket_total() == 0
+    assert_consistent(basket)
+
+
+def test_total_survives_a_mixed_session():
+    basket = Basket()
+    for step in range(200):
+        clothes_id = step % 7
+        if step % 5 == 4 and clothes_id in basket:
+            basket.remove_single(clothes_id, min(2, basket.get_in_basket_quantity_by_clothes_id(clothes_id)))
+        else:
+            basket.add_new(line(clothes_id, 1 + step % 3, 0.1 * (clothes_id + 1), (step * 7) % 50))
+        assert_consistent(basket)
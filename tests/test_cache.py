@@ -0,0 +1,182 @@
+import threading
+import time
+from typing import Callable, List, Tuple
+
+import pytest
+
+from database import CatalogCache
+
+
+def rows(*ids: int, stock: int = 1) -> list:
+    return [{'id': id_, 'stock': stock} for id_ in ids]
+
+
+class SlowLoad:
+    # a catalog query that blocks until released, counting how often it runs
+    def __init__(self, result: list) -> None:
+        self.result = result
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self) -> list:
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(5)
+        return self.result
+
+
+def run_in_threads(count: int, target: Callable[[], list]) -> Tuple[List[threading.Thread], list]:
+    results = [None] * count
+
+    def run(index: int) -> None:
+        results[index] = target()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_hit_after_miss():
+    cache = CatalogCache()
+    calls = []
+    load = lambda: calls.append(1) or rows(1, 2)
+
+    assert cache.get_all(load) == rows(1, 2)
+    assert cache.get_by_id(2, load) == {'id': 2, 'stock': 1}
+    assert cache.get_by_id(3, load) is None
+    assert len(calls) == 1
+    assert cache.stats() == {'hits': 2, 'misses': 1}
+
+
+def test_expired_snapshot_is_reloaded():
+    cache = CatalogCache(ttl=0)
+    calls = []
+    load = lambda: calls.append(1) or rows(1)
+    cache.get_all(load)
+    time.sleep(0.001)
+    cache.get_all(load)
+    assert len(calls) == 2
+
+
+def test_concurrent_misses_share_one_load():
+    cache = CatalogCache()
+    load = SlowLoad(rows(1, 2, 3))
+
+    threads, results = run_in_threads(8, lambda: cache.get_all(load))
+    assert load.started.wait(5)
+    # give the other threads time to miss and start waiting on the load in flight
+    time.sleep(0.05)
+    load.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert load.calls == 1
+    assert all(result == rows(1, 2, 3) for result in results)
+    assert cache.stats()['misses'] == 1
+
+
+def test_load_error_reaches_every_waiter():
+    cache = CatalogCache()
+    started, release = threading.Event(), threading.Event()
+
+    def load() -> list:
+        started.set()
+        release.wait(5)
+        raise ConnectionError('lost connection')
+
+    errors = []
+
+    def get() -> None:
+        try:
+            cache.get_all(load)
+        except ConnectionError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=get) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 4
+    # the failed load leaves nothing behind, so the next miss loads again
+    assert cache.get_all(lambda: rows(1)) == rows(1)
+
+
+def test_invalidation_during_load_discards_its_result():
+    cache = CatalogCache()
+    stale = SlowLoad(rows(1, stock=5))
+
+    threads, results = run_in_threads(1, lambda: cache.get_all(stale))
+    assert stale.started.wait(5)
+    cache.invalidate()
+    stale.release.set()
+    threads[0].join(5)
+
+    # the session that started the load still gets its rows, but they are not cached
+    assert results[0] == rows(1, stock=5)
+    assert cache.get_all(lambda: rows(1, stock=4)) == rows(1, stock=4)
+
+
+def test_miss_after_invalidation_does_not_wait_for_the_stale_load():
+    cache = CatalogCache()
+    stale = SlowLoad(rows(1, stock=5))
+
+    threads, _ = run_in_threads(1, lambda: cache.get_all(stale))
+    assert stale.started.wait(5)
+    cache.invalidate()
+    assert cache.get_all(lambda: rows(1, stock=4)) == rows(1, stock=4)
+
+    stale.release.set()
+    threads[0].join(5)
+    assert cache.get_all(lambda: pytest.fail('the fresh snapshot should be served')) == rows(1, stock=4)
+
+
+def test_refresh_rows_swaps_only_the_written_rows():
+    cache = CatalogCache()
+    cache.get_all(lambda: rows(1, 2, 3))
+    requested = []
+
+    def load_rows(ids: list) -> list:
+        requested.append(ids)
+        return [{'id': 2, 'stock': 0}]
+
+    cache.refresh_rows([2], load_rows)
+    assert requested == [[2]]
+    assert cache.get_all(lambda: pytest.fail('refresh_rows should not reload the catalog')) == [
+        {'id': 1, 'stock': 1}, {'id': 2, 'stock': 0}, {'id': 3, 'stock': 1}
+    ]
+
+
+def test_refresh_rows_drops_deleted_rows_and_adds_new_ones():
+    cache = CatalogCache()
+    cache.get_all(lambda: rows(1, 2, 3))
+    cache.refresh_rows([2, 4], lambda ids: rows(4))
+    assert cache.get_all(lambda: pytest.fail('refresh_rows should not reload the catalog')) == rows(1, 3, 4)
+    assert cache.get_by_id(2, lambda: pytest.fail()) is None
+
+
+def test_refresh_rows_without_snapshot_loads_nothing():
+    cache = CatalogCache()
+    cache.refresh_rows([1], lambda ids: pytest.fail('nothing is cached, so nothing needs reading'))
+    assert cache.get_all(lambda: rows(1)) == rows(1)
+
+
+def test_refresh_rows_during_load_discards_its_result():
+    cache = CatalogCache()
+    cache.get_all(lambda: rows(1))
+    cache.invalidate()
+    stale = SlowLoad(rows(1, stock=5))
+
+    threads, _ = run_in_threads(1, lambda: cache.get_all(stale))
+    assert stale.started.wait(5)
+    cache.refresh_rows([1], lambda ids: rows(1, stock=4))
+    stale.release.set()
+    threads[0].join(5)
+
+    assert cache.get_all(lambda: rows(1, stock=4)) == rows(1, stock=4)
@@ -0,0 +1,43 @@
+import json
+
+from bulk import import_clothes
+
+
+def write_rows(path, rows: list) -> str:
+    path.write_text(''.join(json.dumps(row) + '\n' for row in rows), encoding='utf-8')
+    return str(path)
+
+
+def clothes_row(number: int, clothes_type_id: int = 1) -> dict:
+    return {'clothes_type_id': clothes_type_id, 'title': f'shirt {number}', 'description': 'a shirt', 'size': 'M',
+            'material': 'cotton', 'color': 'black', 'price': 10, 'discount': 0, 'in_stock': 5}
+
+
+def test_valid_rows_are_inserted(database, tmp_path):
+    path = write_rows(tmp_path / 'clothes.jsonl', [clothes_row(number) for number in range(5)])
+    report = import_clothes(database, path, chunk_size=2)
+    assert (report.rows, report.inserted, report.rejects) == (5, 5, [])
+    assert len(database.select_all_columns_from_table('clothes')) == 5
+
+
+def test_invalid_rows_are_rejected_by_line(database, tmp_path):
+    rows = [clothes_row(0), {**clothes_row(1), 'in_stock': 'many'}, clothes_row(2)]
+    report = import_clothes(database, write_rows(tmp_path / 'clothes.jsonl', rows))
+    assert report.inserted == 2
+    assert [line_number for line_number, _ in report.rejects] == [2]
+
+
+def test_database_errors_reject_only_the_failing_rows(database, tmp_path, monkeypatch):
+    # clothes type 2 passes validation, as if it was deleted after the import started, but fails its foreign key
+    monkeypatch.setattr(database, 'select_ids', lambda table: {1, 2})
+    rows = [clothes_row(0), clothes_row(1, clothes_type_id=2), {**clothes_row(2), 'in_stock': 'many'}, clothes_row(3),
+            clothes_row(4), clothes_row(5, clothes_type_id=2), clothes_row(6)]
+    report = import_clothes(database, write_rows(tmp_path / 'clothes.jsonl', rows), chunk_size=3)
+
+    assert report.rows == 7
+    assert report.inserted == 4
+    assert [line_number for line_number, _ in report.rejects] == [2, 3, 6]
+    assert report.rejects[0][1].startswith('Database error: ')
+    assert report.rejects[2][1].startswith('Database error: ')
+    titles = [row['title'] for row in database.select_all_columns_from_table('clothes')]
+    assert titles == ['shirt 0', 'shirt 3', 'shirt 4', 'shirt 6']
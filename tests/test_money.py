@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+import pytest
+
+from utils import to_cents, from_cents, line_totals, order_total
+from utils.money import amounts_to_cents, line_total_cents, line_totals_cents, to_basis_points
+
+
+@pytest.mark.parametrize('amount, cents', [
+    (10, 1000),
+    ('10.1', 1010),
+    (10.1, 1010),
+    (0.29, 29),
+    (Decimal('19.99'), 1999),
+    ('0.005', 1),
+    ('0.004', 0),
+    ('2.675', 268),
+    (2.675, 268),
+    ('-0.005', -1)
+])
+def test_to_cents_rounds_half_up(amount, cents):
+    assert to_cents(amount) == cents
+
+
+def test_amounts_to_cents_matches_to_cents():
+    amounts = [10, '10.1', 10.1, 0.29, Decimal('19.99'), '0.005', '2.675', 2.675, '-0.005', '1e2']
+    assert amounts_to_cents(amounts) == [to_cents(amount) for amount in amounts]
+
+
+def test_from_cents_is_exact():
+    assert from_cents(1010) == Decimal('10.10')
+    assert str(from_cents(5)) == '0.05'
+    assert to_cents(from_cents(123456789)) == 123456789
+
+
+@pytest.mark.parametrize('quantity, price_cents, discount_basis_points, total', [
+    (1, 1000, 0, 1000),
+    (3, 999, 0, 2997),
+    (1, 1000, 10000, 0),
+    (2, 1000, 1250, 1750),
+    # 1 * 0.05 * 0.9 = 0.045 rounds up to 0.05
+    (1, 5, 1000, 5),
+    # 1 * 0.05 * 0.7 = 0.035 rounds up to 0.04
+    (1, 5, 3000, 4),
+    # 1 * 0.01 * 0.6 = 0.006 rounds up to 0.01, 0.01 * 0.4 = 0.004 rounds down to nothing
+    (1, 1, 4000, 1),
+    (1, 1, 6000, 0),
+    (7, 333, 333, 2253)
+])
+def test_line_total_cents_rounds_half_up(quantity, price_cents, discount_basis_points, total):
+    assert line_total_cents(quantity, price_cents, discount_basis_points) == total
+    expected = (Decimal(quantity * price_cents) * (1 - Decimal(discount_basis_points) / 10000)).quantize(
+        Decimal(1), rounding='ROUND_HALF_UP')
+    assert total == expected
+
+
+def test_line_totals_cents_matches_line_total_cents():
+    quantities = list(range(1, 200))
+    prices = [(quantity * 7919) % 100000 for quantity in quantities]
+    discounts = [(quantity * 37) % 10001 for quantity in quantities]
+    assert line_totals_cents(quantities, prices, discounts) == [
+        line_total_cents(quantity, price, discount) for quantity, price, discount in zip(quantities, prices, discounts)
+    ]
+
+
+def test_line_totals_from_floats_and_strings():
+    totals = line_totals([3, 1, 2], [0.1, '19.99', Decimal('10')], [0, '12.5', 33.33])
+    assert totals == [Decimal('0.30'), Decimal('17.49'), Decimal('13.33')]
+    assert all(isinstance(total, Decimal) for total in totals)
+
+
+def test_order_total_is_the_sum_of_rounded_line_totals():
+    quantities, prices, discounts = [1, 1, 1], ['0.05', '0.05', '0.05'], [10, 10, 10]
+    # every line rounds 0.045 up to 0.05, where rounding the unrounded sum would give 0.14
+    assert order_total(quantities, prices, discounts) == Decimal('0.15')
+    assert order_total(quantities, prices, discounts) == sum(line_totals(quantities, prices, discounts))
+
+
+def test_float_prices_add_up_exactly():
+    assert order_total([1] * 10, [0.1] * 10, [0] * 10) == Decimal('1.00')
+    assert sum([0.1] * 10) != 1.0
+
+
+def test_to_basis_points():
+    assert to_basis_points(12.5) == 1250
+    assert to_basis_points('33.33') == 3333
+    assert to_basis_points(0) == 0
@@ -0,0 +1,120 @@
+import pytest
+
+from database import Paginator
+from tests.conftest import make_clothes
+
+
+@pytest.fixture
+def clothes(database) -> list:
+    database.insert_clothes_many([make_clothes(number) for number in range(1, 8)])
+    return [row['id'] for row in database.select_all_columns_from_table('clothes')]
+
+
+def ids(page) -> list:
+    return [row['id'] for row in page.rows]
+
+
+def test_first_page(database, clothes):
+    page = database.select_page('clothes', page_size=3)
+    assert ids(page) == clothes[:3]
+    assert page.has_next
+    assert not page.has_previous
+
+
+def test_middle_page(database, clothes):
+    page = database.select_page('clothes', after_id=clothes[2], page_size=3)
+    assert ids(page) == clothes[3:6]
+    assert page.has_next
+    assert page.has_previous
+
+
+def test_last_page(database, clothes):
+    page = database.select_page('clothes', after_id=clothes[5], page_size=3)
+    assert ids(page) == clothes[6:]
+    assert not page.has_next
+    assert page.has_previous
+
+
+def test_last_page_filled_exactly(database, clothes):
+    page = database.select_page('clothes', after_id=clothes[3], page_size=3)
+    assert ids(page) == clothes[4:]
+    assert not page.has_next
+    assert page.has_previous
+
+
+def test_single_page_has_neither_neighbour(database, clothes):
+    page = database.select_page('clothes', page_size=7)
+    assert ids(page) == clothes
+    assert not page.has_next
+    assert not page.has_previous
+
+
+def test_empty_table(database):
+    page = database.select_page('clothes', page_size=3)
+    assert page.rows == []
+    assert not page.has_next
+    assert not page.has_previous
+
+
+def test_page_before_keeps_id_order(database, clothes):
+    page = database.select_page('clothes', before_id=clothes[6], page_size=3)
+    assert ids(page) == clothes[3:6]
+    assert page.has_next
+    assert page.has_previous
+
+
+def test_page_before_reaching_the_start(database, clothes):
+    page = database.select_page('clothes', before_id=clothes[3], page_size=3)
+    assert ids(page) == clothes[:3]
+    assert page.has_next
+    assert not page.has_previous
+
+    page = database.select_page('clothes', before_id=clothes[2], page_size=3)
+    assert ids(page) == clothes[:2]
+    assert not page.has_previous
+
+
+def test_version_changes_with_writes(database, clothes):
+    version = database.select_page('clothes', page_size=3).version
+    assert database.select_page('clothes', page_size=3).version == version
+
+    database.update_value_by_id('clothes', 'in_stock', 0, clothes[0])
+    assert database.select_page('clothes', page_size=3).version != version
+
+
+def test_paginator_walks_forward_and_back(database, clothes):
+    paginator = Paginator(database, 'clothes', page_size=3)
+    assert ids(paginator.current()) == clothes[:3]
+
+    paginator.next()
+    assert ids(paginator.current()) == clothes[3:6]
+    paginator.next()
+    last = paginator.current()
+    assert ids(last) == clothes[6:]
+
+    # next on the last page stays there
+    paginator.next()
+    assert ids(paginator.current()) == clothes[6:]
+
+    paginator.previous()
+    assert ids(paginator.current()) == clothes[3:6]
+    paginator.previous()
+    assert ids(paginator.current()) == clothes[:3]
+
+    # previous on the first page stays there
+    paginator.previous()
+    page = paginator.current()
+    assert ids(page) == clothes[:3]
+    assert not page.has_previous
+
+
+def test_paginator_returns_to_the_start_when_its_page_is_gone(database, clothes):
+    paginator = Paginator(database, 'clothes', page_size=3)
+    paginator.current()
+    paginator.next()
+    paginator.current()
+    paginator.next()
+    assert ids(paginator.current()) == clothes[6:]
+
+    database.delete_from_table_by_id('clothes', clothes[6])
+    assert ids(paginator.current()) == clothes[:3]
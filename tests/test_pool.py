@@ -0,0 +1,179 @@
+import pytest
+
+from database import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.alive = True
+        self.closed = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect: bool = False) -> None:
+        if not self.alive:
+            raise ConnectionError('server has gone away')
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FlakyConnect:
+    # fails the given number of times before handing out connections
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.calls = 0
+        self.connections = []
+
+    def __call__(self) -> FakeConnection:
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('connection refused')
+        connection = FakeConnection()
+        self.connections.append(connection)
+        return connection
+
+
+def make_pool(connect: FlakyConnect, **kwargs) -> ConnectionPool:
+    kwargs.setdefault('reconnect_delay', 0)
+    return ConnectionPool(connect, **kwargs)
+
+
+def test_fill_opens_min_size_connections():
+    connect = FlakyConnect()
+    pool = make_pool(connect, min_size=2, max_size=3)
+    assert pool.size == 2
+    assert pool.idle == 2
+    assert connect.calls == 2
+
+
+def test_released_connection_is_reused():
+    connect = FlakyConnect()
+    pool = make_pool(connect, min_size=1, max_size=2)
+
+    with pool.connection() as first:
+        assert pool.idle == 0
+    with pool.connection() as second:
+        assert second is first
+    assert connect.calls == 1
+    assert pool.size == 1
+
+
+def test_pool_grows_up_to_max_size_then_times_out():
+    pool = make_pool(FlakyConnect(), min_size=0, max_size=2, timeout=0.01)
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second
+    assert pool.size == 2
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    pool.release(first)
+    assert pool.acquire() is first
+
+
+def test_release_rolls_back_only_when_asked():
+    pool = make_pool(FlakyConnect())
+    connection = pool.acquire()
+    pool.release(connection)
+    assert connection.rollbacks == 0
+
+    connection = pool.acquire()
+    pool.release(connection, rollback=True)
+    assert connection.rollbacks == 1
+    assert pool.idle == 1
+
+
+def test_failed_rollback_discards_connection():
+    pool = make_pool(FlakyConnect())
+    connection = pool.acquire()
+
+    def rollback() -> None:
+        raise ConnectionError('lost connection during query')
+
+    connection.rollback = rollback
+    pool.release(connection, rollback=True)
+    assert connection.closed
+    assert pool.size == 0
+    assert pool.idle == 0
+
+
+def test_discard_frees_a_slot():
+    pool = make_pool(FlakyConnect(), min_size=0, max_size=1, timeout=0.01)
+    connection = pool.acquire()
+    pool.discard(connection)
+    assert connection.closed
+    assert pool.size == 0
+    assert pool.acquire() is not connection
+
+
+def test_connect_retries_until_it_succeeds():
+    connect = FlakyConnect(failures=2)
+    pool = make_pool(connect, min_size=1, reconnect_attempts=3)
+    assert pool.size == 1
+    assert connect.calls == 3
+
+
+def test_connect_gives_up_after_attempts_and_keeps_size_right():
+    connect = FlakyConnect(failures=3)
+    with pytest.raises(ConnectionError):
+        make_pool(connect, min_size=1, reconnect_attempts=3)
+
+    pool = make_pool(FlakyConnect(failures=2), min_size=0, reconnect_attempts=2)
+    with pytest.raises(ConnectionError):
+        pool.acquire()
+    assert pool.size == 0
+    assert pool.acquire() is not None
+    assert pool.size == 1
+
+
+def test_dead_connection_is_replaced_on_acquire():
+    connect = FlakyConnect()
+    pool = make_pool(connect)
+    dead = pool.acquire()
+    dead.alive = False
+    pool.release(dead)
+
+    connection = pool.acquire()
+    assert connection is not dead
+    assert dead.closed
+    assert connection.alive
+    assert pool.size == 1
+
+
+def test_reconnect_after_a_failed_attempt():
+    connect = FlakyConnect()
+    pool = make_pool(connect, reconnect_attempts=2)
+    dead = pool.acquire()
+    dead.alive = False
+    pool.release(dead)
+
+    connect.failures = 1
+    connection = pool.acquire()
+    assert connection.alive
+    assert connect.calls == 3
+    assert pool.size == 1
+
+
+def test_failed_reconnect_frees_the_slot():
+    connect = FlakyConnect()
+    pool = make_pool(connect, reconnect_attempts=1)
+    dead = pool.acquire()
+    dead.alive = False
+    pool.release(dead)
+
+    connect.failures = 1
+    with pytest.raises(ConnectionError):
+        pool.acquire()
+    assert pool.size == 0
+
+
+def test_close_closes_idle_connections():
+    connect = FlakyConnect()
+    pool = make_pool(connect, min_size=2)
+    pool.close()
+    assert all(connection.closed for connection in connect.connections)
+    assert pool.size == 0
@@ -1 +1 @@
-from .validators import validate_input
+from .validators import validate_input, validate_fields
@@ -1,5 +1,5 @@
 from operator import methodcaller
-from typing import Union
+from typing import Union, Dict
 
 
 def validate_input(
@@ -17,6 +17,42 @@ def validate_input(
     return user_input
 
 
+def validate_fields(
+        settings: dict,
+        values: dict,
+        names: Dict[str, str],
+        partial: bool = False,
+        strict: bool = True
+) -> dict:
+    # validates already collected values (an API request, an imported row) with the settings of a menu,
+    # names maps each field to the menu setting that validates it
+    if strict:
+        unknown_fields = set(values) - set(names)
+        if unknown_fields:
+            raise ValueError(f'Unknown fields: {sorted(unknown_fields)}')
+
+    validated = {}
+    for field, setting_name in names.items():
+        if field not in values or values[field] is None:
+            if partial:
+                continue
+            raise ValueError(f'Missing field {field}')
+
+        setting = settings[setting_name]
+        try:
+            validated[field] = validate_input(
+                user_input=str(values[field]),
+                expected_type=setting['expected_type'],
+                expected_values=setting.get('expected_values', None),
+                additional_validators=setting.get('additional_validators', None),
+                error_messages=setting.get('error_messages', None)
+            )
+        except ValueError as error:
+            raise ValueError(f'{field}: {error}')
+
+    return validated
+
+
 def require_additional_validation(func):
     def inner(*args, **kwargs):
         user_input = func(*args, **kwargs)
@@ -1,3 +1,4 @@
 from .hash import hash_password
+from .money import to_cents, from_cents, line_totals, order_total
 from .other import *
 from .parse import *
@@ -0,0 +1,108 @@
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import BinaryIO, Iterator, List, Tuple
+
+
+class Console(ABC):
+    @abstractmethod
+    def read(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        raise NotImplementedError
+
+
+class TerminalConsole(Console):
+    def read(self, prompt: str) -> str:
+        return input(prompt)
+
+    def write(self, text: str) -> None:
+        print(text)
+
+
+# every session (thread or task) talks to its own console, the terminal by default
+_current_console = ContextVar('console', default=TerminalConsole())
+
+
+def get_console() -> Console:
+    return _current_console.get()
+
+
+@contextmanager
+def use_console(console: Console) -> Iterator[Console]:
+    token = _current_console.set(console)
+    try:
+        yield console
+    finally:
+        _current_console.reset(token)
+
+
+def read_input(prompt: str = '') -> str:
+    return _current_console.get().read(prompt)
+
+
+def write_output(*values) -> None:
+    _current_console.get().write(' '.join(str(value) for value in values))
+
+
+class EndOfScript(Exception):
+    pass
+
+
+class ScriptedConsole(Console):
+    # replays the inputs of each action in order and times every action from its first input until the next one
+    def __init__(self, actions: List[Tuple[str, List[str]]]) -> None:
+        self.inputs = [(i, user_input) for i, (_, inputs) in enumerate(actions) for user_input in inputs]
+        self.action_names = [name for name, _ in actions]
+        self.timings = []
+        self.written = 0
+
+        self._position = 0
+        self._action = None
+        self._action_started_at = None
+
+    def read(self, prompt: str) -> str:
+        if self._position == len(self.inputs):
+            self.finish()
+            raise EndOfScript(f'Script ended while waiting for input "{prompt.strip()}"')
+
+        action, user_input = self.inputs[self._position]
+        self._position += 1
+
+        if action != self._action:
+            self.finish()
+            self._action, self._action_started_at = action, time.perf_counter()
+        return user_input
+
+    def write(self, text: str) -> None:
+        self.written += len(text) + 1
+
+    def finish(self) -> None:
+        if self._action is not None:
+            elapsed = time.perf_counter() - self._action_started_at
+            self.timings.append((self.action_names[self._action], elapsed))
+            self._action = None
+
+
+class SocketConsole(Console):
+    # a telnet-style client: prompts and output go out as lines, every line the client sends is one input
+    def __init__(self, reader: BinaryIO, writer: BinaryIO, encoding: str = 'utf-8') -> None:
+        self.reader = reader
+        self.writer = writer
+        self.encoding = encoding
+
+    def read(self, prompt: str) -> str:
+        self.writer.write(prompt.encode(self.encoding))
+        self.writer.flush()
+
+        line = self.reader.readline()
+        if not line:
+            raise EOFError('Client closed the connection')
+        return line.decode(self.encoding, errors='replace').rstrip('\r\n')
+
+    def write(self, text: str) -> None:
+        self.writer.write((text + '\n').replace('\n', '\r\n').encode(self.encoding))
+        self.writer.flush()
@@ -0,0 +1,55 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Sequence, Union, List
+
+Amount = Union[int, float, str, Decimal]
+
+CENTS_PER_UNIT = 100
+BASIS_POINTS_PER_UNIT = 10000
+
+
+def to_cents(amount: Amount) -> int:
+    # floats go through their shortest repr, so 10.1 becomes 1010 cents and not 1009.99...
+    value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+    return int((value * CENTS_PER_UNIT).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_basis_points(percent: Amount) -> int:
+    # a discount in percent with two decimal places, as stored in the discount columns
+    return to_cents(percent)
+
+
+def from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def line_total_cents(quantity: int, price_cents: int, discount_basis_points: int) -> int:
+    # quantity * price * (1 - discount / 100) in integers, rounded half up to a whole cent
+    numerator = quantity * price_cents * (BASIS_POINTS_PER_UNIT - discount_basis_points)
+    return (2 * numerator + BASIS_POINTS_PER_UNIT) // (2 * BASIS_POINTS_PER_UNIT)
+
+
+def line_totals_cents(
+        quantities: Sequence[int],
+        prices_cents: Sequence[int],
+        discounts_basis_points: Sequence[int]
+) -> List[int]:
+    # line_total_cents inlined into one comprehension, which saves a python call per line
+    return [(2 * quantity * price * (BASIS_POINTS_PER_UNIT - discount) + BASIS_POINTS_PER_UNIT)
+            // (2 * BASIS_POINTS_PER_UNIT)
+            for quantity, price, discount in zip(quantities, prices_cents, discounts_basis_points)]
+
+
+def amounts_to_cents(amounts: Sequence[Amount]) -> List[int]:
+    # to_cents for a whole column in one pass; scaling by 10 ** 2 shifts the exponent instead of multiplying
+    return [int((amount if isinstance(amount, Decimal) else Decimal(str(amount))).scaleb(2)
+                .to_integral_value(ROUND_HALF_UP)) for amount in amounts]
+
+
+def line_totals(quantities: Sequence[int], prices: Sequence[Amount], discounts: Sequence[Amount]) -> List[Decimal]:
+    totals = line_totals_cents(quantities, amounts_to_cents(prices), amounts_to_cents(discounts))
+    return [Decimal(total).scaleb(-2) for total in totals]
+
+
+def order_total(quantities: Sequence[int], prices: Sequence[Amount], discounts: Sequence[Amount]) -> Decimal:
+    # the sum of the rounded line totals, which is what the stored item_ordered rows add up to
+    return from_cents(sum(line_totals_cents(quantities, amounts_to_cents(prices), amounts_to_cents(discounts))))
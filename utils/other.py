@@ -1,5 +1,16 @@
-def calculate_single_item_total(quantity: int, price: float, discount: float) -> float:
-    return quantity * price * (1 - discount / 100)
+from decimal import Decimal
+
+from utils.money import Amount, from_cents, line_total_cents, to_cents, to_basis_points
+
+
+def calculate_single_item_total(quantity: int, price: Amount, discount: Amount) -> Decimal:
+    return from_cents(line_total_cents(quantity, to_cents(price), to_basis_points(discount)))
+
+
+def tabulate_psql(items: list, headers: list) -> str:
+    # tabulate is slow to import, so it is loaded the first time a table is drawn rather than at startup
+    from tabulate import tabulate
+    return tabulate(items, headers=headers, tablefmt='psql')
 
 
 def rename_dict_key(dict_: dict, old_key, new_key) -> dict:
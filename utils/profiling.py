@@ -0,0 +1,133 @@
+import functools
+import io
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+PROFILE_ENV_VARIABLE = 'CLOTHING_SHOP_PROFILE'
+
+# own time of a function is put in the first category whose markers appear in its file name or, for
+# builtins and C functions, in its name, and in "other" if none do
+CATEGORIES = [
+    ('database', ('/database/', 'sqlite3', 'mysql')),
+    ('input', ('/utils/console.py', 'builtins.input', 'readline')),
+    ('validation', ('/user_input_validation/',)),
+    ('rendering', ('/menu/', 'tabulate', 'termcolor'))
+]
+CATEGORY_NAMES = [category for category, _ in CATEGORIES] + ['other']
+
+_local = threading.local()
+_profiler: Optional['ActionProfiler'] = None
+
+
+def categorize(file_name: str, function_name: str) -> str:
+    for category, markers in CATEGORIES:
+        for marker in markers:
+            if marker in file_name or marker in function_name:
+                return category
+    return 'other'
+
+
+class ActionProfiler:
+    # profiles every dispatched menu action with cProfile and adds the stats up per action name,
+    # across all sessions of the process
+    def __init__(self) -> None:
+        self.stats: Dict[str, 'pstats.Stats'] = {}
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def run(self, name: str, action: Callable, *args, **kwargs):
+        # an action dispatched from inside another one is part of the outer action's profile
+        if getattr(_local, 'profiling', False):
+            return action(*args, **kwargs)
+
+        # cProfile and pstats are only imported by processes that profile
+        import cProfile
+
+        profile = cProfile.Profile()
+        _local.profiling = True
+        try:
+            return profile.runcall(action, *args, **kwargs)
+        finally:
+            _local.profiling = False
+            self._add(name, profile)
+
+    def _add(self, name: str, profile: 'cProfile.Profile') -> None:
+        import pstats
+
+        profile.create_stats()
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if name in self.stats:
+                self.stats[name].add(profile)
+            else:
+                self.stats[name] = pstats.Stats(profile)
+
+    def breakdown(self, name: str) -> Tuple[float, Dict[str, float]]:
+        # the total time of an action and the part of it spent in every category
+        categories = {category: 0.0 for category in CATEGORY_NAMES}
+        for (file_name, _, function_name), (_, _, own_time, _, _) in self.stats[name].stats.items():
+            categories[categorize(file_name, function_name)] += own_time
+        return sum(categories.values()), categories
+
+    def report(self, top: int = 15) -> str:
+        # a table of where the time of every action went, then its slowest functions by cumulative time
+        import pstats
+
+        with self._lock:
+            breakdowns = {name: self.breakdown(name) for name in self.stats}
+            names = sorted(breakdowns, key=lambda name_: breakdowns[name_][0], reverse=True)
+
+            lines = [f'{"action":<28}{"calls":>7}{"total":>11}' + ''.join(f'{name:>12}' for name in CATEGORY_NAMES)]
+            for name in names:
+                total, categories = breakdowns[name]
+                lines.append(f'{name:<28}{self.calls[name]:>7}{total:>10.3f}s' + ''.join(
+                    f'{categories[category] / total if total else 0:>12.1%}' for category in CATEGORY_NAMES))
+
+            for name in names:
+                stream = io.StringIO()
+                stats = self.stats[name]
+                stats.stream = stream
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+                lines.append(f'\n=== {name} ===')
+                lines.append(stream.getvalue().strip())
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, path: str, top: int = 15) -> None:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.report(top=top))
+
+
+def enable_profiling(profiler: Optional[ActionProfiler] = None) -> ActionProfiler:
+    global _profiler
+    _profiler = profiler or ActionProfiler()
+    return _profiler
+
+
+def disable_profiling() -> Optional[ActionProfiler]:
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def get_profiler() -> Optional[ActionProfiler]:
+    return _profiler
+
+
+def profile_report_path(cli_path: Optional[str] = None) -> Optional[str]:
+    # the command line flag wins over the environment variable
+    return cli_path or os.environ.get(PROFILE_ENV_VARIABLE) or None
+
+
+def profiled_action(name: str) -> Callable[[Callable], Callable]:
+    # without an enabled profiler the action is called directly
+    def decorator(action: Callable) -> Callable:
+        @functools.wraps(action)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return action(*args, **kwargs)
+            return _profiler.run(name, action, *args, **kwargs)
+
+        return wrapper
+
+    return decorator